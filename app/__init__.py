@@ -17,8 +17,48 @@ def create_app(test_config=None):
         # Load the instance config when not testing
         app.config.from_mapping(
             SECRET_KEY=os.environ.get('SECRET_KEY', 'dev'),
-            SQLALCHEMY_DATABASE_URI='sqlite:///' + os.path.join(app.instance_path, 'ddmonsters.sqlite'),
-            SQLALCHEMY_TRACK_MODIFICATIONS=False
+            SQLALCHEMY_DATABASE_URI=os.environ.get('DATABASE_URL') or
+                'sqlite:///' + os.path.join(app.instance_path, 'ddmonsters.sqlite'),
+            SQLALCHEMY_TRACK_MODIFICATIONS=False,
+            OCR_CACHE_SIZE=int(os.environ.get('OCR_CACHE_SIZE', 128)),
+            OCR_CACHE_DISK=os.environ.get('OCR_CACHE_DISK') is not None,
+            SCAN_JOB_WORKERS=int(os.environ.get('SCAN_JOB_WORKERS', 2)),
+            SCAN_JOBS_PER_USER=int(os.environ.get('SCAN_JOBS_PER_USER', 2)),
+            SCAN_JOB_TTL=int(os.environ.get('SCAN_JOB_TTL', 3600)),
+            # Running jobs older than this (twice the bestiary render timeout) are given up on
+            SCAN_JOB_STALE_AFTER=int(os.environ.get('SCAN_JOB_STALE_AFTER', 240)),
+            IMPORT_OCR_PROCESSES=int(os.environ.get('IMPORT_OCR_PROCESSES', os.cpu_count() or 1)),
+            IMPORT_MAX_PAGES=int(os.environ.get('IMPORT_MAX_PAGES', 100)),
+            PDF_BACKEND=os.environ.get('PDF_BACKEND', 'wkhtmltopdf'),
+            WKHTMLTOPDF_PATH=os.environ.get('WKHTMLTOPDF_PATH'),
+            PDF_RENDER_WORKERS=int(os.environ.get('PDF_RENDER_WORKERS', 2)),
+            PDF_RENDER_QUEUE=int(os.environ.get('PDF_RENDER_QUEUE', 8)),
+            PDF_RENDER_TIMEOUT=int(os.environ.get('PDF_RENDER_TIMEOUT', 30)),
+            PDF_QUEUE_TIMEOUT=int(os.environ.get('PDF_QUEUE_TIMEOUT', 30)),
+            PDF_CACHE_DIR=os.environ.get('PDF_CACHE_DIR', os.path.join(app.instance_path, 'pdf_cache')),
+            PDF_CACHE_MAX_BYTES=int(os.environ.get('PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024)),
+            PDF_BESTIARY_SYNC_LIMIT=int(os.environ.get('PDF_BESTIARY_SYNC_LIMIT', 20)),
+            PDF_BESTIARY_TIMEOUT=int(os.environ.get('PDF_BESTIARY_TIMEOUT', 120)),
+            ADMIN_USERNAMES=[name.strip() for name in os.environ.get('ADMIN_USERNAMES', '').split(',') if name.strip()],
+            PERF_SERVER_TIMING=os.environ.get('PERF_SERVER_TIMING', '1') != '0',
+            PERF_SLOW_REQUEST_MS=int(os.environ['PERF_SLOW_REQUEST_MS']) if os.environ.get('PERF_SLOW_REQUEST_MS') else None,
+            METRICS_TOKEN=os.environ.get('METRICS_TOKEN'),
+            LIST_PAGE_SIZE=int(os.environ.get('LIST_PAGE_SIZE', 50)),
+            LIST_MAX_PAGE_SIZE=int(os.environ.get('LIST_MAX_PAGE_SIZE', 200)),
+            SEARCH_RESULT_LIMIT=int(os.environ.get('SEARCH_RESULT_LIMIT', 50)),
+            AUTH_CACHE_TTL=int(os.environ.get('AUTH_CACHE_TTL', 30)),
+            AUTH_CACHE_SIZE=int(os.environ.get('AUTH_CACHE_SIZE', 4096)),
+            AUTO_CREATE_SCHEMA=os.environ.get('AUTO_CREATE_SCHEMA', '1') != '0',
+            SQLITE_JOURNAL_MODE=os.environ.get('SQLITE_JOURNAL_MODE', 'WAL'),
+            SQLITE_SYNCHRONOUS=os.environ.get('SQLITE_SYNCHRONOUS', 'NORMAL'),
+            SQLITE_BUSY_TIMEOUT=int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000)),
+            SQLITE_MMAP_SIZE=int(os.environ.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+            DB_POOL=os.environ.get('DB_POOL', 'queue'),
+            DB_POOL_SIZE=int(os.environ.get('DB_POOL_SIZE', 5)),
+            DB_MAX_OVERFLOW=int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+            DB_POOL_TIMEOUT=int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+            DB_POOL_RECYCLE=int(os.environ.get('DB_POOL_RECYCLE', 1800)),
+            DB_POOL_PRE_PING=os.environ.get('DB_POOL_PRE_PING', '1') != '0'
         )
     else:
         # Load the test config if passed in
@@ -30,12 +70,39 @@ def create_app(test_config=None):
     except OSError:
         pass
     
+    # Engine options (pool settings) for the configured database
+    from app.utils.database import configure_database, init_database
+    configure_database(app)
+    
     # Initialize extensions with the app
     db.init_app(app)
+    
+    # WAL, synchronous, busy timeout and mmap pragmas on each new SQLite connection
+    init_database(app)
     migrate.init_app(app, db)
     login_manager.init_app(app)
     login_manager.login_view = 'auth.login'
     
+    # Query count, SQL and render timings per request (Server-Timing, /debug/perf)
+    from app.utils.perf import init_perf
+    init_perf(app)
+    
+    # Cache OCR results by image hash so re-uploads skip the OCR pipeline
+    from app.utils.ocr_cache import init_ocr_cache
+    init_ocr_cache(app)
+    
+    # Pool of PDF renderers shared by the statblock exports
+    from app.utils.pdf_renderer import init_pdf_renderer
+    init_pdf_renderer(app)
+    
+    # Rendered statblock PDFs, reused until the monster or the template changes
+    from app.utils.pdf_cache import init_pdf_cache
+    init_pdf_cache(app)
+    
+    # Logged in users and the campaigns they own, cached per worker for AUTH_CACHE_TTL seconds
+    from app.utils.auth_cache import init_auth_cache
+    init_auth_cache(app)
+    
     # Add custom Jinja2 filters
     @app.template_filter('nl2br')
     def nl2br(s):
@@ -43,13 +110,19 @@ def create_app(test_config=None):
     
     with app.app_context():
         # Import models
-        from app.models import user, campaign, player, npc, event, encounter, monster, loot
+        from app.models import user, campaign, player, npc, event, encounter, monster, encounter_monster, loot, scan_job
         
-        # Create database tables
-        db.create_all()
+        if app.config.get('AUTO_CREATE_SCHEMA', True):
+            # Create database tables
+            db.create_all()
+            
+            # Full-text search indexes (FTS5 tables on SQLite, GIN indexes on Postgres)
+            from app.utils.search import init_search
+            init_search(app)
+        # Otherwise the schema comes from the migrations only (see gunicorn_config.py)
         
         # Register blueprints
-        from app.routes import auth, campaigns, players, npcs, events, encounters, monsters, loot
+        from app.routes import auth, campaigns, players, npcs, events, encounters, monsters, loot, debug, metrics, api
         app.register_blueprint(auth.bp)
         app.register_blueprint(campaigns.bp)
         app.register_blueprint(players.bp)
@@ -58,6 +131,9 @@ def create_app(test_config=None):
         app.register_blueprint(encounters.bp)
         app.register_blueprint(monsters.bp)
         app.register_blueprint(loot.bp)
+        app.register_blueprint(debug.bp)
+        app.register_blueprint(metrics.bp)
+        app.register_blueprint(api.bp)
         
         # Set the root route
         from app.routes.campaigns import index
@@ -6,13 +6,13 @@ class Campaign(db.Model):
     title = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
     
-    # Relationships
-    players = db.relationship('Player', backref='campaign', lazy='dynamic', cascade='all, delete-orphan')
-    npcs = db.relationship('NPC', backref='campaign', lazy='dynamic', cascade='all, delete-orphan')
-    events = db.relationship('Event', backref='campaign', lazy='dynamic', cascade='all, delete-orphan')
-    encounters = db.relationship('Encounter', backref='campaign', lazy='dynamic', cascade='all, delete-orphan')
+    # Relationships (plain lists, so views can eager load them)
+    players = db.relationship('Player', backref='campaign', order_by='Player.id', cascade='all, delete-orphan')
+    npcs = db.relationship('NPC', backref='campaign', order_by='NPC.id', cascade='all, delete-orphan')
+    events = db.relationship('Event', backref='campaign', order_by='Event.id', cascade='all, delete-orphan')
+    encounters = db.relationship('Encounter', backref='campaign', order_by='Encounter.id', cascade='all, delete-orphan')
     loot = db.relationship('Loot', back_populates='campaign', cascade='all, delete-orphan')
     
     def __repr__(self):
@@ -8,10 +8,13 @@ class Encounter(db.Model):
     description = db.Column(db.Text)
     monsters = db.Column(db.Text)  # Simple text list of monsters (kept for backward compatibility)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False, index=True)
     
     # Relationship with monster statblocks
-    monster_statblocks = db.relationship('Monster', backref='encounter', lazy='dynamic', cascade='all, delete-orphan')
+    monster_statblocks = db.relationship('Monster', backref='encounter', order_by='Monster.id', cascade='all, delete-orphan')
+    # The monsters fighting in it, each referencing a statblock
+    participants = db.relationship('EncounterMonster', back_populates='encounter', order_by='EncounterMonster.id',
+                                   cascade='all, delete-orphan')
     loot = db.relationship('Loot', back_populates='encounter', cascade='all, delete-orphan')
     
     def __repr__(self):
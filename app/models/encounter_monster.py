@@ -0,0 +1,35 @@
+from app import db
+from datetime import datetime
+
+class EncounterMonster(db.Model):
+    """One monster taking part in an encounter.
+
+    The statblock lives once in ``monster``; eight goblins are eight of these
+    rows pointing at the same Goblin, each with its own label, hit points and
+    conditions.
+    """
+    __tablename__ = 'encounter_monster'
+
+    id = db.Column(db.Integer, primary_key=True)
+    label = db.Column(db.String(100), nullable=False)
+    current_hit_points = db.Column(db.Integer)  # None until the monster takes damage
+    conditions = db.Column(db.String(200))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    # Foreign keys
+    encounter_id = db.Column(db.Integer, db.ForeignKey('encounter.id', ondelete='CASCADE'), nullable=False, index=True)
+    monster_id = db.Column(db.Integer, db.ForeignKey('monster.id', ondelete='CASCADE'), nullable=False, index=True)
+
+    # Relationships
+    encounter = db.relationship('Encounter', back_populates='participants')
+    monster = db.relationship('Monster', back_populates='participants')
+
+    def __repr__(self):
+        return f'<EncounterMonster {self.label}>'
+
+    @property
+    def hit_points(self):
+        """The participant's current hit points, the statblock's maximum until it is hurt."""
+        if self.current_hit_points is None:
+            return self.monster.hit_points
+        return self.current_hit_points
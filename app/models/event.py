@@ -4,7 +4,9 @@ from datetime import datetime
 # Association table for Event-NPC relationship
 event_npcs = db.Table('event_npcs',
     db.Column('event_id', db.Integer, db.ForeignKey('event.id', ondelete='CASCADE'), primary_key=True),
-    db.Column('npc_id', db.Integer, db.ForeignKey('npc.id', ondelete='CASCADE'), primary_key=True)
+    db.Column('npc_id', db.Integer, db.ForeignKey('npc.id', ondelete='CASCADE'), primary_key=True),
+    # The primary key covers lookups by event, this one the events of an NPC
+    db.Index('ix_event_npcs_npc_id', 'npc_id')
 )
 
 class Event(db.Model):
@@ -15,6 +17,11 @@ class Event(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False)
     
+    # The event list filters on the campaign and sorts by date
+    __table_args__ = (
+        db.Index('ix_event_campaign_id_event_date', 'campaign_id', 'event_date'),
+    )
+    
     # Relationship with NPCs
     npcs = db.relationship('NPC', secondary=event_npcs, lazy='dynamic',
                          backref=db.backref('events', lazy='dynamic'))
@@ -1,7 +1,12 @@
 from app import db
 from datetime import datetime
-import pdfkit
-from pdfkit.configuration import Configuration
+from sqlalchemy import func, literal_column
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import validates
+from app.utils import challenge
+
+# Sort key of monsters without a numeric challenge rating, after CR 30
+UNRATED_CR = 99
 
 class Monster(db.Model):
     id = db.Column(db.Integer, primary_key=True)
@@ -48,6 +53,8 @@ class Monster(db.Model):
     
     # Challenge rating
     challenge_rating = db.Column(db.String(10))
+    # challenge_rating as a number (1/4 -> 0.25) for filtering and sorting, kept in sync on write
+    cr_value = db.Column(db.Float, default=challenge.challenge_rating_default)
     xp = db.Column(db.Integer)
     
     # Special abilities
@@ -80,12 +87,51 @@ class Monster(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # Foreign keys
-    encounter_id = db.Column(db.Integer, db.ForeignKey('encounter.id'), nullable=True)
+    encounter_id = db.Column(db.Integer, db.ForeignKey('encounter.id'), nullable=True, index=True)
     campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False)
     
+    # The campaign bestiary lists (campaign_id, encounter_id IS NULL) and counts
+    # (campaign_id) use the composite index, encounter lists use encounter_id's;
+    # CR ranges within a campaign use (campaign_id, cr_value) and the bestiary
+    # sorted by challenge rating reads the last index in order (its expression
+    # must stay identical to cr_sort's)
+    __table_args__ = (
+        db.Index('ix_monster_campaign_id_encounter_id', 'campaign_id', 'encounter_id'),
+        db.Index('ix_monster_campaign_id_cr_value', 'campaign_id', 'cr_value'),
+        db.Index('ix_monster_campaign_id_encounter_id_cr_sort', 'campaign_id', 'encounter_id',
+                 func.coalesce(cr_value, literal_column(str(UNRATED_CR))), 'name', 'id'),
+    )
+    
+    # Encounter participants using this statblock
+    participants = db.relationship('EncounterMonster', back_populates='monster', cascade='all, delete-orphan')
+    
     def __repr__(self):
         return f'<Monster {self.name}>'
     
+    @validates('challenge_rating')
+    def sync_cr_value(self, key, challenge_rating):
+        self.cr_value = challenge.challenge_rating_value(challenge_rating)
+        return challenge_rating
+    
+    @hybrid_property
+    def cr_sort(self):
+        """Sort key of the challenge rating, unrated monsters last."""
+        return UNRATED_CR if self.cr_value is None else self.cr_value
+    
+    @cr_sort.expression
+    def cr_sort(cls):
+        # A literal rather than a bound parameter, so the database matches it to the index
+        return func.coalesce(cls.cr_value, literal_column(str(UNRATED_CR))).label('cr_sort')
+    
+    @property
+    def challenge_xp(self):
+        """The XP for the challenge rating, when no XP was entered."""
+        return self.xp or challenge.challenge_xp(self.cr_value)
+    
+    @property
+    def proficiency_bonus(self):
+        return challenge.proficiency_bonus(self.cr_value)
+    
     def ability_modifier(self, score):
         return (score - 10) // 2
     
@@ -107,6 +153,8 @@ class Monster(db.Model):
     def charisma_mod(self):
         return self.ability_modifier(self.charisma)
 
-    def export_pdf(self, rendered_html, temp_filename, options):
-        config = Configuration(wkhtmltopdf='C:/Program Files/wkhtmltopdf/bin/wkhtmltopdf.exe')  # Adjust path as needed
-        pdfkit.from_string(rendered_html, temp_filename, options=options, configuration=config) 
\ No newline at end of file
+    def export_pdf(self, campaign):
+        """Render this monster's statblock to PDF bytes on the app's renderer pool."""
+        from app.utils.pdf_renderer import render_statblocks
+        from app.utils.pdf_cache import PDF_TEMPLATE
+        return render_statblocks(campaign, [self], PDF_TEMPLATE)
@@ -8,7 +8,7 @@ class Player(db.Model):
     level = db.Column(db.Integer, default=1)
     description = db.Column(db.Text)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
-    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id'), nullable=False, index=True)
     
     def __repr__(self):
         return f'<Player {self.name}>' 
\ No newline at end of file
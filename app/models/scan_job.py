@@ -0,0 +1,33 @@
+from app import db
+from datetime import datetime
+import json
+
+class ScanJob(db.Model):
+    """A statblock image OCR job processed in the background."""
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    result = db.Column(db.Text)  # JSON payload returned to the client once finished
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow, index=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    started_at = db.Column(db.DateTime)  # when a worker began running it
+    
+    # The worker process whose pool holds the job; if it dies the job is never finished
+    worker_host = db.Column(db.String(255))
+    worker_pid = db.Column(db.Integer)
+    
+    # Foreign keys
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False, index=True)
+    campaign_id = db.Column(db.Integer, db.ForeignKey('campaign.id', ondelete='CASCADE'), nullable=False, index=True)
+    
+    ACTIVE_STATUSES = ('queued', 'running')
+    
+    @property
+    def is_finished(self):
+        return self.status not in self.ACTIVE_STATUSES
+    
+    @property
+    def result_data(self):
+        return json.loads(self.result) if self.result else None
+    
+    def __repr__(self):
+        return f'<ScanJob {self.id} {self.status}>'
@@ -1,3 +1,4 @@
+from flask import current_app
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 from app import db, login_manager
@@ -17,9 +18,16 @@ class User(UserMixin, db.Model):
     def check_password(self, password):
         return check_password_hash(self.password_hash, password)
     
+    @property
+    def is_admin(self):
+        """Admins are the users named in the ``ADMIN_USERNAMES`` config list."""
+        return self.username in current_app.config.get('ADMIN_USERNAMES', ())
+    
     def __repr__(self):
         return f'<User {self.username}>'
 
 @login_manager.user_loader
 def load_user(id):
-    return User.query.get(int(id)) 
\ No newline at end of file
+    # Served from the per-worker cache most of the time, see app.utils.auth_cache
+    from app.utils.auth_cache import cached_user
+    return cached_user(int(id)) 
\ No newline at end of file
@@ -1,9 +1,9 @@
 import math
 from typing import Dict, Union, Any
-import pytesseract
 from PIL import Image
 import re
 import json
+from app.utils.ocr_engine import image_to_string
 
 def ability_score_to_modifier(score: int) -> int:
     """Convert an ability score to its modifier."""
@@ -25,7 +25,7 @@ def process_monster_image(image_path: str) -> Dict[str, Any]:
         image = Image.open(image_path)
         
         # Extract text from image
-        text = pytesseract.image_to_string(image)
+        text = image_to_string(image)
         print("OCR Output:", text)  # Debug output
         
         # Initialize the result dictionary with default values
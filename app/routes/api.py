@@ -0,0 +1,55 @@
+from flask import Blueprint, jsonify
+from flask_login import login_required, current_user
+from app.utils.auth_cache import get_campaign_or_404
+from app.utils.pagination import (
+    MONSTER_LIST_COLUMNS, NPC_LIST_COLUMNS, campaign_monsters_page, campaign_npcs_page
+)
+
+bp = Blueprint('api', __name__, url_prefix='/api')
+
+def list_fields(row, columns):
+    return {column.key: getattr(row, column.key) for column in columns}
+
+def own_campaign_or_error(campaign_id):
+    """Return ``(campaign, None)`` for the user's own campaign, else ``(None, error_response)``."""
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        return None, (jsonify({
+            'success': False,
+            'message': 'You can only view your own campaigns!'
+        }), 403)
+    return campaign, None
+
+@bp.route('/campaigns/<int:campaign_id>/monsters')
+@login_required
+def list_monsters(campaign_id):
+    """A page of the campaign's monsters (not in an encounter), by name or ``sort=cr``.
+
+    Takes ``per_page`` and an ``after`` or ``before`` cursor from a previous page,
+    and ``cr_min`` / ``cr_max`` to keep a range of challenge ratings.
+    """
+    campaign, error_response = own_campaign_or_error(campaign_id)
+    if error_response is not None:
+        return error_response
+
+    page = campaign_monsters_page(campaign.id)
+    return jsonify({
+        'success': True,
+        'monsters': [list_fields(monster, MONSTER_LIST_COLUMNS) for monster in page.items],
+        **page.as_dict()
+    })
+
+@bp.route('/campaigns/<int:campaign_id>/npcs')
+@login_required
+def list_npcs(campaign_id):
+    """A page of the campaign's NPCs, by name (same paging arguments as the monsters)."""
+    campaign, error_response = own_campaign_or_error(campaign_id)
+    if error_response is not None:
+        return error_response
+
+    page = campaign_npcs_page(campaign.id)
+    return jsonify({
+        'success': True,
+        'npcs': [list_fields(npc, NPC_LIST_COLUMNS) for npc in page.items],
+        **page.as_dict()
+    })
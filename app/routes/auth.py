@@ -7,6 +7,7 @@ from flask_login import login_user, logout_user, current_user, login_required
 
 from app import db
 from app.models.user import User
+from app.utils.auth_cache import get_auth_cache
 
 bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -77,6 +78,7 @@ def login():
 @bp.route('/logout')
 @login_required
 def logout():
+    get_auth_cache().forget_user(current_user.id)
     logout_user()
     flash('You have been logged out.')
     return redirect(url_for('index')) 
\ No newline at end of file
@@ -1,9 +1,12 @@
 from flask import (
-    Blueprint, flash, g, redirect, render_template, request, url_for
+    Blueprint, flash, g, redirect, render_template, request, url_for, jsonify
 )
 from flask_login import login_required, current_user
+from sqlalchemy.orm import selectinload
 from app import db
 from app.models.campaign import Campaign
+from app.utils.search import search_campaign
+from app.utils.auth_cache import get_auth_cache, get_campaign_or_404
 
 bp = Blueprint('campaigns', __name__)
 
@@ -22,13 +25,37 @@ def list():
 @bp.route('/campaigns/<int:id>')
 @login_required
 def detail(id):
-    campaign = Campaign.query.get_or_404(id)
+    # Load the campaign with everything the page lists: one query per relationship
+    # instead of a count and a fetch for each of them
+    campaign = Campaign.query.options(
+        selectinload(Campaign.players),
+        selectinload(Campaign.npcs),
+        selectinload(Campaign.events),
+        selectinload(Campaign.encounters)
+    ).filter_by(id=id).first_or_404()
     if campaign.user_id != current_user.id:
         flash('You can only view your own campaigns!')
         return redirect(url_for('campaigns.list'))
         
     return render_template('campaigns/detail.html', campaign=campaign)
 
+@bp.route('/campaigns/<int:id>/search')
+@login_required
+def search(id):
+    """Ranked full-text search over the campaign's monsters, NPCs, events and loot (``?q=``)."""
+    campaign = get_campaign_or_404(id)
+    if campaign.user_id != current_user.id:
+        if request.args.get('format') == 'json':
+            return jsonify({'success': False, 'message': 'You can only search your own campaigns!'}), 403
+        flash('You can only search your own campaigns!')
+        return redirect(url_for('campaigns.list'))
+
+    query = request.args.get('q', '').strip()
+    results = search_campaign(campaign.id, query)
+    if request.args.get('format') == 'json':
+        return jsonify({'success': True, 'query': query, 'results': [result.as_dict() for result in results]})
+    return render_template('campaigns/search.html', campaign=campaign, query=query, results=results)
+
 @bp.route('/campaigns/create', methods=('GET', 'POST'))
 @login_required
 def create():
@@ -58,7 +85,7 @@ def create():
 @bp.route('/campaigns/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(id):
-    campaign = Campaign.query.get_or_404(id)
+    campaign = get_campaign_or_404(id)
     
     if campaign.user_id != current_user.id:
         flash('You can only delete your own campaigns!')
@@ -66,5 +93,6 @@ def delete(id):
         
     db.session.delete(campaign)
     db.session.commit()
+    get_auth_cache().forget_campaign(id)
     flash('Campaign deleted successfully!')
     return redirect(url_for('campaigns.list')) 
\ No newline at end of file
@@ -0,0 +1,31 @@
+from flask import Blueprint, render_template, redirect, url_for, flash, request, jsonify, current_app
+from flask_login import login_required, current_user
+from werkzeug.exceptions import Forbidden
+from app.utils.perf import get_perf_stats
+
+bp = Blueprint('debug', __name__, url_prefix='/debug')
+
+@bp.before_request
+@login_required
+def require_admin():
+    """Debug pages are only for the users listed in ``ADMIN_USERNAMES``."""
+    if not current_user.is_admin:
+        raise Forbidden()
+
+@bp.route('/perf')
+def perf():
+    """Per-endpoint request, SQL and render timings of this worker process."""
+    endpoints = get_perf_stats().snapshot()
+    if request.args.get('format') == 'json':
+        return jsonify({'endpoints': endpoints})
+    return render_template(
+        'debug/perf.html',
+        endpoints=endpoints,
+        slow_request_ms=current_app.config.get('PERF_SLOW_REQUEST_MS')
+    )
+
+@bp.route('/perf/reset', methods=('POST',))
+def perf_reset():
+    get_perf_stats().reset()
+    flash('Performance statistics have been reset.')
+    return redirect(url_for('debug.perf'))
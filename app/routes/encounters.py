@@ -2,48 +2,64 @@ from flask import (
     Blueprint, flash, redirect, render_template, request, url_for
 )
 from flask_login import login_required, current_user
+from sqlalchemy import func
+from sqlalchemy.orm import selectinload
 from app import db
 from app.models.encounter import Encounter
-from app.models.campaign import Campaign
-from app.models.loot import Loot
+from app.models.encounter_monster import EncounterMonster
+from app.models.monster import Monster
+from app.utils.auth_cache import get_campaign_or_404
+from app.utils.encounter_monsters import add_participants, MAX_COPIES
 
 bp = Blueprint('encounters', __name__, url_prefix='/campaigns/<int:campaign_id>/encounters')
 
 @bp.route('/')
 @login_required
 def list(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view your own campaigns!')
         return redirect(url_for('campaigns.list'))
     
     encounters = Encounter.query.filter_by(campaign_id=campaign_id).all()
-    return render_template('encounters/list.html', campaign=campaign, encounters=encounters)
+    # Count every encounter's monsters in one grouped query
+    monster_counts = dict(
+        db.session.query(EncounterMonster.encounter_id, func.count(EncounterMonster.id))
+        .join(Encounter)
+        .filter(Encounter.campaign_id == campaign_id)
+        .group_by(EncounterMonster.encounter_id)
+        .all()
+    )
+    return render_template('encounters/list.html', campaign=campaign, encounters=encounters,
+                           monster_counts=monster_counts)
 
 @bp.route('/<int:id>')
 @login_required
 def view(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view encounters in your own campaigns!')
         return redirect(url_for('campaigns.list'))
     
-    encounter = Encounter.query.get_or_404(id)
+    # Load the encounter with its monsters, their statblocks and loot up front
+    encounter = Encounter.query.options(
+        selectinload(Encounter.participants).selectinload(EncounterMonster.monster),
+        selectinload(Encounter.loot)
+    ).filter_by(id=id).first_or_404()
     if encounter.campaign_id != campaign_id:
         flash('Encounter does not belong to this campaign!')
         return redirect(url_for('encounters.list', campaign_id=campaign_id))
     
-    loot_items = Loot.query.filter_by(encounter_id=id).all()
-    
     return render_template('encounters/view.html',
                          campaign=campaign,
                          encounter=encounter,
-                         loot_items=loot_items)
+                         participants=encounter.participants,
+                         loot_items=encounter.loot)
 
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
 def create(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only add encounters to your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -78,7 +94,7 @@ def create(campaign_id):
 @bp.route('/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only delete encounters from your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -91,4 +107,69 @@ def delete(campaign_id, id):
     db.session.delete(encounter)
     db.session.commit()
     flash('Encounter deleted successfully!')
-    return redirect(url_for('encounters.list', campaign_id=campaign_id)) 
\ No newline at end of file
+    return redirect(url_for('encounters.list', campaign_id=campaign_id)) 
+
+@bp.route('/<int:id>/participants', methods=('POST',))
+@login_required
+def add_monsters(campaign_id, id):
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        flash('You can only change encounters in your own campaigns!')
+        return redirect(url_for('campaigns.list'))
+    
+    encounter = Encounter.query.get_or_404(id)
+    monster = Monster.query.get_or_404(request.form.get('monster_id', type=int))
+    if encounter.campaign_id != campaign_id or monster.campaign_id != campaign_id:
+        flash('Encounter does not belong to this campaign!')
+        return redirect(url_for('encounters.list', campaign_id=campaign_id))
+    
+    count = request.form.get('count', 1, type=int)
+    if not 1 <= count <= MAX_COPIES:
+        flash(f'You can add between 1 and {MAX_COPIES} copies at a time.')
+    else:
+        add_participants(encounter.id, monster, count)
+        db.session.commit()
+        flash(f'Added {count} x {monster.name} to the encounter!')
+    return redirect(url_for('encounters.view', campaign_id=campaign_id, id=id))
+
+@bp.route('/<int:id>/participants/<int:participant_id>', methods=('POST',))
+@login_required
+def update_participant(campaign_id, id, participant_id):
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        flash('You can only change encounters in your own campaigns!')
+        return redirect(url_for('campaigns.list'))
+    
+    participant = EncounterMonster.query.get_or_404(participant_id)
+    if participant.encounter_id != id or participant.encounter.campaign_id != campaign_id:
+        flash('Monster is not in this encounter!')
+        return redirect(url_for('encounters.list', campaign_id=campaign_id))
+    
+    label = request.form.get('label', participant.label).strip()
+    if not label:
+        flash('Label is required.')
+    else:
+        participant.label = label
+        participant.current_hit_points = request.form.get('current_hit_points', None, type=int)
+        participant.conditions = request.form.get('conditions', '').strip()
+        db.session.commit()
+        flash(f'{participant.label} updated!')
+    return redirect(url_for('encounters.view', campaign_id=campaign_id, id=id))
+
+@bp.route('/<int:id>/participants/<int:participant_id>/delete', methods=('POST',))
+@login_required
+def remove_participant(campaign_id, id, participant_id):
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        flash('You can only change encounters in your own campaigns!')
+        return redirect(url_for('campaigns.list'))
+    
+    participant = EncounterMonster.query.get_or_404(participant_id)
+    if participant.encounter_id != id or participant.encounter.campaign_id != campaign_id:
+        flash('Monster is not in this encounter!')
+        return redirect(url_for('encounters.list', campaign_id=campaign_id))
+    
+    db.session.delete(participant)
+    db.session.commit()
+    flash('Monster removed from the encounter!')
+    return redirect(url_for('encounters.view', campaign_id=campaign_id, id=id))
\ No newline at end of file
@@ -4,16 +4,16 @@ from flask import (
 from flask_login import login_required, current_user
 from app import db
 from app.models.event import Event
-from app.models.campaign import Campaign
 from app.models.npc import NPC
 from app.forms.event import EventForm
+from app.utils.auth_cache import get_campaign_or_404
 
 bp = Blueprint('events', __name__, url_prefix='/campaigns/<int:campaign_id>/events')
 
 @bp.route('/')
 @login_required
 def list(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view events in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -24,7 +24,7 @@ def list(campaign_id):
 @bp.route('/<int:id>')
 @login_required
 def view(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view events in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -39,7 +39,7 @@ def view(campaign_id, id):
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
 def create(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only add events to your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -71,7 +71,7 @@ def create(campaign_id):
 @bp.route('/<int:id>/edit', methods=('GET', 'POST'))
 @login_required
 def edit(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only edit events in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -110,7 +110,7 @@ def edit(campaign_id, id):
 @bp.route('/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only delete events from your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
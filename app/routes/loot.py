@@ -1,17 +1,17 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request
 from flask_login import login_required, current_user
 from app.models.loot import Loot
-from app.models.campaign import Campaign
 from app.models.encounter import Encounter
 from app.forms.loot import LootForm
 from app import db
+from app.utils.auth_cache import get_campaign_or_404
 
 bp = Blueprint('loot', __name__)
 
 @bp.route('/campaigns/<int:campaign_id>/encounters/<int:encounter_id>/loot')
 @login_required
 def list(campaign_id, encounter_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You do not have permission to view this campaign.', 'error')
         return redirect(url_for('campaigns.list'))
@@ -27,7 +27,7 @@ def list(campaign_id, encounter_id):
 @bp.route('/campaigns/<int:campaign_id>/encounters/<int:encounter_id>/loot/create', methods=['GET', 'POST'])
 @login_required
 def create(campaign_id, encounter_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You do not have permission to modify this campaign.', 'error')
         return redirect(url_for('campaigns.list'))
@@ -61,7 +61,7 @@ def create(campaign_id, encounter_id):
 @bp.route('/campaigns/<int:campaign_id>/encounters/<int:encounter_id>/loot/<int:id>/edit', methods=['GET', 'POST'])
 @login_required
 def edit(campaign_id, encounter_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You do not have permission to modify this campaign.', 'error')
         return redirect(url_for('campaigns.list'))
@@ -92,7 +92,7 @@ def edit(campaign_id, encounter_id, id):
 @bp.route('/campaigns/<int:campaign_id>/encounters/<int:encounter_id>/loot/<int:id>/delete', methods=['POST'])
 @login_required
 def delete(campaign_id, encounter_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You do not have permission to modify this campaign.', 'error')
         return redirect(url_for('campaigns.list'))
@@ -0,0 +1,22 @@
+import hmac
+from flask import Blueprint, Response, request, current_app
+from werkzeug.exceptions import Forbidden, NotImplemented
+from app.utils.metrics import PROMETHEUS_AVAILABLE, generate_metrics
+
+bp = Blueprint('metrics', __name__)
+
+@bp.route('/metrics')
+def metrics():
+    """Prometheus scrape of the request, OCR, PDF, SQL and worker pool metrics of every worker.
+
+    With ``METRICS_TOKEN`` set the scraper must send it as a bearer token.
+    """
+    if not PROMETHEUS_AVAILABLE:
+        raise NotImplemented('Metrics require prometheus_client (pip install prometheus-client).')
+
+    token = current_app.config.get('METRICS_TOKEN')
+    if token and not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {token}'):
+        raise Forbidden()
+
+    body, content_type = generate_metrics()
+    return Response(body, content_type=content_type)
@@ -1,17 +1,27 @@
 from flask import (
-    Blueprint, flash, redirect, render_template, request, url_for, jsonify, Response, send_file
+    Blueprint, flash, redirect, render_template, request, url_for, jsonify, Response, send_file, current_app
 )
 from flask_login import login_required, current_user
 from app import db
 from app.models.monster import Monster
 from app.models.encounter import Encounter
-from app.models.campaign import Campaign
-import pdfkit
-from pdfkit.configuration import Configuration
+from app.models.scan_job import ScanJob
+from app.utils.ocr_cache import get_ocr_cache
+from app.utils.ocr_pipeline import extract_text_from_image, parse_monster_data, ocr_pipeline_version
+from app.utils.scan_jobs import submit_scan_job, expire_scan_jobs, count_active_scan_jobs, get_scan_job
+from app.utils.statblock_import import split_pages, process_import, monster_rows, ImportFileError, MonsterDataError
+from app.utils.pdf_renderer import PDFQueueFullError
+from app.utils.pdf_cache import get_pdf_cache, monster_pdf_key
+from app.utils.pagination import campaign_monsters_page
+from app.utils.auth_cache import get_campaign_or_404
+from app.utils.encounter_monsters import add_participants, encounter_statblocks, MAX_COPIES
+from app.utils.bestiary import (
+    bestiary_monsters, bestiary_title, bestiary_filename, runs_in_background, render_bestiary,
+    new_export, process_bestiary_export, export_path, expire_bestiary_exports
+)
 import io
 import os
 from werkzeug.utils import secure_filename
-import tempfile
 from werkzeug.exceptions import NotFound
 import logging
 import json
@@ -20,32 +30,25 @@ import json
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-try:
-    # Try to import the full OCR implementation first
-    from app.utils.ocr import extract_text_from_image, parse_monster_data
-    logger.info("Using full OCR implementation with OpenCV")
-except ImportError:
-    # Fall back to simplified implementation if there are import errors
-    from app.utils.simple_ocr import extract_text_from_image, parse_monster_data
-    logger.info("Using simplified OCR implementation without OpenCV")
-
 bp = Blueprint('monsters', __name__, url_prefix='/campaigns/<int:campaign_id>')
 
 @bp.route('/monsters')
 @login_required
 def list(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view your own campaigns!')
         return redirect(url_for('campaigns.list'))
     
-    monsters = Monster.query.filter_by(campaign_id=campaign_id, encounter_id=None).all()
-    return render_template('monsters/list.html', campaign=campaign, monsters=monsters)
+    page = campaign_monsters_page(campaign_id)
+    bestiary_size = Monster.query.filter_by(campaign_id=campaign_id).count()
+    return render_template('monsters/list.html', campaign=campaign, monsters=page.items, page=page,
+                           bestiary_background=runs_in_background(bestiary_size))
 
 @bp.route('/encounters/<int:encounter_id>/monsters')
 @login_required
 def encounter_monsters(campaign_id, encounter_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view monsters in your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -55,14 +58,15 @@ def encounter_monsters(campaign_id, encounter_id):
         flash('Encounter does not belong to this campaign!')
         return redirect(url_for('encounters.list', campaign_id=campaign_id))
     
-    monsters = Monster.query.filter_by(encounter_id=encounter_id).all()
-    return render_template('monsters/encounter_monsters.html', campaign=campaign, encounter=encounter, monsters=monsters)
+    monsters = encounter_statblocks(encounter_id).order_by(Monster.id).all()
+    return render_template('monsters/encounter_monsters.html', campaign=campaign, encounter=encounter, monsters=monsters,
+                           max_copies=MAX_COPIES, bestiary_background=runs_in_background(len(monsters)))
 
-@bp.route('/monsters/create', defaults={'encounter_id': None})
-@bp.route('/encounters/<int:encounter_id>/monsters/create')
+@bp.route('/monsters/create', methods=('GET', 'POST'), defaults={'encounter_id': None})
+@bp.route('/encounters/<int:encounter_id>/monsters/create', methods=('GET', 'POST'))
 @login_required
 def create(campaign_id, encounter_id=None):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only add monsters to your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -188,6 +192,11 @@ def create(campaign_id, encounter_id=None):
                 encounter_id=encounter_id
             )
             db.session.add(monster)
+            if encounter_id:
+                # The statblock is stored once, the copies are participant rows
+                copies = min(max(request.form.get('copies', 1, type=int), 1), MAX_COPIES)
+                db.session.flush()
+                add_participants(encounter_id, monster, copies)
             db.session.commit()
             
             flash('Monster added successfully!')
@@ -196,12 +205,12 @@ def create(campaign_id, encounter_id=None):
             else:
                 return redirect(url_for('monsters.list', campaign_id=campaign_id))
     
-    return render_template('monsters/create.html', campaign=campaign, encounter=encounter)
+    return render_template('monsters/create.html', campaign=campaign, encounter=encounter, max_copies=MAX_COPIES)
 
 @bp.route('/monsters/<int:id>/view')
 @login_required
 def view(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view monsters in your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -211,12 +220,14 @@ def view(campaign_id, id):
         flash('Monster does not belong to this campaign!')
         return redirect(url_for('monsters.list', campaign_id=campaign_id))
     
-    return render_template('monsters/view.html', campaign=campaign, monster=monster)
+    encounters = Encounter.query.filter_by(campaign_id=campaign_id).order_by(Encounter.name).all()
+    return render_template('monsters/view.html', campaign=campaign, monster=monster, encounters=encounters,
+                           max_copies=MAX_COPIES)
 
 @bp.route('/monsters/<int:id>/edit', methods=('GET', 'POST'))
 @login_required
 def edit(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only edit monsters in your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -303,7 +314,7 @@ def edit(campaign_id, id):
 @bp.route('/monsters/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only delete monsters in your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -325,10 +336,40 @@ def delete(campaign_id, id):
     else:
         return redirect(url_for('monsters.list', campaign_id=campaign_id))
 
+def pdf_response(pdf, monster, etag=None):
+    """Send rendered PDF bytes as a statblock download."""
+    response = send_file(
+        io.BytesIO(pdf),
+        as_attachment=True,
+        download_name=f"{monster.name}_statblock.pdf",
+        mimetype='application/pdf',
+        etag=etag or False
+    )
+    # Downloads are per-user, so browsers may keep them but must revalidate
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def statblock_pdf_response(campaign, monster):
+    """Return the statblock PDF of a monster: a 304 when the client's copy is
+    current, the cached PDF when the monster hasn't changed, or a fresh render."""
+    key = monster_pdf_key(monster)
+    if request.if_none_match.contains(key):
+        return Response(status=304, headers={'ETag': f'"{key}"', 'Cache-Control': 'private, no-cache'})
+    
+    cache = get_pdf_cache()
+    pdf = cache.get(key)
+    if pdf is None:
+        pdf = monster.export_pdf(campaign)
+        cache.set(key, pdf)
+    else:
+        logger.info(f"Serving cached PDF for monster {monster.id}")
+    
+    return pdf_response(pdf, monster, etag=key)
+
 @bp.route('/monsters/<int:id>/export-pdf')
 @login_required
 def export_pdf(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only export monsters from your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -339,172 +380,259 @@ def export_pdf(campaign_id, id):
         return redirect(url_for('monsters.list', campaign_id=campaign_id))
     
     try:
-        # Render the HTML template with the monster data
-        rendered_html = render_template('monsters/pdf_template.html', campaign=campaign, monster=monster)
-        
-        # Create a temporary file to store the PDF
-        with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp:
-            temp_filename = temp.name
-        
-        # Configuration for wkhtmltopdf
-        options = {
-            'page-size': 'Letter',
-            'margin-top': '0.5in',
-            'margin-right': '0.5in',
-            'margin-bottom': '0.5in',
-            'margin-left': '0.5in',
-            'encoding': 'UTF-8',
-            'no-outline': None,
-            'enable-local-file-access': None
-        }
-        
-        # Configure wkhtmltopdf path
-        config = Configuration(wkhtmltopdf='C:/Program Files/wkhtmltopdf/bin/wkhtmltopdf.exe')  # Adjust path if needed
-        
-        # Convert HTML to PDF
-        pdfkit.from_string(rendered_html, temp_filename, options=options, configuration=config)
-        
-        # Send the file to the user
-        response = send_file(
-            temp_filename,
-            as_attachment=True,
-            download_name=f"{monster.name}_statblock.pdf",
-            mimetype='application/pdf'
-        )
-        
-        # Delete the temporary file after sending (wrap in a function to ensure deletion)
-        @response.call_on_close
-        def cleanup():
-            if os.path.exists(temp_filename):
-                os.remove(temp_filename)
-        
-        return response
+        return statblock_pdf_response(campaign, monster)
     except Exception as e:
         flash(f'Error generating PDF: {str(e)}')
         return redirect(url_for('monsters.view', campaign_id=campaign_id, id=id))
 
 @bp.route('/monsters/<int:id>/pdf')
 @login_required
-def generate_pdf(id):
+def generate_pdf(campaign_id, id):
+    campaign = get_campaign_or_404(campaign_id)
     monster = Monster.query.get_or_404(id)
+    if campaign.user_id != current_user.id or monster.campaign_id != campaign_id:
+        raise NotFound()
     
-    # Render the HTML template with the monster data
-    rendered_html = render_template('monsters/pdf_template.html', monster=monster)
-    
-    # Create a temporary file to store the PDF
-    with tempfile.NamedTemporaryFile(suffix='.pdf', delete=False) as temp:
-        temp_filename = temp.name
-    
-    # Configuration for wkhtmltopdf
-    options = {
-        'page-size': 'Letter',
-        'margin-top': '0.5in',
-        'margin-right': '0.5in',
-        'margin-bottom': '0.5in',
-        'margin-left': '0.5in',
-        'encoding': 'UTF-8',
-        'no-outline': None,
-        'enable-local-file-access': None
-    }
+    try:
+        return statblock_pdf_response(campaign, monster)
+    except PDFQueueFullError as e:
+        return Response(str(e), status=503, headers={'Retry-After': '5'})
+
+def get_bestiary_scope(campaign_id, encounter_id):
+    """Return the campaign and (optional) encounter of a bestiary export, or raise NotFound."""
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        raise NotFound()
     
-    # Configure wkhtmltopdf path
-    config = Configuration(wkhtmltopdf='C:/Program Files/wkhtmltopdf/bin/wkhtmltopdf.exe')  # Adjust path if needed
+    encounter = None
+    if encounter_id is not None:
+        encounter = Encounter.query.get_or_404(encounter_id)
+        if encounter.campaign_id != campaign_id:
+            raise NotFound()
+    return campaign, encounter
+
+def queue_bestiary_export(campaign_id, encounter_id):
+    """Queue a bestiary export on the background job pool and answer 202 with the URL to poll."""
+    expire_scan_jobs()
+    expire_bestiary_exports()
+    if count_active_scan_jobs(current_user.id) >= current_app.config.get('SCAN_JOBS_PER_USER', 2):
+        return jsonify({
+            'success': False,
+            'message': 'You already have jobs in progress. Please wait for them to finish.'
+        }), 429
+    
+    job = submit_scan_job(current_user.id, campaign_id, new_export(campaign_id, encounter_id), process_bestiary_export)
+    status_url = url_for('monsters.bestiary_job_status', campaign_id=campaign_id, job_id=job.id)
+    
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@bp.route('/monsters/bestiary-pdf', defaults={'encounter_id': None})
+@bp.route('/encounters/<int:encounter_id>/monsters/bestiary-pdf')
+@login_required
+def bestiary_pdf(campaign_id, encounter_id=None):
+    """
+    Export every monster of the campaign (or of one encounter) as one paginated PDF.
+    Large bestiaries are queued as a background job instead (202 with a status URL).
+    """
+    campaign, encounter = get_bestiary_scope(campaign_id, encounter_id)
+    if encounter is not None:
+        back_url = url_for('monsters.encounter_monsters', campaign_id=campaign_id, encounter_id=encounter_id)
+    else:
+        back_url = url_for('monsters.list', campaign_id=campaign_id)
     
-    # Convert HTML to PDF
-    pdfkit.from_string(rendered_html, temp_filename, options=options, configuration=config)
+    monsters = bestiary_monsters(campaign, encounter)
+    if not monsters:
+        flash('There are no monsters to export.')
+        return redirect(back_url)
+    if runs_in_background(len(monsters)):
+        return queue_bestiary_export(campaign_id, encounter_id)
     
-    # Send the file to the user
-    response = send_file(
-        temp_filename,
+    try:
+        pdf = render_bestiary(campaign, monsters, bestiary_title(campaign, encounter))
+    except PDFQueueFullError as e:
+        return Response(str(e), status=503, headers={'Retry-After': '5'})
+    except Exception as e:
+        flash(f'Error generating PDF: {str(e)}')
+        return redirect(back_url)
+    
+    return send_file(
+        io.BytesIO(pdf),
         as_attachment=True,
-        download_name=f"{monster.name}_statblock.pdf",
+        download_name=bestiary_filename(campaign, encounter),
         mimetype='application/pdf'
     )
-    
-    # Delete the temporary file after sending (wrap in a function to ensure deletion)
-    @response.call_on_close
-    def cleanup():
-        if os.path.exists(temp_filename):
-            os.remove(temp_filename)
-    
-    return response
 
-@bp.route('/monsters/scan-image', methods=['POST'])
+@bp.route('/monsters/bestiary-pdf/jobs', methods=['POST'], defaults={'encounter_id': None})
+@bp.route('/encounters/<int:encounter_id>/monsters/bestiary-pdf/jobs', methods=['POST'])
 @login_required
-def scan_image(campaign_id):
+def bestiary_pdf_async(campaign_id, encounter_id=None):
     """
-    Process uploaded monster statblock image with OCR and extract data.
-    Returns JSON with extracted monster data.
+    Queue a bestiary PDF export in the background, whatever its size.
     """
-    # Verify campaign exists and belongs to user
-    campaign = Campaign.query.get_or_404(campaign_id)
-    if campaign.user_id != current_user.id:
+    get_bestiary_scope(campaign_id, encounter_id)
+    return queue_bestiary_export(campaign_id, encounter_id)
+
+@bp.route('/monsters/bestiary-pdf/jobs/<job_id>')
+@login_required
+def bestiary_job_status(campaign_id, job_id):
+    """
+    Return the status of a background bestiary export, with its download URL once finished.
+    """
+    get_bestiary_scope(campaign_id, None)
+    expire_scan_jobs()
+    job = get_scan_job(job_id)
+    if job is None or job.user_id != current_user.id or job.campaign_id != campaign_id:
         return jsonify({
             'success': False,
-            'message': 'You can only add monsters to your own campaigns!'
-        }), 403
+            'message': 'Export job not found or expired.'
+        }), 404
+    
+    data = {
+        'success': True,
+        'job_id': job.id,
+        'status': job.status
+    }
+    if job.is_finished:
+        data['result'] = job.result_data
+        if job.status == 'done':
+            data['result']['download_url'] = url_for('monsters.bestiary_job_download', campaign_id=campaign_id, job_id=job.id)
     
+    return jsonify(data)
+
+@bp.route('/monsters/bestiary-pdf/jobs/<job_id>/download')
+@login_required
+def bestiary_job_download(campaign_id, job_id):
+    """
+    Stream the PDF written by a finished background bestiary export.
+    """
+    get_bestiary_scope(campaign_id, None)
+    job = db.session.get(ScanJob, job_id)
+    if job is None or job.user_id != current_user.id or job.campaign_id != campaign_id or job.status != 'done':
+        raise NotFound()
+    
+    result = job.result_data
+    path = export_path(result.get('file_id'))
+    if path is None or not os.path.exists(path):
+        raise NotFound()
+    
+    return send_file(path, as_attachment=True, download_name=result['filename'], mimetype='application/pdf')
+
+def get_statblock_upload():
+    """
+    Return the bytes of the uploaded statblock image, or an error response
+    if no image was uploaded.
+    """
     # Check if image was uploaded
     if 'statblock_image' not in request.files:
-        return jsonify({
+        return None, (jsonify({
             'success': False,
             'message': 'No image file uploaded'
-        }), 400
+        }), 400)
     
     image_file = request.files['statblock_image']
     
     # Check if file is empty
     if image_file.filename == '':
-        return jsonify({
+        return None, (jsonify({
             'success': False,
             'message': 'No image file selected'
-        }), 400
+        }), 400)
+    
+    # Read image bytes
+    image_bytes = image_file.read()
+    
+    # Save the original image for debugging
+    debug_dir = os.path.join('app', 'static', 'debug')
+    os.makedirs(debug_dir, exist_ok=True)
+    original_path = os.path.join(debug_dir, 'original_upload.jpg')
+    with open(original_path, 'wb') as f:
+        f.write(image_bytes)
+    logger.info(f"Saved original image to {original_path}")
+    
+    return image_bytes, None
+
+def process_statblock_image(image_bytes):
+    """
+    Run OCR and parsing on a statblock image.
+    Returns a (payload, status_code) pair with a JSON serializable payload.
+    """
+    # Re-uploads of the same image are served from the OCR cache
+    ocr_cache = get_ocr_cache()
+    cache_key = ocr_cache.make_key(image_bytes, ocr_pipeline_version())
+    cached = ocr_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"OCR cache hit for {cache_key}")
+        return {
+            'success': True,
+            'message': 'Monster data extracted successfully!',
+            'monster_data': cached['monster_data'],
+            'raw_text': cached['raw_text'],
+            'cached': True
+        }, 200
+    
+    # Extract text from image
+    extracted_text = extract_text_from_image(image_bytes)
+    
+    if not extracted_text:
+        return {
+            'success': False,
+            'message': 'Could not extract text from image. Please try a clearer image.'
+        }, 400
+    
+    # Parse text to extract monster data
+    monster_data = parse_monster_data(extracted_text)
+    
+    if not monster_data:
+        return {
+            'success': False,
+            'message': 'Could not parse monster data from extracted text.',
+            'raw_text': extracted_text
+        }, 400
+    
+    # Log the extracted data for debugging
+    logger.info(f"Extracted monster data: {monster_data}")
+    
+    ocr_cache.set(cache_key, extracted_text, monster_data)
+    
+    # Return the extracted data
+    return {
+        'success': True,
+        'message': 'Monster data extracted successfully!',
+        'monster_data': monster_data,
+        'raw_text': extracted_text
+    }, 200
+
+@bp.route('/monsters/scan-image', methods=['POST'])
+@login_required
+def scan_image(campaign_id):
+    """
+    Process uploaded monster statblock image with OCR and extract data.
+    Returns JSON with extracted monster data.
+    """
+    # Verify campaign exists and belongs to user
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        return jsonify({
+            'success': False,
+            'message': 'You can only add monsters to your own campaigns!'
+        }), 403
     
     # Process the image
     try:
-        # Read image bytes
-        image_bytes = image_file.read()
-        
-        # Save the original image for debugging
-        debug_dir = os.path.join('app', 'static', 'debug')
-        os.makedirs(debug_dir, exist_ok=True)
-        original_path = os.path.join(debug_dir, 'original_upload.jpg')
-        with open(original_path, 'wb') as f:
-            f.write(image_bytes)
-        logger.info(f"Saved original image to {original_path}")
-        
-        # Extract text from image
-        extracted_text = extract_text_from_image(image_bytes)
-        
-        if not extracted_text:
-            return jsonify({
-                'success': False,
-                'message': 'Could not extract text from image. Please try a clearer image.',
-                'debug_url': url_for('static', filename='debug/debug_ocr_image.png')
-            }), 400
+        image_bytes, error_response = get_statblock_upload()
+        if error_response is not None:
+            return error_response
         
-        # Parse text to extract monster data
-        monster_data = parse_monster_data(extracted_text)
-        
-        if not monster_data:
-            return jsonify({
-                'success': False,
-                'message': 'Could not parse monster data from extracted text.',
-                'raw_text': extracted_text,
-                'debug_url': url_for('static', filename='debug/debug_ocr_image.png')
-            }), 400
-        
-        # Log the extracted data for debugging
-        logger.info(f"Extracted monster data: {monster_data}")
-        
-        # Return the extracted data
-        return jsonify({
-            'success': True,
-            'message': 'Monster data extracted successfully!',
-            'monster_data': monster_data,
-            'raw_text': extracted_text,
-            'debug_url': url_for('static', filename='debug/debug_ocr_image.png')
-        })
+        payload, status_code = process_statblock_image(image_bytes)
+        payload['debug_url'] = url_for('static', filename='debug/debug_ocr_image.png')
+        return jsonify(payload), status_code
         
     except Exception as e:
         logger.error(f"Error processing image: {str(e)}")
@@ -514,6 +642,181 @@ def scan_image(campaign_id):
             'debug_url': url_for('static', filename='debug/debug_ocr_image.png')
         }), 500
 
+@bp.route('/monsters/scan-image/jobs', methods=['POST'])
+@login_required
+def scan_image_async(campaign_id):
+    """
+    Queue an uploaded monster statblock image for OCR in the background.
+    Returns 202 Accepted with the job id and the URL to poll for the result.
+    """
+    # Verify campaign exists and belongs to user
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        return jsonify({
+            'success': False,
+            'message': 'You can only add monsters to your own campaigns!'
+        }), 403
+    
+    expire_scan_jobs()
+    if count_active_scan_jobs(current_user.id) >= current_app.config.get('SCAN_JOBS_PER_USER', 2):
+        return jsonify({
+            'success': False,
+            'message': 'You already have scans in progress. Please wait for them to finish.'
+        }), 429
+    
+    image_bytes, error_response = get_statblock_upload()
+    if error_response is not None:
+        return error_response
+    
+    job = submit_scan_job(current_user.id, campaign_id, image_bytes, process_statblock_image)
+    status_url = url_for('monsters.scan_job_status', campaign_id=campaign_id, job_id=job.id)
+    
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'status_url': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@bp.route('/monsters/scan-image/jobs/<job_id>')
+@login_required
+def scan_job_status(campaign_id, job_id):
+    """
+    Return the status of a background scan job, and its result once finished.
+    """
+    # Verify campaign exists and belongs to user
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        return jsonify({
+            'success': False,
+            'message': 'You can only add monsters to your own campaigns!'
+        }), 403
+    
+    expire_scan_jobs()
+    job = get_scan_job(job_id)
+    if job is None or job.user_id != current_user.id or job.campaign_id != campaign_id:
+        return jsonify({
+            'success': False,
+            'message': 'Scan job not found or expired.'
+        }), 404
+    
+    data = {
+        'success': True,
+        'job_id': job.id,
+        'status': job.status
+    }
+    if job.is_finished:
+        data['result'] = job.result_data
+        data['result']['debug_url'] = url_for('static', filename='debug/debug_ocr_image.png')
+    elif job.result:
+        # The pages an import job has finished so far
+        data['result'] = job.result_data
+    
+    return jsonify(data)
+
+@bp.route('/monsters/import', methods=('GET', 'POST'))
+@login_required
+def import_statblocks(campaign_id):
+    """
+    Bulk import statblocks from a zip of images or a multi-page PDF.
+    POST queues the pages' OCR as a scan job and returns 202 Accepted with the
+    URL to poll; the job's result lists each page as soon as it has finished.
+    """
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        if request.method == 'GET':
+            flash('You can only add monsters to your own campaigns!')
+            return redirect(url_for('campaigns.list'))
+        return jsonify({
+            'success': False,
+            'message': 'You can only add monsters to your own campaigns!'
+        }), 403
+    
+    if request.method == 'GET':
+        return render_template('monsters/import.html', campaign=campaign)
+    
+    expire_scan_jobs()
+    if count_active_scan_jobs(current_user.id) >= current_app.config.get('SCAN_JOBS_PER_USER', 2):
+        return jsonify({
+            'success': False,
+            'message': 'You already have scans in progress. Please wait for them to finish.'
+        }), 429
+    
+    upload = request.files.get('statblock_archive')
+    if upload is None or upload.filename == '':
+        return jsonify({
+            'success': False,
+            'message': 'No zip or PDF file uploaded'
+        }), 400
+    
+    try:
+        pages = split_pages(
+            upload.filename,
+            upload.read(),
+            max_pages=current_app.config.get('IMPORT_MAX_PAGES', 100)
+        )
+    except ImportFileError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e)
+        }), 400
+    
+    # A whole bestiary takes longer than a request may, so it's OCRed in the background
+    job = submit_scan_job(current_user.id, campaign_id, pages, process_import, reports_progress=True)
+    status_url = url_for('monsters.scan_job_status', campaign_id=campaign_id, job_id=job.id)
+    
+    response = jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'total': len(pages),
+        'status_url': status_url
+    })
+    response.headers['Location'] = status_url
+    return response, 202
+
+@bp.route('/monsters/import/save', methods=('POST',))
+@login_required
+def import_save(campaign_id):
+    """
+    Insert the statblocks accepted on the import page in a single transaction.
+    Expects JSON: {"monsters": [monster_data, ...]}
+    """
+    campaign = get_campaign_or_404(campaign_id)
+    if campaign.user_id != current_user.id:
+        return jsonify({
+            'success': False,
+            'message': 'You can only add monsters to your own campaigns!'
+        }), 403
+    
+    data = request.get_json(silent=True)
+    try:
+        rows = monster_rows(data.get('monsters') if isinstance(data, dict) else None, campaign_id)
+    except MonsterDataError as e:
+        return jsonify({
+            'success': False,
+            'message': str(e),
+            'index': e.index,
+            'field': e.field
+        }), 400
+    if not rows:
+        return jsonify({
+            'success': False,
+            'message': 'No monsters selected for import.'
+        }), 400
+    
+    db.session.execute(db.insert(Monster), rows)
+    db.session.commit()
+    
+    flash(f'Imported {len(rows)} monsters successfully!')
+    return jsonify({
+        'success': True,
+        'created': len(rows),
+        'redirect_url': url_for('monsters.list', campaign_id=campaign_id)
+    })
+
 @bp.route('/ocr-debug')
 @login_required
 def ocr_debug():
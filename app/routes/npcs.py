@@ -2,26 +2,27 @@ from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_login import login_required, current_user
 from app import db
 from app.models.npc import NPC
-from app.models.campaign import Campaign
 from app.forms.npc import NPCForm
+from app.utils.pagination import campaign_npcs_page
+from app.utils.auth_cache import get_campaign_or_404
 
 bp = Blueprint('npcs', __name__, url_prefix='/campaigns/<int:campaign_id>/npcs')
 
 @bp.route('/')
 @login_required
 def list(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view NPCs in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
     
-    npcs = NPC.query.filter_by(campaign_id=campaign_id).order_by(NPC.name).all()
-    return render_template('npcs/list.html', campaign=campaign, npcs=npcs)
+    page = campaign_npcs_page(campaign_id)
+    return render_template('npcs/list.html', campaign=campaign, npcs=page.items, page=page)
 
 @bp.route('/<int:id>')
 @login_required
 def view(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view NPCs in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -36,7 +37,7 @@ def view(campaign_id, id):
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
 def create(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only add NPCs to your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -62,7 +63,7 @@ def create(campaign_id):
 @bp.route('/<int:id>/edit', methods=('GET', 'POST'))
 @login_required
 def edit(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only edit NPCs in your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
@@ -89,7 +90,7 @@ def edit(campaign_id, id):
 @bp.route('/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only delete NPCs from your own campaigns!', 'error')
         return redirect(url_for('campaigns.list'))
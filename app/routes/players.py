@@ -4,14 +4,14 @@ from flask import (
 from flask_login import login_required, current_user
 from app import db
 from app.models.player import Player
-from app.models.campaign import Campaign
+from app.utils.auth_cache import get_campaign_or_404
 
 bp = Blueprint('players', __name__, url_prefix='/campaigns/<int:campaign_id>/players')
 
 @bp.route('/')
 @login_required
 def list(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only view your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -22,7 +22,7 @@ def list(campaign_id):
 @bp.route('/create', methods=('GET', 'POST'))
 @login_required
 def create(campaign_id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only add players to your own campaigns!')
         return redirect(url_for('campaigns.list'))
@@ -57,7 +57,7 @@ def create(campaign_id):
 @bp.route('/<int:id>/delete', methods=('POST',))
 @login_required
 def delete(campaign_id, id):
-    campaign = Campaign.query.get_or_404(campaign_id)
+    campaign = get_campaign_or_404(campaign_id)
     if campaign.user_id != current_user.id:
         flash('You can only delete players from your own campaigns!')
         return redirect(url_for('campaigns.list'))
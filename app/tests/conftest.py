@@ -1,6 +1,8 @@
 import os
 import tempfile
+from contextlib import contextmanager
 import pytest
+from sqlalchemy import event
 from app import create_app, db
 from app.models.user import User
 
@@ -31,10 +33,12 @@ def app():
         db.session.remove()
         db.drop_all()
     
-    try:
-        os.unlink(db_path)
-    except:
-        pass  # Ignore errors during cleanup
+    # The SQLite write-ahead log and shared memory files too (WAL journal mode)
+    for path in (db_path, db_path + '-wal', db_path + '-shm'):
+        try:
+            os.unlink(path)
+        except:
+            pass  # Ignore errors during cleanup
 
 @pytest.fixture
 def client(app):
@@ -59,4 +63,52 @@ class AuthActions:
 
 @pytest.fixture
 def auth(client):
-    return AuthActions(client) 
\ No newline at end of file
+    return AuthActions(client) 
+
+class QueryCounter:
+    """Records the SQL statements run on an engine while it is active."""
+    def __init__(self):
+        self.statements = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def __len__(self):
+        return len(self.statements)
+
+@pytest.fixture
+def max_queries(app):
+    """Assert that a block of code runs at most ``limit`` SQL statements.
+
+        with max_queries(5):
+            client.get('/campaigns/1')
+    """
+    @contextmanager
+    def max_queries(limit):
+        with app.app_context():
+            engine = db.engine
+        counter = QueryCounter()
+        event.listen(engine, 'before_cursor_execute', counter)
+        try:
+            yield counter
+        finally:
+            event.remove(engine, 'before_cursor_execute', counter)
+        assert len(counter) <= limit, (
+            f'{len(counter)} queries run, expected at most {limit}:\n' + '\n'.join(counter.statements)
+        )
+
+    return max_queries
+
+@pytest.fixture
+def walk_pages(client):
+    """Follow the next cursors of a paginated JSON list from its first page; return the pages.
+
+        pages = walk_pages('/api/campaigns/1/monsters', per_page=3)
+    """
+    def walk_pages(url, **args):
+        pages = [client.get(url, query_string=args).get_json()]
+        while pages[-1]['next_cursor']:
+            pages.append(client.get(url, query_string=dict(args, after=pages[-1]['next_cursor'])).get_json())
+        return pages
+
+    return walk_pages
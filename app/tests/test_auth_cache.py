@@ -0,0 +1,118 @@
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.npc import NPC
+from app.models.user import load_user
+from app.utils import auth_cache
+from app.utils.auth_cache import TTLCache
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        db.session.add(NPC(name='Durnan', role='Innkeeper', campaign_id=campaign.id))
+        db.session.commit()
+        return campaign.id
+
+def campaign_lookups(statements):
+    return [sql for sql in statements if 'FROM campaign' in sql]
+
+def test_user_loader_is_cached(app, max_queries):
+    with app.app_context():
+        with max_queries(1):
+            assert load_user('1').username == 'test'
+    with app.app_context():
+        with max_queries(0):
+            user = load_user('1')
+            assert user.username == 'test' and user in db.session
+        assert load_user('2') is None
+
+def test_repeat_requests_skip_the_campaign_lookup(client, auth, campaign_id, max_queries):
+    auth.login()
+    with max_queries(10) as first:
+        client.get(f'/campaigns/{campaign_id}/npcs/')
+    assert len(campaign_lookups(first.statements)) == 1
+
+    with max_queries(10) as second:
+        response = client.get(f'/campaigns/{campaign_id}/npcs/')
+    assert response.status_code == 200
+    assert b'Durnan' in response.data and b'Test Campaign' in response.data
+    assert campaign_lookups(second.statements) == []
+    assert len(second) == len(first) - 1
+
+def test_cached_campaign_loads_relationships(client, auth, campaign_id):
+    auth.login()
+    client.get(f'/campaigns/{campaign_id}/npcs/')
+    response = client.post(f'/campaigns/{campaign_id}/npcs/create', data={'name': 'Volo', 'role': 'Author'})
+    assert response.status_code == 302
+    assert b'Volo' in client.get(f'/campaigns/{campaign_id}/npcs/').data
+
+def test_other_users_campaigns_are_not_cached(client, auth, app):
+    with app.app_context():
+        campaign = Campaign(title='Not Mine', description='', user_id=2)
+        db.session.add(campaign)
+        db.session.commit()
+        campaign_id = campaign.id
+    auth.login()
+    assert client.get(f'/api/campaigns/{campaign_id}/monsters').status_code == 403
+    assert len(app.extensions['auth_cache'].campaigns) == 0
+    assert client.get(f'/api/campaigns/{campaign_id}/monsters').status_code == 403
+
+def test_logout_forgets_the_user(client, auth, app, campaign_id):
+    auth.login()
+    client.get(f'/campaigns/{campaign_id}/npcs/')
+    cache = app.extensions['auth_cache']
+    with app.app_context():
+        load_user('1')
+    assert len(cache.users) == 1 and len(cache.campaigns) == 1
+
+    auth.logout()
+    assert len(cache.users) == 0 and len(cache.campaigns) == 0
+    assert client.get(f'/campaigns/{campaign_id}/npcs/').status_code == 302
+
+def test_deleting_a_campaign_forgets_it(client, auth, campaign_id):
+    auth.login()
+    client.get(f'/campaigns/{campaign_id}/npcs/')
+    client.post(f'/campaigns/{campaign_id}/delete')
+    assert client.get(f'/campaigns/{campaign_id}/npcs/').status_code == 404
+
+def test_writes_recheck_a_campaign_deleted_by_another_worker(client, auth, app, campaign_id):
+    auth.login()
+    client.get(f'/campaigns/{campaign_id}/npcs/')
+    # Given to another user by a request this worker's cache didn't see
+    with app.app_context():
+        db.session.get(Campaign, campaign_id).user_id = 2
+        db.session.commit()
+    
+    # Reads may use the cached copy until it expires, writes look it up again
+    assert client.get(f'/campaigns/{campaign_id}/npcs/').status_code == 200
+    client.post(f'/campaigns/{campaign_id}/npcs/create', data={'name': 'Volo', 'role': 'Author'})
+    with app.app_context():
+        assert NPC.query.filter_by(name='Volo').count() == 0
+    assert len(app.extensions['auth_cache'].campaigns) == 0
+    
+    with app.app_context():
+        db.session.delete(db.session.get(Campaign, campaign_id))
+        db.session.commit()
+    assert client.post(f'/campaigns/{campaign_id}/npcs/create', data={'name': 'Volo'}).status_code == 404
+
+def test_entries_expire(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(auth_cache.time, 'monotonic', lambda: now[0])
+    cache = TTLCache(ttl=30, max_entries=2)
+    cache.set('a', 1)
+    now[0] += 29
+    assert cache.get('a') == 1
+    now[0] += 1
+    assert cache.get('a') is None
+
+    for key in 'abc':
+        cache.set(key, key)
+    assert cache.get('a') is None and len(cache) == 2
+
+def test_zero_ttl_disables_the_cache():
+    cache = TTLCache(ttl=0)
+    cache.set('a', 1)
+    assert cache.get('a') is None
@@ -0,0 +1,93 @@
+import json
+from unittest.mock import patch
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.monster import Monster
+
+class RecordingBackend:
+    """Fake renderer recording every HTML document it was given."""
+    documents = []
+
+    def render(self, html, options=None, timeout=None):
+        RecordingBackend.documents.append(html)
+        return b'%PDF-' + html.encode()
+
+@pytest.fixture
+def bestiary_app(app, tmp_path):
+    RecordingBackend.documents = []
+    app.config['PDF_EXPORT_DIR'] = str(tmp_path)
+    app.config['SCAN_JOB_WORKERS'] = 0
+    with patch.dict('app.utils.pdf_renderer.PDF_BACKENDS', {'wkhtmltopdf': RecordingBackend}):
+        yield app
+
+@pytest.fixture
+def campaign(bestiary_app):
+    """A campaign with two monsters in an encounter and one unassigned monster."""
+    with bestiary_app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        encounter = Encounter(name='Goblin Ambush', campaign_id=campaign.id)
+        db.session.add(encounter)
+        db.session.commit()
+        db.session.add_all([
+            Monster(name='Goblin', campaign_id=campaign.id, encounter_id=encounter.id),
+            Monster(name='Bugbear', campaign_id=campaign.id, encounter_id=encounter.id),
+            Monster(name='Owlbear', campaign_id=campaign.id),
+        ])
+        db.session.commit()
+        return {'id': campaign.id, 'encounter_id': encounter.id}
+
+def test_campaign_bestiary_is_one_render(client, auth, campaign):
+    auth.login()
+    response = client.get(f"/campaigns/{campaign['id']}/monsters/bestiary-pdf")
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert 'Test_Campaign_Bestiary.pdf' in response.headers['Content-Disposition']
+    assert len(RecordingBackend.documents) == 1
+    document = RecordingBackend.documents[0]
+    assert document.count('class="bestiary-page"') == 3
+    # Monsters are paged in name order
+    assert document.index('Bugbear') < document.index('Goblin') < document.index('Owlbear')
+
+def test_encounter_bestiary_only_has_its_monsters(client, auth, campaign):
+    auth.login()
+    response = client.get(f"/campaigns/{campaign['id']}/encounters/{campaign['encounter_id']}/monsters/bestiary-pdf")
+
+    assert response.status_code == 200
+    document = RecordingBackend.documents[0]
+    assert document.count('class="bestiary-page"') == 2
+    assert 'Owlbear' not in document
+
+def test_large_bestiary_runs_as_background_job(client, auth, bestiary_app, campaign):
+    bestiary_app.config['PDF_BESTIARY_SYNC_LIMIT'] = 2
+    auth.login()
+
+    response = client.get(f"/campaigns/{campaign['id']}/monsters/bestiary-pdf")
+    assert response.status_code == 202
+    job = json.loads(response.data)
+    assert response.headers['Location'] == job['status_url']
+
+    status = json.loads(client.get(job['status_url']).data)
+    assert status['status'] == 'done'
+    assert status['result']['monster_count'] == 3
+
+    download = client.get(status['result']['download_url'])
+    assert download.status_code == 200
+    assert download.mimetype == 'application/pdf'
+    assert download.data.startswith(b'%PDF-')
+    assert len(RecordingBackend.documents) == 1
+
+def test_bestiary_of_another_users_campaign_is_not_found(client, auth, bestiary_app):
+    with bestiary_app.app_context():
+        campaign = Campaign(title='Other Campaign', description='Not yours', user_id=2)
+        db.session.add(campaign)
+        db.session.commit()
+        campaign_id = campaign.id
+
+    auth.login()
+    assert client.get(f'/campaigns/{campaign_id}/monsters/bestiary-pdf').status_code == 404
+    assert client.post(f'/campaigns/{campaign_id}/monsters/bestiary-pdf/jobs').status_code == 404
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import insert
+from app import db
+from app.models.campaign import Campaign
+from app.models.monster import Monster
+from app.utils.challenge import challenge_rating_value, challenge_xp, proficiency_bonus
+
+# Shuffled, with a tie and two monsters without a usable rating
+MONSTERS = [('Owlbear', '3'), ('Goblin', '1/4'), ('Lich', '21'), ('Wolf', '1/4'), ('Commoner', '0'),
+            ('Statue', ''), ('Ogre', '2'), ('Dragon', '17 (18,000 XP)'), ('Oddity', 'varies')]
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        db.session.add_all([Monster(name=name, challenge_rating=cr, campaign_id=campaign.id) for name, cr in MONSTERS])
+        db.session.commit()
+        return campaign.id
+
+def names(pages):
+    return [monster['name'] for page in pages for monster in page['monsters']]
+
+@pytest.mark.parametrize('challenge_rating, value', [
+    ('1/8', 0.125), ('1/2', 0.5), ('½', 0.5), ('0', 0.0), ('10', 10.0), ('5 (1,800 XP)', 5.0), (' 0.25 ', 0.25),
+    ('', None), (None, None), ('varies', None), ('1/0', None),
+])
+def test_challenge_rating_value(challenge_rating, value):
+    assert challenge_rating_value(challenge_rating) == value
+
+def test_derived_xp_and_proficiency_bonus():
+    assert [challenge_xp(cr) for cr in (0.25, 5, 30, None)] == [50, 1800, 155000, None]
+    assert [proficiency_bonus(cr) for cr in (0.5, 4, 5, 9, 17, 30)] == [2, 2, 3, 4, 6, 9]
+
+def test_cr_value_is_kept_in_sync(app, campaign_id):
+    with app.app_context():
+        ogre = Monster.query.filter_by(name='Ogre').one()
+        assert (ogre.cr_value, ogre.challenge_xp, ogre.proficiency_bonus) == (2.0, 450, 2)
+        ogre.challenge_rating = '1/2'
+        db.session.commit()
+        assert Monster.query.filter_by(name='Ogre').one().cr_value == 0.5
+
+        # Bulk imports insert rows without going through the model
+        db.session.execute(insert(Monster), [{'name': 'Kobold', 'challenge_rating': '1/8', 'campaign_id': campaign_id},
+                                             {'name': 'Blob', 'campaign_id': campaign_id}])
+        db.session.commit()
+        assert Monster.query.filter_by(name='Kobold').one().cr_value == 0.125
+        assert Monster.query.filter_by(name='Blob').one().cr_value is None
+
+def test_api_sorts_by_cr(auth, campaign_id, walk_pages):
+    auth.login()
+    pages = walk_pages(f'/api/campaigns/{campaign_id}/monsters', sort='cr', per_page=2)
+    assert names(pages) == ['Commoner', 'Goblin', 'Wolf', 'Ogre', 'Owlbear', 'Dragon', 'Lich', 'Oddity', 'Statue']
+
+def test_api_filters_by_cr(client, auth, campaign_id, walk_pages):
+    auth.login()
+    url = f'/api/campaigns/{campaign_id}/monsters'
+    assert names(walk_pages(url, cr_min='1/4', cr_max='3', sort='cr', per_page=2)) == ['Goblin', 'Wolf', 'Ogre', 'Owlbear']
+    assert names(walk_pages(url, cr_min=17)) == ['Dragon', 'Lich']
+    page = client.get(url, query_string={'cr_max': 0}).get_json()
+    assert [monster['cr_value'] for monster in page['monsters']] == [0.0]
+
+@pytest.mark.parametrize('args', [{'cr_min': 'tough'}, {'sort': 'hp'}])
+def test_bad_list_arguments(client, auth, campaign_id, args):
+    auth.login()
+    assert client.get(f'/api/campaigns/{campaign_id}/monsters', query_string=args).status_code == 400
+
+def test_list_page_keeps_the_sort_and_filter(client, auth, app, campaign_id):
+    app.config['LIST_PAGE_SIZE'] = 2
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/monsters', query_string={'sort': 'cr', 'cr_min': 1})
+    assert b'Ogre' in response.data and b'Goblin' not in response.data
+    assert b'sort=cr' in response.data and b'cr_min=1' in response.data and b'after=' in response.data
@@ -0,0 +1,108 @@
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.encounter_monster import EncounterMonster
+from app.models.monster import Monster
+from app.utils.encounter_monsters import add_participants, participant_labels
+
+@pytest.fixture
+def encounter(app):
+    """An encounter and a Goblin statblock in the test user's campaign."""
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        encounter = Encounter(name='Ambush', campaign_id=campaign.id)
+        goblin = Monster(name='Goblin', hit_points=7, armor_class=15, challenge_rating='1/4', campaign_id=campaign.id)
+        db.session.add_all([encounter, goblin])
+        db.session.commit()
+        return {'campaign_id': campaign.id, 'id': encounter.id, 'monster_id': goblin.id}
+
+def participants(encounter_id):
+    return EncounterMonster.query.filter_by(encounter_id=encounter_id).order_by(EncounterMonster.id).all()
+
+def test_participant_labels():
+    assert participant_labels('Goblin', 1) == ['Goblin']
+    assert participant_labels('Goblin', 3) == ['Goblin 1', 'Goblin 2', 'Goblin 3']
+    assert participant_labels('Goblin', 2, existing=3) == ['Goblin 4', 'Goblin 5']
+
+def test_copies_are_added_in_one_insert(app, encounter, max_queries):
+    with app.app_context():
+        goblin = db.session.get(Monster, encounter['monster_id'])
+        with max_queries(2) as counter:
+            assert add_participants(encounter['id'], goblin, 8) == 8
+        db.session.commit()
+        assert len([sql for sql in counter.statements if sql.startswith('INSERT')]) == 1
+        assert [p.label for p in participants(encounter['id'])] == [f'Goblin {i}' for i in range(1, 9)]
+        assert Monster.query.count() == 1
+
+def test_add_monsters_route(client, auth, app, encounter):
+    auth.login()
+    url = f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}/participants"
+    response = client.post(url, data={'monster_id': encounter['monster_id'], 'count': 3})
+    assert response.status_code == 302
+    client.post(url, data={'monster_id': encounter['monster_id'], 'count': 1})
+
+    response = client.get(f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}")
+    assert b'Goblin 4' in response.data
+    assert b'Average CR' in response.data and b'>0.25</dd>' in response.data
+    with app.app_context():
+        assert len(participants(encounter['id'])) == 4
+
+def test_too_many_copies_are_refused(client, auth, app, encounter):
+    auth.login()
+    client.post(f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}/participants",
+                data={'monster_id': encounter['monster_id'], 'count': 500})
+    with app.app_context():
+        assert participants(encounter['id']) == []
+
+def test_participants_track_their_own_state(client, auth, app, encounter):
+    with app.app_context():
+        add_participants(encounter['id'], db.session.get(Monster, encounter['monster_id']), 2)
+        db.session.commit()
+        first, second = [p.id for p in participants(encounter['id'])]
+
+    auth.login()
+    client.post(f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}/participants/{first}",
+                data={'label': 'Goblin Archer', 'current_hit_points': 3, 'conditions': 'prone'})
+    with app.app_context():
+        hurt, fresh = participants(encounter['id'])
+        assert (hurt.label, hurt.hit_points, hurt.conditions) == ('Goblin Archer', 3, 'prone')
+        assert fresh.current_hit_points is None and fresh.hit_points == 7
+        assert db.session.get(Monster, encounter['monster_id']).hit_points == 7
+
+    client.post(f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}/participants/{second}/delete")
+    with app.app_context():
+        assert [p.id for p in participants(encounter['id'])] == [first]
+        assert Monster.query.count() == 1
+
+def test_creating_a_statblock_in_an_encounter_adds_copies(client, auth, app, encounter):
+    auth.login()
+    response = client.post(f"/campaigns/{encounter['campaign_id']}/encounters/{encounter['id']}/monsters/create",
+                           data={'name': 'Hobgoblin', 'size': 'Medium', 'type': 'humanoid', 'alignment': '',
+                                 'armor_type': '', 'hit_dice': '', 'speed': '', 'copies': 4})
+    assert response.status_code == 302
+    with app.app_context():
+        hobgoblin = Monster.query.filter_by(name='Hobgoblin').one()
+        assert hobgoblin.encounter_id == encounter['id']
+        assert [p.monster_id for p in participants(encounter['id'])] == [hobgoblin.id] * 4
+
+def test_deleting_the_statblock_or_encounter_removes_participants(app, encounter):
+    with app.app_context():
+        goblin = db.session.get(Monster, encounter['monster_id'])
+        add_participants(encounter['id'], goblin, 3)
+        db.session.commit()
+        db.session.delete(goblin)
+        db.session.commit()
+        assert EncounterMonster.query.count() == 0
+
+        ogre = Monster(name='Ogre', hit_points=59, campaign_id=encounter['campaign_id'])
+        db.session.add(ogre)
+        db.session.flush()
+        add_participants(encounter['id'], ogre, 2)
+        db.session.commit()
+        db.session.delete(db.session.get(Encounter, encounter['id']))
+        db.session.commit()
+        assert EncounterMonster.query.count() == 0
+        assert db.session.get(Monster, ogre.id) is not None
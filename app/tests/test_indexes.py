@@ -0,0 +1,43 @@
+import pytest
+from sqlalchemy import text, tuple_
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.event import Event
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.models.player import Player
+from app.utils.pagination import MONSTER_LIST_SORTS
+
+def query_plan(query):
+    sql = str(query.statement.compile(dialect=db.engine.dialect, compile_kwargs={'literal_binds': True}))
+    return ' '.join(row[-1] for row in db.session.execute(text(f'EXPLAIN QUERY PLAN {sql}')))
+
+@pytest.mark.parametrize('make_query, index', [
+    (lambda: Campaign.query.filter_by(user_id=1), 'ix_campaign_user_id'),
+    (lambda: Encounter.query.filter_by(campaign_id=1), 'ix_encounter_campaign_id'),
+    (lambda: NPC.query.filter_by(campaign_id=1).order_by(NPC.name), 'ix_npc_campaign_id'),
+    (lambda: Player.query.filter_by(campaign_id=1), 'ix_player_campaign_id'),
+    (lambda: Monster.query.filter_by(encounter_id=1), 'ix_monster_encounter_id'),
+    (lambda: Monster.query.filter_by(campaign_id=1, encounter_id=None), 'ix_monster_campaign_id_encounter_id'),
+    (lambda: Monster.query.filter(Monster.campaign_id == 1, Monster.cr_value.between(1, 5)),
+     'ix_monster_campaign_id_cr_value'),
+    (lambda: Event.query.filter_by(campaign_id=1).order_by(Event.event_date.desc()),
+     'ix_event_campaign_id_event_date'),
+])
+def test_list_queries_use_indexes(app, make_query, index):
+    with app.app_context():
+        plan = query_plan(make_query())
+        assert f'USING INDEX {index}' in plan or f'USING COVERING INDEX {index}' in plan
+
+@pytest.mark.parametrize('cursor_filter', [
+    lambda key: [],
+    lambda key: [key[0] >= 5, tuple_(*key) > tuple_(5, 'Ogre', 3)],
+])
+def test_cr_sort_reads_the_index_in_order(app, cursor_filter):
+    key = MONSTER_LIST_SORTS['cr']
+    with app.app_context():
+        query = Monster.query.filter_by(campaign_id=1, encounter_id=None).filter(*cursor_filter(key)).order_by(*key)
+        plan = query_plan(query)
+        assert 'ix_monster_campaign_id_encounter_id_cr_sort' in plan
+        assert 'TEMP B-TREE' not in plan
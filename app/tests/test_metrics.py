@@ -0,0 +1,92 @@
+import os
+import sys
+import subprocess
+import pytest
+
+prometheus_client = pytest.importorskip('prometheus_client')
+
+from prometheus_client import CollectorRegistry, REGISTRY
+from prometheus_client.multiprocess import MultiProcessCollector
+from app.utils.metrics import change_queue_depth, ocr_stage
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+def sample(name, registry=REGISTRY, **labels):
+    return registry.get_sample_value(name, labels) or 0.0
+
+def test_metrics_endpoint(client):
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain')
+    assert b'ddm_request_duration_seconds' in response.data
+
+def test_request_latency_per_endpoint(client):
+    labels = {'blueprint': 'auth', 'endpoint': 'auth.login', 'method': 'GET'}
+    before = sample('ddm_request_duration_seconds_count', **labels)
+    client.get('/auth/login')
+    client.get('/auth/login')
+    assert sample('ddm_request_duration_seconds_count', **labels) == before + 2
+
+def test_db_query_time(client):
+    before = sample('ddm_db_query_duration_seconds_count')
+    client.post('/auth/login', data={'username': 'test', 'password': 'test'})
+    assert sample('ddm_db_query_duration_seconds_count') > before
+
+def test_ocr_stage_timer():
+    before = sample('ddm_ocr_stage_duration_seconds_count', stage='parse')
+    with ocr_stage('parse'):
+        pass
+    assert sample('ddm_ocr_stage_duration_seconds_count', stage='parse') == before + 1
+
+def test_simple_ocr_records_one_preprocess_sample_per_scan():
+    import io
+    from unittest.mock import patch
+    from PIL import Image
+    from app.utils import simple_ocr
+
+    image = io.BytesIO()
+    Image.new('RGB', (200, 100), 'white').save(image, format='PNG')
+    stages = ('preprocess', 'preprocess_fallback')
+    before = [sample('ddm_ocr_stage_duration_seconds_count', stage=stage) for stage in stages]
+    # A low scoring first pass (long enough not to save a debug image), so the fallback variants run too
+    text = 'illegible ' * 10
+    with patch.object(simple_ocr, 'run_ocr_pass', return_value=text), \
+         patch.object(simple_ocr, 'run_ocr_passes', side_effect=lambda images, max_workers: [text] * len(images)):
+        simple_ocr.extract_text_from_image(image.getvalue(), score_threshold=1)
+    after = [sample('ddm_ocr_stage_duration_seconds_count', stage=stage) for stage in stages]
+    assert [a - b for a, b in zip(after, before)] == [1, 1]
+
+def test_queue_depth():
+    before = sample('ddm_worker_pool_queue_depth', pool='scan_jobs')
+    change_queue_depth('scan_jobs', 2)
+    assert sample('ddm_worker_pool_queue_depth', pool='scan_jobs') == before + 2
+    change_queue_depth('scan_jobs', -2)
+    assert sample('ddm_worker_pool_queue_depth', pool='scan_jobs') == before
+
+def test_metrics_token(client, app):
+    app.config['METRICS_TOKEN'] = 'secret'
+    assert client.get('/metrics').status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer wrong'}).status_code == 403
+    assert client.get('/metrics', headers={'Authorization': 'Bearer secret'}).status_code == 200
+
+WORKER_SCRIPT = """
+from app.utils.metrics import change_queue_depth, observe_pdf_render, observe_request
+observe_request('monsters', 'monsters.list', 'GET', 0.2)
+observe_pdf_render('native', 0.5)
+change_queue_depth('pdf_render', 1)
+"""
+
+def test_samples_add_up_across_worker_processes(tmp_path):
+    """Each gunicorn worker writes its own files; a scrape sums them all."""
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=str(tmp_path))
+    for _ in range(3):
+        subprocess.run([sys.executable, '-c', WORKER_SCRIPT], cwd=PROJECT_ROOT, env=env, check=True)
+
+    registry = CollectorRegistry()
+    MultiProcessCollector(registry, path=str(tmp_path))
+    labels = {'blueprint': 'monsters', 'endpoint': 'monsters.list', 'method': 'GET'}
+    assert sample('ddm_request_duration_seconds_count', registry, **labels) == 3
+    assert sample('ddm_pdf_render_duration_seconds_sum', registry, backend='native') == pytest.approx(1.5)
+    # The queue depth gauge only counts live processes, and these have exited
+    # without gunicorn's child_exit hook, so their files are still summed
+    assert sample('ddm_worker_pool_queue_depth', registry, pool='pdf_render') == 3
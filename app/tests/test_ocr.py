@@ -81,9 +81,10 @@ def test_parse_monster_data(sample_statblock_text):
     assert 'Burst of Ingenuity' in result['reactions']
 
 @patch('app.utils.ocr.pytesseract.image_to_string')
+@patch('app.utils.ocr.normalize_image_array', side_effect=lambda image: image)
 @patch('app.utils.ocr.cv2')
 @patch('app.utils.ocr.Image')
-def test_extract_text_from_image(mock_image, mock_cv2, mock_image_to_string):
+def test_extract_text_from_image(mock_image, mock_cv2, mock_normalize, mock_image_to_string):
     """Test the image-to-text extraction functionality."""
     # Mock the image preprocessing
     mock_cv2.imdecode.return_value = MagicMock()
@@ -106,6 +107,7 @@ def test_extract_text_from_image(mock_image, mock_cv2, mock_image_to_string):
     
     # Verify the function calls
     mock_cv2.imdecode.assert_called_once()
+    mock_normalize.assert_called_once()
     mock_cv2.cvtColor.assert_called_once()
     mock_cv2.threshold.assert_called_once()
     mock_cv2.fastNlMeansDenoising.assert_called_once()
@@ -0,0 +1,79 @@
+import io
+import json
+from unittest.mock import patch
+from PIL import Image
+from app import db
+from app.models.campaign import Campaign
+from app.utils.ocr_cache import OCRResultCache
+
+def make_image_bytes(color='white'):
+    image = Image.new('RGB', (50, 50), color=color)
+    img_io = io.BytesIO()
+    image.save(img_io, 'PNG')
+    return img_io.getvalue()
+
+def test_cache_key_depends_on_image_and_pipeline_version():
+    image_bytes = make_image_bytes()
+    key = OCRResultCache.make_key(image_bytes, 'simple-1')
+    
+    assert key == OCRResultCache.make_key(image_bytes, 'simple-1')
+    assert key != OCRResultCache.make_key(image_bytes, 'simple-2')
+    assert key != OCRResultCache.make_key(make_image_bytes('black'), 'simple-1')
+
+def test_cache_evicts_least_recently_used():
+    cache = OCRResultCache(max_entries=2)
+    cache.set('a', 'text a', {'name': 'A'})
+    cache.set('b', 'text b', {'name': 'B'})
+    
+    # Reading 'a' makes 'b' the least recently used entry
+    assert cache.get('a')['monster_data'] == {'name': 'A'}
+    cache.set('c', 'text c', {'name': 'C'})
+    
+    assert cache.get('b') is None
+    assert cache.get('a')['raw_text'] == 'text a'
+    assert cache.get('c')['raw_text'] == 'text c'
+    assert len(cache) == 2
+
+def test_cache_disk_tier(tmp_path):
+    cache = OCRResultCache(max_entries=1, disk_dir=str(tmp_path), max_disk_entries=2)
+    cache.set('a', 'text a', {'name': 'A'})
+    cache.set('b', 'text b', {'name': 'B'})
+    cache.set('c', 'text c', {'name': 'C'})
+    
+    # Only the newest two entries are kept on disk
+    assert sorted(p.name for p in tmp_path.iterdir()) == ['b.json', 'c.json']
+    
+    # A fresh cache (e.g. another worker) reads entries back from disk
+    other = OCRResultCache(max_entries=10, disk_dir=str(tmp_path))
+    assert other.get('b') == {'raw_text': 'text b', 'monster_data': {'name': 'B'}}
+    assert other.get('a') is None
+
+@patch('app.routes.monsters.parse_monster_data')
+@patch('app.routes.monsters.extract_text_from_image')
+def test_scan_image_uses_cache_for_repeated_upload(mock_extract, mock_parse, client, auth, app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        campaign_id = campaign.id
+    
+    auth.login()
+    mock_extract.return_value = "Goblin\nSmall Humanoid, Neutral Evil\nAC 15\nHP 7"
+    mock_parse.return_value = {'name': 'Goblin', 'armor_class': 15, 'hit_points': 7}
+    image_bytes = make_image_bytes()
+    
+    responses = []
+    for _ in range(2):
+        response = client.post(
+            f'/campaigns/{campaign_id}/monsters/scan-image',
+            data={'statblock_image': (io.BytesIO(image_bytes), 'goblin.png')},
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 200
+        responses.append(json.loads(response.data))
+    
+    assert responses[0]['monster_data'] == responses[1]['monster_data']
+    assert responses[1]['raw_text'] == mock_extract.return_value
+    assert responses[1]['cached'] is True
+    mock_extract.assert_called_once()
+    mock_parse.assert_called_once()
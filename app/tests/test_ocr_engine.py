@@ -0,0 +1,63 @@
+import sys
+import pytest
+from unittest.mock import patch, MagicMock
+from PIL import Image
+from app.utils import ocr_engine
+from app.utils.ocr_engine import (
+    parse_tesseract_config, create_ocr_engine, get_ocr_engine, PytesseractEngine, TesserocrEngine
+)
+
+@pytest.fixture
+def fake_tesserocr():
+    """Install a stand-in tesserocr module that records the API handles it creates."""
+    module = MagicMock()
+    module.PyTessBaseAPI.side_effect = lambda lang: MagicMock(**{'GetUTF8Text.return_value': 'Goblin'})
+    with patch.dict(sys.modules, {'tesserocr': module}):
+        yield module
+
+def test_parse_tesseract_config():
+    """Test splitting a tesseract config string into psm and variables."""
+    assert parse_tesseract_config('--psm 6 -c preserve_interword_spaces=1') == (6, {'preserve_interword_spaces': '1'})
+    assert parse_tesseract_config('') == (None, {})
+    assert parse_tesseract_config(None) == (None, {})
+
+def test_pytesseract_engine_selected_by_name():
+    """Test that the pytesseract engine can be selected explicitly."""
+    engine = create_ocr_engine('pytesseract')
+    assert isinstance(engine, PytesseractEngine)
+
+def test_auto_falls_back_to_pytesseract():
+    """Test that 'auto' falls back to pytesseract when tesserocr can't be imported."""
+    with patch.dict(sys.modules, {'tesserocr': None}):
+        engine = create_ocr_engine('auto')
+    assert isinstance(engine, PytesseractEngine)
+
+def test_auto_prefers_tesserocr(fake_tesserocr):
+    """Test that 'auto' uses the resident engine when tesserocr is installed."""
+    engine = create_ocr_engine('auto')
+    assert isinstance(engine, TesserocrEngine)
+
+def test_tesserocr_engine_reuses_api_handle(fake_tesserocr):
+    """Test that the language model is loaded once and reused across calls."""
+    engine = TesserocrEngine()
+    image = Image.new('L', (10, 10), color=255)
+    
+    assert engine.image_to_string(image, config='--psm 6 -c preserve_interword_spaces=1') == 'Goblin'
+    assert engine.image_to_string(image, config='--psm 6 -c preserve_interword_spaces=1') == 'Goblin'
+    
+    # One handle for the eager default config, one for the --psm 6 config
+    assert fake_tesserocr.PyTessBaseAPI.call_count == 2
+    api = engine._get_api('--psm 6 -c preserve_interword_spaces=1')
+    api.SetPageSegMode.assert_called_once_with(6)
+    api.SetVariable.assert_called_once_with('preserve_interword_spaces', '1')
+    assert api.SetImage.call_count == 2
+
+def test_get_ocr_engine_is_cached_per_process():
+    """Test that the worker engine is created once per process."""
+    with patch.object(ocr_engine, '_engine', None), \
+         patch.object(ocr_engine, 'create_ocr_engine', return_value=PytesseractEngine()) as mock_create:
+        first = get_ocr_engine()
+        second = get_ocr_engine()
+    
+    assert first is second
+    mock_create.assert_called_once()
@@ -0,0 +1,72 @@
+import io
+from PIL import Image, ImageDraw
+from app.utils import ocr_normalize
+from app.utils.ocr_normalize import find_parchment_box, estimate_text_height, normalize_image, load_normalized_image
+
+PARCHMENT = (253, 241, 220)
+TABLE = (70, 50, 35)
+
+def make_statblock(background='white', lines=20, line_height=18):
+    image = Image.new('RGB', (600, line_height * (lines + 2)), color=background)
+    draw = ImageDraw.Draw(image)
+    for i in range(lines):
+        draw.text((10, 10 + i * line_height), f"Armor Class {i} (natural armor), Hit Points {i * 7}", fill='black')
+    return image
+
+def make_photo(scale=4):
+    """A parchment statblock lying on a dark table, photographed at high resolution."""
+    photo = Image.new('RGB', (900, 1000), color=TABLE)
+    photo.paste(make_statblock(PARCHMENT), (150, 200))
+    return photo.resize((photo.width * scale, photo.height * scale), Image.NEAREST)
+
+def test_find_parchment_box_on_a_photo():
+    photo = make_photo(scale=1)
+    left, top, right, bottom = find_parchment_box(photo)
+
+    assert abs(left - 150) <= 5 and abs(right - 750) <= 5
+    assert abs(top - 200) <= 5 and abs(bottom - 596) <= 5
+
+def test_no_parchment_box_on_a_screenshot():
+    assert find_parchment_box(make_statblock()) is None
+    # A box covering the whole image is not worth cropping to
+    assert find_parchment_box(make_statblock(PARCHMENT)) is None
+
+def test_estimate_text_height_scales_with_the_image():
+    image = make_statblock()
+    height = estimate_text_height(image.convert('L'))
+    doubled = image.resize((image.width * 2, image.height * 2), Image.NEAREST)
+
+    assert height is not None
+    assert abs(estimate_text_height(doubled.convert('L')) - height * 2) <= 2
+
+def test_estimate_text_height_needs_text():
+    assert estimate_text_height(Image.new('L', (400, 400), color=255)) is None
+
+def test_normalize_crops_and_downscales_large_photos():
+    photo = make_photo(scale=4)
+    normalized = normalize_image(photo)
+
+    # Cropped to the box (2400 x 1584 at this scale) and never above the size cap
+    assert normalized.width < photo.width * 0.75
+    assert max(normalized.size) <= ocr_normalize.OCR_MAX_DIMENSION
+    assert abs(normalized.width / normalized.height - 600 / 396) < 0.05
+
+def test_normalize_resamples_text_to_the_target_height():
+    image = make_statblock()
+    image = image.resize((image.width * 2, image.height * 2), Image.NEAREST)
+    normalized = normalize_image(image)
+    text_height = estimate_text_height(normalized.convert('L'))
+
+    assert abs(text_height - ocr_normalize.target_text_height()) / ocr_normalize.target_text_height() < 0.25
+
+def test_load_normalized_image_applies_exif_rotation():
+    image = make_statblock()
+    exif = Image.Exif()
+    exif[0x0112] = 6  # rotated 90 degrees clockwise
+    img_io = io.BytesIO()
+    image.rotate(90, expand=True).save(img_io, 'JPEG', exif=exif)
+
+    normalized = load_normalized_image(img_io.getvalue())
+
+    assert normalized.mode == 'RGB'
+    assert normalized.width > normalized.height
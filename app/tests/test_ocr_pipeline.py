@@ -0,0 +1,26 @@
+import os
+import sys
+import subprocess
+from app.utils import simple_ocr
+from app.utils.ocr_pipeline import load_ocr_pipeline
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+BOOT_SCRIPT = '''
+import sys, tempfile
+from app import create_app
+folder = tempfile.mkdtemp()
+create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + folder + '/boot.sqlite'})
+print(' '.join(name for name in ('cv2', 'numpy', 'PIL', 'pytesseract', 'pdfkit', 'fpdf') if name in sys.modules))
+'''
+
+def test_booting_the_app_skips_ocr_and_pdf_libraries():
+    result = subprocess.run([sys.executable, '-c', BOOT_SCRIPT], cwd=PROJECT_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ''
+
+def test_load_named_pipeline():
+    assert load_ocr_pipeline('simple') is simple_ocr
+
+def test_unknown_pipeline_falls_back_to_simple():
+    assert load_ocr_pipeline('nonsense') is simple_ocr
@@ -197,6 +197,82 @@ class TestOCRUtils(unittest.TestCase):
         self.assertIsNone(result)
         mock_logger.assert_called_once()
 
+    @patch('app.utils.simple_ocr.pytesseract.image_to_string')
+    def test_extract_text_parallel_matches_serial(self, mock_image_to_string):
+        """Test that parallel OCR passes pick the same text as serial passes."""
+        from app.utils import simple_ocr
+        
+        # Each preprocessing variant yields a different amount of text
+        mock_image_to_string.side_effect = lambda image, **kwargs: "x" * image.getpixel((0, 0))
+        
+        image = Image.new('RGB', (100, 100), color=(128, 128, 128))
+        img_byte_arr = io.BytesIO()
+        image.save(img_byte_arr, format='PNG')
+        image_bytes = img_byte_arr.getvalue()
+        
+        serial = simple_ocr.extract_text_from_image(image_bytes, max_workers=1)
+        self.assertEqual(mock_image_to_string.call_count, 3)
+        
+        parallel = simple_ocr.extract_text_from_image(image_bytes, max_workers=3)
+        self.assertEqual(mock_image_to_string.call_count, 6)
+        self.assertEqual(serial, parallel)
+
+    def test_score_statblock_text(self):
+        """Test the statblock quality score used to pick OCR passes."""
+        from app.utils.simple_ocr import score_statblock_text
+        
+        full = """Goblin
+        Small Humanoid, Neutral Evil
+        Armor Class 15 (leather armor, shield)
+        Hit Points 7 (2d6)
+        STR 8 (-1) DEX 14 (+2) CON 10 (+0) INT 10 (+0) WIS 8 (-1) CHA 8 (-1)
+        Challenge 1/4 (50 XP)
+        """
+        self.assertEqual(score_statblock_text(full), 1.0)
+        self.assertEqual(score_statblock_text("Armor Class 15\nHit Points 7"), 2 / 6)
+        self.assertEqual(score_statblock_text(""), 0.0)
+        self.assertEqual(score_statblock_text(None), 0.0)
+
+    def test_preprocessing_variants_match_pil_enhance(self):
+        """Test that the lookup table variants produce the same pixels as the PIL filter chain."""
+        from PIL import ImageChops, ImageEnhance, ImageFilter
+        from app.utils import simple_ocr
+
+        image = Image.new('RGB', (200, 80), color=(253, 241, 220))
+        draw = ImageDraw.Draw(image)
+        draw.text((10, 10), "Armor Class 15 (natural armor)", fill=(80, 20, 10))
+        draw.text((10, 40), "Hit Points 7 (2d6)", fill='black')
+        gray_image = image.convert('L')
+
+        expected = [
+            ImageEnhance.Contrast(gray_image).enhance(2.0).filter(ImageFilter.SHARPEN),
+            gray_image.point(lambda p: 255 if p > 150 else 0),
+            gray_image.filter(ImageFilter.EDGE_ENHANCE).point(lambda p: 255 if p > 120 else 0),
+        ]
+        for variant, expected_image in zip(simple_ocr.PREPROCESSING_VARIANTS, expected):
+            self.assertIsNone(ImageChops.difference(variant(gray_image), expected_image).getbbox())
+
+    @patch('app.utils.simple_ocr.pytesseract.image_to_string')
+    def test_extract_text_early_exit(self, mock_image_to_string):
+        """Test that a confident first OCR pass skips the remaining variants."""
+        from app.utils import simple_ocr
+        
+        statblock = "AC 13\nHP 24\n6(-2) 17(+3) 13(+1) 15(+2) 11(+0) 11(+0)\nCR 1"
+        mock_image_to_string.return_value = statblock
+        
+        image = Image.new('RGB', (100, 100), color='white')
+        img_byte_arr = io.BytesIO()
+        image.save(img_byte_arr, format='PNG')
+        image_bytes = img_byte_arr.getvalue()
+        
+        result = simple_ocr.extract_text_from_image(image_bytes)
+        self.assertEqual(result, statblock)
+        self.assertEqual(mock_image_to_string.call_count, 1)
+        
+        # A threshold above the maximum score forces every variant to run
+        simple_ocr.extract_text_from_image(image_bytes, score_threshold=1.1)
+        self.assertEqual(mock_image_to_string.call_count, 4)
+
     def test_regex_patterns(self):
         """Test the regex patterns used in parsing monster data."""
         test_pairs = [
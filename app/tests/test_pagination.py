@@ -0,0 +1,115 @@
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.utils.pagination import encode_cursor
+
+# Shuffled, with a duplicate name to check ties are broken by id
+MONSTER_NAMES = ['Owlbear', 'Goblin', 'Zombie', 'Bandit', 'Goblin', 'Kobold', 'Mimic', 'Aboleth']
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        encounter = Encounter(name='Ambush', campaign_id=campaign.id)
+        db.session.add(encounter)
+        db.session.commit()
+        db.session.add_all([
+            Monster(name=name, campaign_id=campaign.id, actions='Multiattack. ' * 100)
+            for name in MONSTER_NAMES
+        ])
+        # Encounter monsters aren't listed in the campaign compendium
+        db.session.add(Monster(name='Ambusher', campaign_id=campaign.id, encounter_id=encounter.id))
+        db.session.add_all([NPC(name=f'NPC {i}', role='Innkeeper', campaign_id=campaign.id) for i in range(5)])
+        db.session.commit()
+        return campaign.id
+
+def test_api_monster_pages(auth, campaign_id, walk_pages):
+    auth.login()
+    pages = walk_pages(f'/api/campaigns/{campaign_id}/monsters', per_page=3)
+
+    assert [len(page['monsters']) for page in pages] == [3, 3, 2]
+    names = [monster['name'] for page in pages for monster in page['monsters']]
+    assert names == sorted(MONSTER_NAMES)
+    assert len({monster['id'] for page in pages for monster in page['monsters']}) == len(MONSTER_NAMES)
+    assert pages[0]['prev_cursor'] is None
+    assert 'actions' not in pages[0]['monsters'][0]
+
+def test_api_previous_page(client, auth, campaign_id, walk_pages):
+    auth.login()
+    url = f'/api/campaigns/{campaign_id}/monsters'
+    first, second, third = walk_pages(url, per_page=3)
+
+    back = client.get(url, query_string={'per_page': 3, 'before': third['prev_cursor']}).get_json()
+    assert back['monsters'] == second['monsters']
+    back = client.get(url, query_string={'per_page': 3, 'before': back['prev_cursor']}).get_json()
+    assert back['monsters'] == first['monsters']
+    assert back['prev_cursor'] is None
+
+def test_cursor_is_stable_when_rows_are_added(client, auth, app, campaign_id):
+    auth.login()
+    url = f'/api/campaigns/{campaign_id}/monsters'
+    first = client.get(url, query_string={'per_page': 3}).get_json()
+    expected = client.get(url, query_string={'per_page': 3, 'after': first['next_cursor']}).get_json()
+
+    # Rows added before the cursor don't shift the following page
+    with app.app_context():
+        db.session.add(Monster(name='Aarakocra', campaign_id=campaign_id))
+        db.session.commit()
+    second = client.get(url, query_string={'per_page': 3, 'after': first['next_cursor']}).get_json()
+    assert second['monsters'] == expected['monsters']
+
+def test_api_npc_pages(auth, campaign_id, walk_pages):
+    auth.login()
+    pages = walk_pages(f'/api/campaigns/{campaign_id}/npcs', per_page=2)
+    assert [npc['name'] for page in pages for npc in page['npcs']] == [f'NPC {i}' for i in range(5)]
+
+@pytest.mark.parametrize('args', [
+    {'after': 'not-a-cursor'},
+    {'after': encode_cursor([{'a': 1}, [2]])},
+    {'before': encode_cursor(['Goblin', [2]])},
+    {'after': encode_cursor([[1], 'Goblin', 2]), 'sort': 'cr'},
+])
+def test_invalid_cursor(client, auth, campaign_id, args):
+    auth.login()
+    response = client.get(f'/api/campaigns/{campaign_id}/monsters', query_string=args)
+    assert response.status_code == 400
+
+def test_page_size_is_capped(client, auth, app, campaign_id):
+    app.config['LIST_MAX_PAGE_SIZE'] = 5
+    auth.login()
+    page = client.get(f'/api/campaigns/{campaign_id}/monsters', query_string={'per_page': 1000}).get_json()
+    assert page['per_page'] == 5
+    assert len(page['monsters']) == 5
+
+def test_api_other_users_campaign(client, auth, app):
+    with app.app_context():
+        campaign = Campaign(title='Not Mine', description='', user_id=2)
+        db.session.add(campaign)
+        db.session.commit()
+        campaign_id = campaign.id
+    auth.login()
+    assert client.get(f'/api/campaigns/{campaign_id}/monsters').status_code == 403
+
+def test_monster_list_page_skips_text_columns(client, auth, app, campaign_id, max_queries):
+    app.config['LIST_PAGE_SIZE'] = 3
+    auth.login()
+    with max_queries(5) as queries:
+        response = client.get(f'/campaigns/{campaign_id}/monsters')
+    assert response.status_code == 200
+    assert b'Aboleth' in response.data and b'Owlbear' not in response.data
+    assert b'Next' in response.data
+
+    monster_selects = [sql for sql in queries.statements if 'FROM monster' in sql and 'count(' not in sql]
+    assert monster_selects and all('monster.actions' not in sql for sql in monster_selects)
+
+def test_npc_list_page(client, auth, app, campaign_id):
+    app.config['LIST_PAGE_SIZE'] = 2
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/npcs/')
+    assert b'NPC 1' in response.data and b'NPC 2' not in response.data
+    assert b'after=' in response.data
@@ -0,0 +1,105 @@
+import os
+from datetime import datetime
+from unittest.mock import patch
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.monster import Monster
+from app.utils.pdf_cache import PDFCache, init_pdf_cache
+
+class CountingBackend:
+    """Fake renderer counting how many PDFs it produced."""
+    renders = 0
+
+    def render(self, html, options=None, timeout=None):
+        CountingBackend.renders += 1
+        return b'%PDF-' + html.encode()
+
+@pytest.fixture
+def cached_app(app, tmp_path):
+    CountingBackend.renders = 0
+    app.config['PDF_CACHE_DIR'] = str(tmp_path)
+    init_pdf_cache(app)
+    with patch.dict('app.utils.pdf_renderer.PDF_BACKENDS', {'wkhtmltopdf': CountingBackend}):
+        yield app
+
+def create_monster(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        monster = Monster(name='Goblin', campaign_id=campaign.id)
+        db.session.add(monster)
+        db.session.commit()
+        return campaign.id, monster.id
+
+def test_cache_key_depends_on_monster_version_and_template():
+    updated_at = datetime(2024, 1, 1, 12, 0)
+    key = PDFCache.make_key(1, updated_at, 'v1')
+
+    assert key == PDFCache.make_key(1, updated_at, 'v1')
+    assert key != PDFCache.make_key(2, updated_at, 'v1')
+    assert key != PDFCache.make_key(1, datetime(2024, 1, 2), 'v1')
+    assert key != PDFCache.make_key(1, updated_at, 'v2')
+
+def test_cache_evicts_least_recently_used_past_max_bytes(tmp_path):
+    cache = PDFCache(disk_dir=str(tmp_path), max_bytes=250)
+    cache.set('a', b'a' * 100)
+    cache.set('b', b'b' * 100)
+    # Make 'a' the most recently used entry
+    os.utime(tmp_path / 'b.pdf', (1, 1))
+    assert cache.get('a') == b'a' * 100
+
+    cache.set('c', b'c' * 100)
+
+    assert cache.get('b') is None
+    assert cache.get('a') == b'a' * 100
+    assert cache.get('c') == b'c' * 100
+    assert cache.size() <= 250
+
+def test_cache_disabled_without_directory():
+    cache = PDFCache()
+    cache.set('a', b'%PDF-')
+    assert cache.get('a') is None
+
+def test_export_reuses_cached_pdf_and_answers_304(client, auth, cached_app):
+    campaign_id, monster_id = create_monster(cached_app)
+    url = f'/campaigns/{campaign_id}/monsters/{monster_id}/pdf'
+    auth.login()
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers['ETag']
+    assert etag
+    assert first.headers['Cache-Control'] == 'private, no-cache'
+
+    # Another download of the unchanged monster is served from the cache
+    second = client.get(url)
+    assert second.status_code == 200
+    assert second.data == first.data
+    assert second.headers['ETag'] == etag
+    assert CountingBackend.renders == 1
+
+    # A client holding the current PDF gets a 304 without a body
+    not_modified = client.get(url, headers={'If-None-Match': etag})
+    assert not_modified.status_code == 304
+    assert not_modified.data == b''
+    assert CountingBackend.renders == 1
+
+def test_editing_the_monster_invalidates_the_pdf(client, auth, cached_app):
+    campaign_id, monster_id = create_monster(cached_app)
+    url = f'/campaigns/{campaign_id}/monsters/{monster_id}/export-pdf'
+    auth.login()
+
+    etag = client.get(url).headers['ETag']
+
+    with cached_app.app_context():
+        monster = db.session.get(Monster, monster_id)
+        monster.name = 'Goblin Boss'
+        db.session.commit()
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+    assert b'Goblin Boss' in response.data
+    assert CountingBackend.renders == 2
@@ -0,0 +1,118 @@
+import threading
+from unittest.mock import patch
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.monster import Monster
+from app.utils.pdf_renderer import PDFRenderer, PDFQueueFullError, PDFRenderTimeoutError, PDFRenderError
+
+class FakeBackend:
+    """Records the HTML it renders; ``block`` holds renders until it is set."""
+    name = 'fake'
+    instances = []
+    block = None
+
+    def __init__(self):
+        FakeBackend.instances.append(self)
+        self.rendered = []
+
+    def render(self, html, options=None, timeout=None):
+        if FakeBackend.block is not None:
+            FakeBackend.block.wait(5)
+        if html == 'fail':
+            raise PDFRenderError('broken page')
+        if html == 'slow':
+            raise PDFRenderTimeoutError('too slow')
+        self.rendered.append(html)
+        return b'%PDF-' + html.encode()
+
+@pytest.fixture(autouse=True)
+def fake_backend():
+    FakeBackend.instances = []
+    FakeBackend.block = None
+    with patch.dict('app.utils.pdf_renderer.PDF_BACKENDS', {'fake': FakeBackend}):
+        yield FakeBackend
+
+def test_render_returns_pdf_bytes_and_reuses_backends():
+    renderer = PDFRenderer(backend='fake', max_workers=1)
+
+    assert renderer.render('one') == b'%PDF-one'
+    assert renderer.render('two') == b'%PDF-two'
+
+    # One warm backend per worker thread, reused between renders
+    assert len(FakeBackend.instances) == 1
+    metrics = renderer.metrics.snapshot()
+    assert metrics['rendered'] == 2
+    assert metrics['in_flight'] == 0
+    assert metrics['queued'] == 0
+
+def test_render_rejects_when_queue_is_full():
+    renderer = PDFRenderer(backend='fake', max_workers=1, max_queue=0)
+    FakeBackend.block = threading.Event()
+
+    worker = threading.Thread(target=renderer.render, args=('busy',))
+    worker.start()
+    try:
+        # Wait until the first render holds the only slot
+        for _ in range(100):
+            if renderer.metrics.snapshot()['in_flight']:
+                break
+            threading.Event().wait(0.01)
+        with pytest.raises(PDFQueueFullError):
+            renderer.render('rejected')
+    finally:
+        FakeBackend.block.set()
+        worker.join()
+
+    assert renderer.metrics.snapshot()['rejected'] == 1
+    # The slot is free again once the first render finished
+    assert renderer.render('after') == b'%PDF-after'
+
+def test_render_timeouts_and_failures_are_counted():
+    renderer = PDFRenderer(backend='fake', max_workers=1)
+
+    with pytest.raises(PDFRenderTimeoutError):
+        renderer.render('slow')
+    with pytest.raises(PDFRenderError):
+        renderer.render('fail')
+
+    metrics = renderer.metrics.snapshot()
+    assert metrics['timed_out'] == 1
+    assert metrics['failed'] == 1
+    assert metrics['rendered'] == 0
+
+def test_waiting_for_a_renderer_times_out():
+    renderer = PDFRenderer(backend='fake', max_workers=1, timeout=0, queue_timeout=0.1)
+    FakeBackend.block = threading.Event()
+    try:
+        with pytest.raises(PDFRenderTimeoutError):
+            renderer.render('stuck')
+    finally:
+        FakeBackend.block.set()
+
+def test_unknown_backend():
+    with pytest.raises(PDFRenderError):
+        PDFRenderer(backend='missing').render('page')
+
+def test_export_pdf_uses_renderer_pool(client, auth, app):
+    app.config['PDF_BACKEND'] = 'fake'
+    from app.utils.pdf_renderer import init_pdf_renderer
+    init_pdf_renderer(app)
+
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        monster = Monster(name='Goblin', campaign_id=campaign.id)
+        db.session.add(monster)
+        db.session.commit()
+        campaign_id, monster_id = campaign.id, monster.id
+
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/monsters/{monster_id}/export-pdf')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF-')
+    assert b'Goblin' in response.data
+    assert app.extensions['pdf_renderer'].metrics.snapshot()['rendered'] == 1
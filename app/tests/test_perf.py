@@ -0,0 +1,79 @@
+import json
+import logging
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.player import Player
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        db.session.add_all([Player(name=f'Player {i}', campaign_id=campaign.id) for i in range(3)])
+        db.session.commit()
+        return campaign.id
+
+def server_timing(response):
+    """Parse a Server-Timing header into ``{name: (duration, description)}``."""
+    metrics = {}
+    for metric in response.headers['Server-Timing'].split(', '):
+        name, *params = metric.split(';')
+        values = dict(param.split('=', 1) for param in params)
+        metrics[name] = (float(values['dur']), values.get('desc', '').strip('"'))
+    return metrics
+
+def test_server_timing_header(client, auth, campaign_id):
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}')
+
+    metrics = server_timing(response)
+    assert set(metrics) == {'db', 'render', 'total'}
+    # campaign and one query per listed relationship (plus the user when not cached)
+    queries = int(metrics['db'][1].split()[0])
+    assert 5 <= queries <= 6
+    assert metrics['render'][0] > 0
+    assert metrics['total'][0] >= metrics['db'][0]
+
+def test_server_timing_can_be_disabled(client, app):
+    app.config['PERF_SERVER_TIMING'] = False
+    assert 'Server-Timing' not in client.get('/').headers
+
+def test_perf_page_is_admin_only(client, auth, app):
+    auth.login()
+    assert client.get('/debug/perf').status_code == 403
+
+    app.config['ADMIN_USERNAMES'] = ['test']
+    assert client.get('/debug/perf').status_code == 200
+
+def test_perf_page_requires_login(client):
+    response = client.get('/debug/perf')
+    assert response.status_code == 302
+    assert '/auth/login' in response.headers['Location']
+
+def test_perf_stats_per_endpoint(client, auth, app, campaign_id):
+    app.config['ADMIN_USERNAMES'] = ['test']
+    auth.login()
+    client.post('/debug/perf/reset')
+    client.get(f'/campaigns/{campaign_id}')
+    client.get(f'/campaigns/{campaign_id}')
+
+    stats = json.loads(client.get('/debug/perf?format=json').data)['endpoints']
+    detail = next(endpoint for endpoint in stats if endpoint['endpoint'] == 'campaigns.detail')
+    assert detail['requests'] == 2
+    assert 5 <= detail['max_queries'] <= 6
+    assert detail['slowest_sql'].startswith('SELECT')
+
+    page = client.get('/debug/perf')
+    assert b'campaigns.detail' in page.data
+
+def test_slow_requests_are_logged(client, auth, app, campaign_id, caplog):
+    app.config['PERF_SLOW_REQUEST_MS'] = 0
+    auth.login()
+
+    with caplog.at_level(logging.WARNING, logger='app.utils.perf'):
+        client.get(f'/campaigns/{campaign_id}')
+
+    assert any('Slow request GET' in message and 'campaigns.detail' in message and ' queries in ' in message
+               for message in caplog.messages)
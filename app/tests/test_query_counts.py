@@ -0,0 +1,63 @@
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.encounter_monster import EncounterMonster
+from app.models.event import Event
+from app.models.loot import Loot
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.models.player import Player
+
+def populate(app, size):
+    """A campaign with ``size`` of everything; returns the campaign and an encounter id."""
+    with app.app_context():
+        campaign = Campaign(title=f'Campaign {size}', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        encounters = [Encounter(name=f'Encounter {i}', campaign_id=campaign.id) for i in range(size)]
+        db.session.add_all(encounters)
+        db.session.add_all([Player(name=f'Player {i}', campaign_id=campaign.id) for i in range(size)])
+        db.session.add_all([NPC(name=f'NPC {i}', role='Innkeeper', campaign_id=campaign.id) for i in range(size)])
+        db.session.add_all([Event(title=f'Event {i}', campaign_id=campaign.id) for i in range(size)])
+        db.session.commit()
+        for i in range(size):
+            monster = Monster(name=f'Monster {i}', campaign_id=campaign.id, encounter_id=encounters[0].id)
+            db.session.add(EncounterMonster(label=f'Monster {i}', monster=monster, encounter_id=encounters[0].id))
+            db.session.add(Loot(name=f'Loot {i}', campaign_id=campaign.id, encounter_id=encounters[0].id))
+        db.session.commit()
+        return campaign.id, encounters[0].id
+
+@pytest.mark.parametrize('size', [1, 10])
+def test_campaign_detail_query_count(client, auth, app, max_queries, size):
+    campaign_id, _ = populate(app, size)
+    auth.login()
+
+    # user, campaign and one query per listed relationship, however many rows
+    with max_queries(6):
+        response = client.get(f'/campaigns/{campaign_id}')
+    assert response.status_code == 200
+    assert f'Encounter {size - 1}'.encode() in response.data
+
+@pytest.mark.parametrize('size', [1, 10])
+def test_encounter_view_query_count(client, auth, app, max_queries, size):
+    campaign_id, encounter_id = populate(app, size)
+    auth.login()
+
+    # user, campaign, encounter, its monsters, their statblocks and its loot
+    with max_queries(6):
+        response = client.get(f'/campaigns/{campaign_id}/encounters/{encounter_id}')
+    assert response.status_code == 200
+    assert f'Monster {size - 1}'.encode() in response.data
+    assert f'Loot {size - 1}'.encode() in response.data
+
+@pytest.mark.parametrize('size', [1, 10])
+def test_encounter_list_query_count(client, auth, app, max_queries, size):
+    campaign_id, _ = populate(app, size)
+    auth.login()
+
+    # user, campaign, encounters and the grouped monster count
+    with max_queries(4):
+        response = client.get(f'/campaigns/{campaign_id}/encounters/')
+    assert response.status_code == 200
+    assert f'Monsters: {size}'.encode() in response.data
@@ -0,0 +1,161 @@
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+from unittest.mock import patch
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.scan_job import ScanJob
+from app.utils.scan_jobs import HOSTNAME, count_active_scan_jobs
+
+STATBLOCK_TEXT = "Goblin\nSmall Humanoid, Neutral Evil\nAC 15\nHP 7"
+MONSTER_DATA = {'name': 'Goblin', 'armor_class': 15, 'hit_points': 7}
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        return campaign.id
+
+def submit(client, campaign_id):
+    return client.post(
+        f'/campaigns/{campaign_id}/monsters/scan-image/jobs',
+        data={'statblock_image': (io.BytesIO(b'fake image bytes'), 'goblin.png')},
+        content_type='multipart/form-data'
+    )
+
+@patch('app.routes.monsters.parse_monster_data', return_value=MONSTER_DATA)
+@patch('app.routes.monsters.extract_text_from_image', return_value=STATBLOCK_TEXT)
+def test_scan_job_inline(mock_extract, mock_parse, client, auth, app, campaign_id):
+    app.config['SCAN_JOB_WORKERS'] = 0
+    auth.login()
+    
+    response = submit(client, campaign_id)
+    assert response.status_code == 202
+    job = json.loads(response.data)
+    assert response.headers['Location'] == job['status_url']
+    
+    response = client.get(job['status_url'])
+    assert response.status_code == 200
+    status = json.loads(response.data)
+    assert status['status'] == 'done'
+    assert status['result']['success'] is True
+    assert status['result']['monster_data'] == MONSTER_DATA
+    assert status['result']['raw_text'] == STATBLOCK_TEXT
+
+@patch('app.routes.monsters.parse_monster_data', return_value=MONSTER_DATA)
+@patch('app.routes.monsters.extract_text_from_image', return_value=STATBLOCK_TEXT)
+def test_scan_job_background(mock_extract, mock_parse, client, auth, app, campaign_id):
+    app.config['SCAN_JOB_WORKERS'] = 1
+    auth.login()
+    
+    job = json.loads(submit(client, campaign_id).data)
+    
+    deadline = time.time() + 5
+    status = json.loads(client.get(job['status_url']).data)
+    while status['status'] in ScanJob.ACTIVE_STATUSES and time.time() < deadline:
+        time.sleep(0.05)
+        status = json.loads(client.get(job['status_url']).data)
+    
+    assert status['status'] == 'done'
+    assert status['result']['monster_data'] == MONSTER_DATA
+
+@patch('app.routes.monsters.extract_text_from_image', return_value=None)
+def test_scan_job_failure(mock_extract, client, auth, app, campaign_id):
+    app.config['SCAN_JOB_WORKERS'] = 0
+    auth.login()
+    
+    job = json.loads(submit(client, campaign_id).data)
+    status = json.loads(client.get(job['status_url']).data)
+    
+    assert status['status'] == 'failed'
+    assert status['result']['success'] is False
+    assert 'Could not extract text' in status['result']['message']
+
+def test_scan_job_per_user_limit(client, auth, app, campaign_id):
+    app.config['SCAN_JOBS_PER_USER'] = 1
+    with app.app_context():
+        db.session.add(ScanJob(id='a' * 32, user_id=1, campaign_id=campaign_id, status='running'))
+        db.session.commit()
+    auth.login()
+    
+    response = submit(client, campaign_id)
+    assert response.status_code == 429
+    assert json.loads(response.data)['success'] is False
+
+def test_scan_job_expiry(client, auth, app, campaign_id):
+    app.config['SCAN_JOB_TTL'] = 60
+    with app.app_context():
+        db.session.add(ScanJob(
+            id='b' * 32, user_id=1, campaign_id=campaign_id, status='running',
+            created_at=datetime.utcnow() - timedelta(seconds=120)
+        ))
+        db.session.commit()
+    auth.login()
+    
+    response = client.get(f'/campaigns/{campaign_id}/monsters/scan-image/jobs/{"b" * 32}')
+    assert response.status_code == 404
+    
+    # Expired jobs no longer count against the user's limit
+    with app.app_context():
+        assert db.session.get(ScanJob, 'b' * 32) is None
+
+def dead_pid():
+    """The pid of a process that has exited."""
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+@pytest.mark.parametrize('job', [
+    # Its worker was killed
+    lambda: {'status': 'queued', 'worker_host': HOSTNAME, 'worker_pid': dead_pid()},
+    # Its worker is alive but it has been running for too long
+    lambda: {'status': 'running', 'worker_host': HOSTNAME, 'worker_pid': os.getpid(),
+             'started_at': datetime.utcnow() - timedelta(seconds=600)},
+])
+def test_orphaned_jobs_dont_count_against_the_limit(client, auth, app, campaign_id, job):
+    app.config['SCAN_JOBS_PER_USER'] = 1
+    app.config['SCAN_JOB_STALE_AFTER'] = 300
+    with app.app_context():
+        db.session.add(ScanJob(id='c' * 32, user_id=1, campaign_id=campaign_id, **job()))
+        db.session.commit()
+    auth.login()
+
+    assert submit(client, campaign_id).status_code != 429
+
+    status = json.loads(client.get(f'/campaigns/{campaign_id}/monsters/scan-image/jobs/{"c" * 32}').data)
+    assert status['status'] == 'failed'
+    assert 'try again' in status['result']['message']
+
+def test_live_jobs_still_count(app, campaign_id):
+    with app.app_context():
+        db.session.add(ScanJob(id='d' * 32, user_id=1, campaign_id=campaign_id, status='running',
+                               worker_host=HOSTNAME, worker_pid=os.getpid(), started_at=datetime.utcnow()))
+        # Another host's worker can't be checked, only timed out
+        db.session.add(ScanJob(id='e' * 32, user_id=1, campaign_id=campaign_id, status='queued',
+                               worker_host='elsewhere', worker_pid=dead_pid()))
+        db.session.commit()
+        assert count_active_scan_jobs(1) == 2
+
+def test_jobs_reporting_progress_are_not_stale(client, auth, app, campaign_id):
+    app.config['SCAN_JOB_STALE_AFTER'] = 300
+    with app.app_context():
+        # A long import that finished a page a moment ago
+        db.session.add(ScanJob(id='f' * 32, user_id=1, campaign_id=campaign_id, status='running',
+                               worker_host=HOSTNAME, worker_pid=os.getpid(),
+                               started_at=datetime.utcnow() - timedelta(seconds=600), updated_at=datetime.utcnow(),
+                               result=json.dumps({'success': True, 'total': 2, 'pages': [{'index': 0}]})))
+        db.session.commit()
+        assert count_active_scan_jobs(1) == 1
+    auth.login()
+    
+    # The pages finished so far are returned while it runs
+    status = json.loads(client.get(f'/campaigns/{campaign_id}/monsters/scan-image/jobs/{"f" * 32}').data)
+    assert status['status'] == 'running'
+    assert status['result']['pages'] == [{'index': 0}]
@@ -0,0 +1,36 @@
+import pytest
+from sqlalchemy import inspect, text
+from app import create_app, db
+from app.utils.schema import SchemaOutOfDateError, check_schema_head, migration_heads
+
+def stamp(app, revision):
+    with app.app_context():
+        with db.engine.begin() as connection:
+            connection.execute(text('CREATE TABLE IF NOT EXISTS alembic_version (version_num VARCHAR(32) NOT NULL)'))
+            connection.execute(text('DELETE FROM alembic_version'))
+            connection.execute(text('INSERT INTO alembic_version VALUES (:revision)'), {'revision': revision})
+
+def test_migration_heads(app):
+    assert migration_heads(app) == {'add_monster_cr_sort_index'}
+
+def test_unmigrated_database_is_refused(app):
+    with pytest.raises(SchemaOutOfDateError, match="revision none"):
+        check_schema_head(app)
+
+def test_old_revision_is_refused(app):
+    stamp(app, 'add_foreign_key_indexes')
+    with pytest.raises(SchemaOutOfDateError, match="flask db upgrade"):
+        check_schema_head(app)
+
+def test_database_at_head_passes(app):
+    stamp(app, 'add_monster_cr_sort_index')
+    check_schema_head(app)
+
+def test_boot_without_creating_the_schema(tmp_path):
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': f'sqlite:///{tmp_path / "empty.sqlite"}',
+        'AUTO_CREATE_SCHEMA': False,
+    })
+    with app.app_context():
+        assert inspect(db.engine).get_table_names() == []
@@ -0,0 +1,108 @@
+import pytest
+from sqlalchemy import insert
+from app import db
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.models.event import Event
+from app.models.loot import Loot
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.utils.search import search_campaign, search_terms
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        other = Campaign(title='Other Campaign', description='', user_id=1)
+        db.session.add_all([campaign, other])
+        db.session.commit()
+        encounter = Encounter(name='Den', campaign_id=campaign.id)
+        db.session.add(encounter)
+        db.session.commit()
+        db.session.add_all([
+            Monster(name='Wolf', type='beast', campaign_id=campaign.id,
+                    special_abilities='Pack Tactics. The wolf has advantage on an attack roll against a creature '
+                                      'if at least one of its allies is within 5 feet.'),
+            Monster(name='Kobold', type='humanoid', campaign_id=campaign.id, encounter_id=encounter.id,
+                    special_abilities='Sunlight Sensitivity. Pack Tactics.'),
+            Monster(name='Pack Leader', type='humanoid', campaign_id=campaign.id, actions='Multiattack.'),
+            # Same text in another campaign is never returned
+            Monster(name='Other Wolf', campaign_id=other.id, special_abilities='Pack Tactics.'),
+            NPC(name='Durnan', role='Innkeeper', campaign_id=campaign.id,
+                places_to_find='Behind the bar of the Yawning Portal in Waterdeep'),
+            Event(title='Brawl', description='A fight breaks out at the Yawning Portal.', campaign_id=campaign.id),
+            Loot(name='Wolf Pelt', description='A thick <grey> pelt.', campaign_id=campaign.id,
+                 encounter_id=encounter.id),
+        ])
+        db.session.commit()
+        return campaign.id
+
+def names(results):
+    return [result.title for result in results]
+
+def test_search_terms():
+    assert search_terms('  Pack "Tactics"* OR x; DROP TABLE ') == ['pack', 'tactics', 'or', 'x', 'drop', 'table']
+    assert search_terms(None) == []
+
+def test_search_every_kind(app, campaign_id):
+    with app.app_context():
+        assert sorted(names(search_campaign(campaign_id, 'pack tactics'))) == ['Kobold', 'Wolf']
+        results = search_campaign(campaign_id, 'yawning portal')
+        assert sorted((result.kind, result.title) for result in results) == [('event', 'Brawl'), ('npc', 'Durnan')]
+        assert [result.kind for result in search_campaign(campaign_id, 'pelt')] == ['loot']
+
+def test_title_matches_rank_first(app, campaign_id):
+    with app.app_context():
+        assert names(search_campaign(campaign_id, 'pack'))[0] == 'Pack Leader'
+
+def test_prefix_and_stemmed_matches(app, campaign_id):
+    with app.app_context():
+        assert 'Durnan' in names(search_campaign(campaign_id, 'waterd'))
+        assert 'Wolf' in names(search_campaign(campaign_id, 'allies'))
+
+def test_index_follows_updates_and_deletes(app, campaign_id):
+    with app.app_context():
+        wolf = Monster.query.filter_by(name='Wolf').first()
+        wolf.special_abilities = 'Keen Hearing and Smell.'
+        db.session.commit()
+        assert names(search_campaign(campaign_id, 'tactics')) == ['Kobold']
+        assert names(search_campaign(campaign_id, 'keen hearing')) == ['Wolf']
+
+        db.session.delete(Monster.query.filter_by(name='Kobold').first())
+        db.session.commit()
+        assert search_campaign(campaign_id, 'tactics') == []
+
+def test_bulk_inserts_are_indexed(app, campaign_id):
+    with app.app_context():
+        db.session.execute(insert(Monster), [{'name': 'Imported Hyena', 'campaign_id': campaign_id,
+                                              'special_abilities': 'Pack Tactics.'}])
+        db.session.commit()
+        assert 'Imported Hyena' in names(search_campaign(campaign_id, 'tactics'))
+
+def test_search_page(client, auth, campaign_id):
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/search', query_string={'q': 'pelt'})
+    assert response.status_code == 200
+    assert b'<mark>Pelt</mark>' in response.data
+    # Text is escaped around the highlighted words
+    assert b'&lt;grey&gt;' in response.data
+    assert f'/campaigns/{campaign_id}/encounters/'.encode() in response.data
+
+def test_search_json(client, auth, campaign_id):
+    auth.login()
+    data = client.get(f'/campaigns/{campaign_id}/search', query_string={'q': 'portal', 'format': 'json'}).get_json()
+    assert data['success'] is True
+    assert {result['kind'] for result in data['results']} == {'npc', 'event'}
+    npc = next(result for result in data['results'] if result['kind'] == 'npc')
+    assert 'Yawning Portal' in npc['snippet']
+    assert npc['url'].endswith(f'/campaigns/{campaign_id}/npcs/{npc["id"]}')
+
+def test_search_other_users_campaign(client, auth, app):
+    with app.app_context():
+        campaign = Campaign(title='Not Mine', description='', user_id=2)
+        db.session.add(campaign)
+        db.session.commit()
+        campaign_id = campaign.id
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/search', query_string={'q': 'x', 'format': 'json'})
+    assert response.status_code == 403
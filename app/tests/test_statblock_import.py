@@ -0,0 +1,132 @@
+import io
+import json
+import zipfile
+from unittest.mock import patch
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.monster import Monster
+from app.utils.statblock_import import split_pages, monster_rows, ImportFileError
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        return campaign.id
+
+def make_zip(files):
+    zip_io = io.BytesIO()
+    with zipfile.ZipFile(zip_io, 'w') as archive:
+        for name, content in files.items():
+            archive.writestr(name, content)
+    return zip_io.getvalue()
+
+def test_split_zip_keeps_images_in_name_order():
+    archive = make_zip({'b.png': b'bbb', 'notes.txt': b'skip me', 'a.jpg': b'aaa', 'dir/c.PNG': b'ccc'})
+    
+    pages = split_pages('bestiary.zip', archive)
+    
+    assert pages == [('a.jpg', b'aaa'), ('b.png', b'bbb'), ('c.PNG', b'ccc')]
+
+def test_split_zip_limits():
+    archive = make_zip({f'{i}.png': b'x' for i in range(3)})
+    
+    with pytest.raises(ImportFileError):
+        split_pages('bestiary.zip', archive, max_pages=2)
+    with pytest.raises(ImportFileError):
+        split_pages('bestiary.zip', archive, max_total_size=2)
+    with pytest.raises(ImportFileError):
+        split_pages('bestiary.zip', b'not a zip')
+    with pytest.raises(ImportFileError):
+        split_pages('bestiary.zip', make_zip({'readme.txt': b'no images'}))
+
+def test_monster_rows():
+    rows = monster_rows([
+        {'name': 'Goblin', 'armor_class': '15', 'hit_points': 7, 'strength': None, 'unknown': 'x'},
+        {'armor_class': 12},
+        'not a dict',
+    ], campaign_id=3)
+    
+    assert rows == [{'name': 'Goblin', 'armor_class': 15, 'hit_points': 7, 'campaign_id': 3, 'encounter_id': None}]
+
+def parse_for_file(text):
+    return {'name': text.split('\n')[0], 'armor_class': 12}
+
+@patch('app.utils.statblock_import.parse_monster_data', side_effect=parse_for_file)
+@patch('app.utils.statblock_import.extract_text_from_image', side_effect=lambda image_bytes: image_bytes.decode() or None)
+def test_import_runs_as_a_scan_job(mock_extract, mock_parse, client, auth, app, campaign_id):
+    app.config['IMPORT_OCR_PROCESSES'] = 0
+    app.config['SCAN_JOB_WORKERS'] = 0
+    auth.login()
+    
+    archive = make_zip({'1-goblin.png': b'Goblin\nAC 15', '2-orc.png': b'Orc\nAC 13', '3-blank.png': b''})
+    response = client.post(
+        f'/campaigns/{campaign_id}/monsters/import',
+        data={'statblock_archive': (io.BytesIO(archive), 'bestiary.zip')},
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 202
+    job = json.loads(response.data)
+    assert job['total'] == 3
+    assert response.headers['Location'] == job['status_url']
+    
+    status = json.loads(client.get(job['status_url']).data)
+    assert status['status'] == 'done'
+    assert status['result']['total'] == 3
+    results = {page['filename']: page for page in status['result']['pages']}
+    assert results['1-goblin.png']['monster_data']['name'] == 'Goblin'
+    assert results['2-orc.png']['monster_data']['name'] == 'Orc'
+    assert results['3-blank.png']['success'] is False
+
+def test_import_rejects_bad_upload(client, auth, campaign_id):
+    auth.login()
+    
+    response = client.post(
+        f'/campaigns/{campaign_id}/monsters/import',
+        data={'statblock_archive': (io.BytesIO(b'not a zip'), 'bestiary.zip')},
+        content_type='multipart/form-data'
+    )
+    
+    assert response.status_code == 400
+    assert json.loads(response.data)['success'] is False
+
+def test_import_save_inserts_accepted_monsters(client, auth, app, campaign_id):
+    auth.login()
+    
+    response = client.post(f'/campaigns/{campaign_id}/monsters/import/save', json={
+        'monsters': [
+            {'name': 'Goblin', 'armor_class': 15, 'hit_points': 7, 'challenge_rating': '1/4'},
+            {'name': 'Orc', 'armor_class': 13, 'hit_points': 15, 'challenge_rating': '1/2'},
+        ]
+    })
+    
+    assert response.status_code == 200
+    assert json.loads(response.data)['created'] == 2
+    with app.app_context():
+        monsters = Monster.query.filter_by(campaign_id=campaign_id).order_by(Monster.name).all()
+        assert [monster.name for monster in monsters] == ['Goblin', 'Orc']
+        # Columns the OCR didn't fill keep their defaults
+        assert monsters[0].strength == 10
+        assert monsters[0].encounter_id is None
+
+@pytest.mark.parametrize('monster, field', [
+    ({'name': ['Goblin']}, 'name'),
+    ({'name': 'Goblin', 'actions': {'Scimitar': '+4 to hit'}}, 'actions'),
+    ({'name': 'Goblin', 'challenge_rating': True}, 'challenge_rating'),
+    ({'name': 'Goblin', 'size': 'Gargantuan' * 5}, 'size'),
+])
+def test_import_save_rejects_bad_values(client, auth, app, campaign_id, monster, field):
+    auth.login()
+    
+    response = client.post(f'/campaigns/{campaign_id}/monsters/import/save', json={
+        'monsters': [{'name': 'Orc'}, monster]
+    })
+    
+    assert response.status_code == 400
+    data = json.loads(response.data)
+    assert (data['success'], data['index'], data['field']) == (False, 1, field)
+    with app.app_context():
+        assert Monster.query.filter_by(campaign_id=campaign_id).count() == 0
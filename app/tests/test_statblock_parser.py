@@ -0,0 +1,77 @@
+from app.utils.statblock_parser import parse_statblock, extract_section
+
+LABELLED_STATBLOCK = """Ancient Red Dragon
+Gargantuan Dragon, Chaotic Evil
+
+Armor Class 22 (natural armor)
+Hit Points 546 (28d20 + 252)
+Speed 40 ft., climb 40 ft., fly 80 ft.
+
+STR 30 (+10)  DEX 10 (+0)  CON 29 (+9)
+INT 18 (+4)   WIS 15 (+2)  CHA 23 (+6)
+
+Skills Perception +16, Stealth +7
+Languages Common, Draconic
+Challenge 24 (62,000 XP)
+
+ACTIONS
+Multiattack. The dragon makes three attacks.
+Bite. Melee Weapon Attack: +17 to hit, reach 15 ft., one target.
+
+LEGENDARY ACTIONS
+Tail Attack. The dragon makes a tail attack.
+
+REACTIONS
+Tail Swipe. The dragon swipes."""
+
+def test_parse_labelled_statblock():
+    result = parse_statblock(LABELLED_STATBLOCK)
+
+    assert result['name'] == 'Ancient Red Dragon'
+    assert (result['size'], result['type'], result['alignment']) == ('gargantuan', 'dragon', 'chaotic evil')
+    assert result['armor_class'] == 22
+    assert result['armor_type'] == 'natural armor'
+    assert result['hit_points'] == 546
+    assert result['hit_dice'] == '28d20 + 252'
+    assert [result[field] for field in ('strength', 'dexterity', 'constitution',
+                                        'intelligence', 'wisdom', 'charisma')] == [30, 10, 29, 18, 15, 23]
+    assert result['challenge_rating'] == '24'
+    assert result['xp'] == 62000
+
+def test_sections_end_at_the_next_header():
+    result = parse_statblock(LABELLED_STATBLOCK)
+
+    assert result['actions'] == ('Multiattack. The dragon makes three attacks.\n'
+                                 'Bite. Melee Weapon Attack: +17 to hit, reach 15 ft., one target.')
+    assert result['reactions'] == 'Tail Swipe. The dragon swipes.'
+    assert 'legendary_actions' not in result
+
+def test_first_occurrence_wins():
+    result = parse_statblock("Goblin\nAC 15\nHP 7 (2d6)\nAC 12")
+
+    assert result['armor_class'] == 15
+
+def test_labels_inside_words_are_ignored():
+    result = parse_statblock("Scribe\nMedium Humanoid, Any Alignment\nACROBAT 3")
+
+    assert 'armor_class' not in result
+    assert result['size'] == 'medium'
+
+def test_extract_section_accepts_trailing_colon():
+    text = "Wolf\nTRAITS:\nKeen Smell.\nACTIONS:\nBite."
+
+    assert extract_section(text, ["TRAITS", "TRAIT"]) == 'Keen Smell.'
+    assert extract_section(text, ["ACTIONS", "ACTION"]) == 'Bite.'
+    assert extract_section(text, ["REACTIONS", "REACTION"]) is None
+
+def test_header_sharing_a_line_with_its_first_entry():
+    text = ("Young Dragon\nLarge Dragon, Chaotic Evil\nAC 18\n"
+            "ACTIONS Multiattack. The dragon makes three attacks.\nBite. Melee Weapon Attack.\n"
+            "REACTIONS: Tail Swipe. The dragon swipes.")
+    result = parse_statblock(text)
+
+    assert result['armor_class'] == 18
+    assert result['actions'] == 'Multiattack. The dragon makes three attacks.\nBite. Melee Weapon Attack.'
+    assert result['reactions'] == 'Tail Swipe. The dragon swipes.'
+    # A header word at the start of a longer word isn't a header
+    assert 'special_abilities' not in parse_statblock("Scribe\nTRAITSMAN 3")
@@ -0,0 +1,71 @@
+import re
+import pytest
+from app import db
+from app.models.campaign import Campaign
+from app.models.monster import Monster
+from app.utils.pdf_renderer import init_pdf_renderer
+from app.utils.statblock_pdf import statblock_document, pdf_text
+
+def page_count(pdf):
+    return len(re.findall(rb'/Type\s*/Page\b', pdf))
+
+@pytest.fixture
+def native_app(app):
+    pytest.importorskip('fpdf')
+    app.config['PDF_BACKEND'] = 'native'
+    init_pdf_renderer(app)
+    return app
+
+@pytest.fixture
+def campaign_id(app):
+    with app.app_context():
+        campaign = Campaign(title='Test Campaign', description='Test Description', user_id=1)
+        db.session.add(campaign)
+        db.session.commit()
+        db.session.add_all([
+            Monster(name='Goblin', campaign_id=campaign.id, size='Small', type='humanoid',
+                    alignment='neutral evil', armor_class=15, armor_type='leather armor, shield',
+                    hit_points=7, hit_dice='2d6', speed='30 ft.', dexterity=14, skills='Stealth +6',
+                    challenge_rating='1/4', xp=50,
+                    actions='Scimitar. Melee Weapon Attack: +4 to hit, reach 5 ft., one target.\n'
+                            'Shortbow. Ranged Weapon Attack: +4 to hit, range 80/320 ft.'),
+            Monster(name='Bugbear', campaign_id=campaign.id, description='“Hairy” goblinoids — born for battle.'),
+        ])
+        db.session.commit()
+        return campaign.id
+
+def test_statblock_document_copies_monster_fields(app, campaign_id):
+    with app.app_context():
+        campaign = db.session.get(Campaign, campaign_id)
+        monsters = Monster.query.filter_by(campaign_id=campaign_id).order_by(Monster.name).all()
+        document = statblock_document(campaign, monsters, title='Bestiary')
+
+    assert document['title'] == 'Bestiary'
+    assert document['author'] == 'test'
+    assert [monster['name'] for monster in document['monsters']] == ['Bugbear', 'Goblin']
+    assert document['monsters'][1]['armor_class'] == 15
+
+def test_pdf_text_keeps_to_latin1():
+    assert pdf_text('“Hairy” — 10′ ✓') == '"Hairy" - 10? ?'
+    assert pdf_text('Ælf café') == 'Ælf café'
+
+def test_native_backend_exports_a_statblock(client, auth, native_app, campaign_id):
+    with native_app.app_context():
+        monster_id = Monster.query.filter_by(name='Goblin').one().id
+
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/monsters/{monster_id}/pdf')
+
+    assert response.status_code == 200
+    assert response.mimetype == 'application/pdf'
+    assert response.data.startswith(b'%PDF-')
+    assert page_count(response.data) == 1
+
+def test_native_backend_exports_a_bestiary_in_one_document(client, auth, native_app, campaign_id):
+    auth.login()
+    response = client.get(f'/campaigns/{campaign_id}/monsters/bestiary-pdf')
+
+    assert response.status_code == 200
+    assert response.data.startswith(b'%PDF-')
+    assert page_count(response.data) == 2
+    assert native_app.extensions['pdf_renderer'].metrics.snapshot()['rendered'] == 1
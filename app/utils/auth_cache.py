@@ -0,0 +1,161 @@
+import time
+import threading
+from collections import OrderedDict
+from flask import abort, current_app, request
+from flask_login import current_user
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+from app import db
+from app.models.user import User
+from app.models.campaign import Campaign
+
+# Requests served from the campaign cache; the others re-check the database
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+class TTLCache:
+    """Thread-safe, size-bounded cache whose entries expire ``ttl`` seconds after they are stored.
+
+    A ``ttl`` of 0 disables it: nothing is stored and every lookup misses.
+    """
+
+    def __init__(self, ttl=30, max_entries=4096):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Return the value stored for a key, or None if there is none or it expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires <= time.monotonic():
+                del self._entries[key]
+                return None
+            return value
+
+    def set(self, key, value):
+        if self.ttl <= 0 or self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, predicate):
+        """Remove the entries whose key matches ``predicate``."""
+        with self._lock:
+            for key in [key for key in self._entries if predicate(key)]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+class AuthCache:
+    """Per-worker cache of the logged in users and of the campaigns they own.
+
+    Saves the user lookup Flask-Login makes on every request and the campaign
+    lookup of the ownership check most routes start with. Entries are detached
+    copies holding only column values; ``attach`` merges one into the current
+    session without a query, so relationships still load lazily as usual.
+
+    Each worker process has its own cache, so logging out or deleting a campaign
+    clears the entries of the worker that handled it and the other workers'
+    copies expire after ``ttl`` seconds. Until then those workers may still show
+    a deleted or re-owned campaign to its old owner; requests that write look the
+    campaign up again instead (see ``get_campaign_or_404``).
+    """
+
+    def __init__(self, ttl=30, max_entries=4096):
+        self.users = TTLCache(ttl, max_entries)
+        # (user id, campaign id) -> campaign, only for campaigns the user owns
+        self.campaigns = TTLCache(ttl, max_entries)
+
+    @staticmethod
+    def snapshot(instance):
+        """Return a detached copy of a loaded model instance with just its column values."""
+        mapper = inspect(instance).mapper
+        copy = mapper.class_()
+        for attribute in mapper.column_attrs:
+            setattr(copy, attribute.key, getattr(instance, attribute.key))
+        make_transient_to_detached(copy)
+        return copy
+
+    @staticmethod
+    def attach(cached):
+        """Return the current session's copy of a cached instance, without loading it."""
+        return db.session.merge(cached, load=False)
+
+    def forget_user(self, user_id):
+        """Drop a user and their campaign ownership entries (on logout)."""
+        self.users.discard(lambda key: key == user_id)
+        self.campaigns.discard(lambda key: key[0] == user_id)
+
+    def forget_campaign(self, campaign_id):
+        """Drop the ownership entries of a campaign (when it is deleted)."""
+        self.campaigns.discard(lambda key: key[1] == campaign_id)
+
+    def clear(self):
+        self.users.clear()
+        self.campaigns.clear()
+
+def init_auth_cache(app):
+    """Create the user and campaign ownership cache for an app from its config.
+
+    ``AUTH_CACHE_TTL`` is how many seconds an entry is trusted (0 disables the
+    cache) and ``AUTH_CACHE_SIZE`` bounds each of the two caches.
+    """
+    app.extensions['auth_cache'] = AuthCache(
+        ttl=app.config.get('AUTH_CACHE_TTL', 30),
+        max_entries=app.config.get('AUTH_CACHE_SIZE', 4096),
+    )
+
+def get_auth_cache():
+    """Return the auth cache of the current app."""
+    return current_app.extensions['auth_cache']
+
+def cached_user(user_id):
+    """Return the user with an id for Flask-Login, from the cache when possible."""
+    cache = get_auth_cache()
+    cached = cache.users.get(user_id)
+    if cached is not None:
+        return cache.attach(cached)
+
+    user = db.session.get(User, user_id)
+    if user is not None:
+        cache.users.set(user_id, cache.snapshot(user))
+    return user
+
+def get_campaign_or_404(campaign_id):
+    """Return a campaign like ``Campaign.query.get_or_404``, from the cache when the current user owns it.
+
+    Only owned campaigns are cached, so the ownership check after it still sees
+    other users' campaigns as they are in the database. Requests that may write
+    (anything but GET, HEAD and OPTIONS) always look the campaign up by primary
+    key, so another worker's stale entry can't let them change a campaign that
+    was deleted or given to someone else.
+    """
+    cache = get_auth_cache()
+    user_id = current_user.id if current_user.is_authenticated else None
+    key = (user_id, campaign_id)
+    cached = cache.campaigns.get(key) if request.method in READ_METHODS else None
+    if cached is not None:
+        return cache.attach(cached)
+
+    campaign = db.session.get(Campaign, campaign_id)
+    if campaign is None:
+        cache.forget_campaign(campaign_id)
+        abort(404)
+    if user_id is not None and campaign.user_id == user_id:
+        cache.campaigns.set(key, cache.snapshot(campaign))
+    else:
+        cache.campaigns.discard(lambda entry: entry == key)
+    return campaign
@@ -0,0 +1,110 @@
+import os
+import re
+import time
+import uuid
+import logging
+import threading
+from flask import current_app
+from app import db
+from app.models.monster import Monster
+from app.models.campaign import Campaign
+from app.models.encounter import Encounter
+from app.utils.encounter_monsters import encounter_statblocks
+from app.utils.pdf_renderer import render_statblocks, PDFRenderError
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BESTIARY_TEMPLATE = 'monsters/bestiary_pdf_template.html'
+
+# Bestiaries with more monsters than this are rendered as a background job
+BESTIARY_SYNC_LIMIT = 20
+
+# Renders of a whole bestiary get longer than a single statblock's timeout
+BESTIARY_RENDER_TIMEOUT = 120
+
+FILE_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+def bestiary_monsters(campaign, encounter=None):
+    """Return the monsters of an encounter, or of the whole campaign, in page order."""
+    if encounter is not None:
+        query = encounter_statblocks(encounter.id)
+    else:
+        query = Monster.query.filter_by(campaign_id=campaign.id)
+    return query.order_by(Monster.name, Monster.id).all()
+
+def bestiary_title(campaign, encounter=None):
+    if encounter is not None:
+        return f'{encounter.name} Bestiary'
+    return f'{campaign.title} Bestiary'
+
+def bestiary_filename(campaign, encounter=None):
+    return f"{bestiary_title(campaign, encounter).replace(' ', '_')}.pdf"
+
+def runs_in_background(monster_count):
+    """Return whether a bestiary of ``monster_count`` monsters is exported as a background job."""
+    return monster_count > current_app.config.get('PDF_BESTIARY_SYNC_LIMIT', BESTIARY_SYNC_LIMIT)
+
+def render_bestiary(campaign, monsters, title):
+    """Render every monster's statblock into one paginated PDF with a single renderer call."""
+    timeout = current_app.config.get('PDF_BESTIARY_TIMEOUT', BESTIARY_RENDER_TIMEOUT)
+    return render_statblocks(campaign, monsters, BESTIARY_TEMPLATE, title=title, timeout=timeout)
+
+def export_dir():
+    """Return the folder finished background exports are written to."""
+    path = current_app.config.get('PDF_EXPORT_DIR') or os.path.join(current_app.instance_path, 'pdf_exports')
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def export_path(file_id):
+    """Return the path of a finished export, or None for a malformed id."""
+    if not FILE_ID_PATTERN.match(file_id or ''):
+        return None
+    return os.path.join(export_dir(), f'{file_id}.pdf')
+
+def new_export(campaign_id, encounter_id=None):
+    """Return the input of a background bestiary export job."""
+    return {'campaign_id': campaign_id, 'encounter_id': encounter_id, 'file_id': uuid.uuid4().hex}
+
+def process_bestiary_export(export):
+    """Render a bestiary to a file in the export folder (run as a background job).
+
+    Returns a ``(payload, status_code)`` pair like the scan jobs do.
+    """
+    campaign = db.session.get(Campaign, export['campaign_id'])
+    encounter = db.session.get(Encounter, export['encounter_id']) if export['encounter_id'] else None
+    if campaign is None or (export['encounter_id'] and encounter is None):
+        return {'success': False, 'message': 'Campaign or encounter no longer exists.'}, 404
+
+    monsters = bestiary_monsters(campaign, encounter)
+    try:
+        pdf = render_bestiary(campaign, monsters, bestiary_title(campaign, encounter))
+    except PDFRenderError as e:
+        logger.error(f"Error rendering bestiary for campaign {campaign.id}: {str(e)}")
+        return {'success': False, 'message': f'Error generating PDF: {str(e)}'}, 500
+
+    path = export_path(export['file_id'])
+    tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(pdf)
+    os.replace(tmp_path, path)
+
+    return {
+        'success': True,
+        'file_id': export['file_id'],
+        'filename': bestiary_filename(campaign, encounter),
+        'monster_count': len(monsters)
+    }, 200
+
+def expire_bestiary_exports():
+    """Delete export files older than ``SCAN_JOB_TTL`` seconds, like the jobs that made them."""
+    cutoff = time.time() - current_app.config.get('SCAN_JOB_TTL', 3600)
+    folder = export_dir()
+    for name in os.listdir(folder):
+        path = os.path.join(folder, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+        except OSError:
+            pass
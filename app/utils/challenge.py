@@ -0,0 +1,53 @@
+import re
+
+# XP awarded for a monster of each challenge rating
+CR_XP = {
+    0: 10, 0.125: 25, 0.25: 50, 0.5: 100,
+    1: 200, 2: 450, 3: 700, 4: 1100, 5: 1800, 6: 2300, 7: 2900, 8: 3900, 9: 5000, 10: 5900,
+    11: 7200, 12: 8400, 13: 10000, 14: 11500, 15: 13000, 16: 15000, 17: 18000, 18: 20000, 19: 22000, 20: 25000,
+    21: 33000, 22: 41000, 23: 50000, 24: 62000, 25: 75000, 26: 90000, 27: 105000, 28: 120000, 29: 135000,
+    30: 155000,
+}
+
+UNICODE_FRACTIONS = {'⅛': '1/8', '¼': '1/4', '½': '1/2'}
+
+CR_PATTERN = re.compile(r'^\s*(?:(\d+)\s*/\s*(\d+)|(\d+(?:\.\d+)?))')
+
+def challenge_rating_value(challenge_rating):
+    """Return the number a challenge rating like '1/4', '5' or '5 (1,800 XP)' stands for, or None."""
+    if challenge_rating is None:
+        return None
+    if isinstance(challenge_rating, (int, float)):
+        return float(challenge_rating)
+    text = str(challenge_rating)
+    for fraction, spelled in UNICODE_FRACTIONS.items():
+        text = text.replace(fraction, spelled)
+    match = CR_PATTERN.match(text)
+    if not match:
+        return None
+    numerator, denominator, number = match.groups()
+    if number is not None:
+        return float(number)
+    if int(denominator) == 0:
+        return None
+    return int(numerator) / int(denominator)
+
+def challenge_rating_default(context):
+    """Column default for Monster.cr_value: the value of the inserted row's challenge_rating.
+
+    Covers Core bulk inserts (statblock imports), which don't go through the
+    model's validator.
+    """
+    return challenge_rating_value(context.get_current_parameters().get('challenge_rating'))
+
+def challenge_xp(cr):
+    """Return the XP of a monster of challenge rating ``cr``, or None for unusual ratings."""
+    if cr is None:
+        return None
+    return CR_XP.get(cr)
+
+def proficiency_bonus(cr):
+    """Return the proficiency bonus of a monster of challenge rating ``cr`` (+2 up to CR 4, +1 every 4 CRs after)."""
+    if cr is None:
+        return None
+    return 2 + max(0, int(cr) - 1) // 4
@@ -0,0 +1,83 @@
+import logging
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool
+from app import db
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Connection pools for server databases (PostgreSQL): 'queue' keeps up to
+# DB_POOL_SIZE connections open per worker, 'null' opens one per checkout for
+# when an external pooler (PgBouncer) sits in front of the database.
+POOL_CLASSES = {
+    'queue': None,
+    'null': NullPool,
+}
+
+def engine_options(config):
+    """Return the SQLAlchemy engine options for the configured database.
+
+    Server databases get a pool sized by ``DB_POOL_SIZE``, ``DB_MAX_OVERFLOW``,
+    ``DB_POOL_TIMEOUT`` and ``DB_POOL_RECYCLE``, with ``DB_POOL_PRE_PING``
+    checking connections before use (SQLite is set up by ``sqlite_pragmas``).
+    Options already in ``SQLALCHEMY_ENGINE_OPTIONS`` win.
+    """
+    url = make_url(config['SQLALCHEMY_DATABASE_URI'])
+    options = {}
+    if url.get_backend_name() != 'sqlite':
+        pool = config.get('DB_POOL', 'queue')
+        if pool not in POOL_CLASSES:
+            raise ValueError(f"Unknown DB_POOL '{pool}', expected one of {', '.join(POOL_CLASSES)}")
+        if POOL_CLASSES[pool] is not None:
+            options['poolclass'] = POOL_CLASSES[pool]
+        else:
+            options['pool_size'] = config.get('DB_POOL_SIZE', 5)
+            options['max_overflow'] = config.get('DB_MAX_OVERFLOW', 10)
+            options['pool_timeout'] = config.get('DB_POOL_TIMEOUT', 30)
+        options['pool_recycle'] = config.get('DB_POOL_RECYCLE', 1800)
+        options['pool_pre_ping'] = config.get('DB_POOL_PRE_PING', True)
+
+    options.update(config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    return options
+
+def sqlite_pragmas(config):
+    """Return the PRAGMA statements run on every new SQLite connection.
+
+    WAL lets readers carry on while a worker writes and, with synchronous=NORMAL,
+    makes a commit an append to the log rather than two fsyncs of the database;
+    a worker finding the database locked waits up to ``SQLITE_BUSY_TIMEOUT`` ms
+    for it instead of failing. An empty ``SQLITE_JOURNAL_MODE`` leaves the
+    database's journal mode alone.
+    """
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT', 5000))}",
+        f"PRAGMA synchronous = {config.get('SQLITE_SYNCHRONOUS', 'NORMAL')}",
+        f"PRAGMA mmap_size = {int(config.get('SQLITE_MMAP_SIZE', 256 * 1024 * 1024))}",
+    ]
+    journal_mode = config.get('SQLITE_JOURNAL_MODE', 'WAL')
+    if journal_mode:
+        pragmas.insert(0, f"PRAGMA journal_mode = {journal_mode}")
+    return pragmas
+
+def _run_pragmas(pragmas):
+    def on_connect(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for pragma in pragmas:
+                cursor.execute(pragma)
+        finally:
+            cursor.close()
+    return on_connect
+
+def configure_database(app):
+    """Set the app's engine options from its config; call before ``db.init_app``."""
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(app.config)
+
+def init_database(app):
+    """Run the SQLite pragmas on each new connection of the app's engines (after ``db.init_app``)."""
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name == 'sqlite':
+                event.listen(engine, 'connect', _run_pragmas(sqlite_pragmas(app.config)))
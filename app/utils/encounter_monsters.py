@@ -0,0 +1,39 @@
+from sqlalchemy import func, insert, or_, select
+from app import db
+from app.models.monster import Monster
+from app.models.encounter_monster import EncounterMonster
+
+# Most copies of a statblock one "add" request may put into an encounter
+MAX_COPIES = 50
+
+def participant_labels(name, count, existing=0):
+    """Return the labels of ``count`` new copies of ``name`` after ``existing`` ones.
+
+    A lone monster keeps the statblock's name; copies are numbered on from the
+    ones already in the encounter (Goblin 1, Goblin 2...).
+    """
+    if count == 1 and existing == 0:
+        return [name]
+    return [f'{name} {number}' for number in range(existing + 1, existing + count + 1)]
+
+def add_participants(encounter_id, monster, count=1):
+    """Add ``count`` copies of ``monster`` to an encounter with a single INSERT.
+
+    The rows only carry the label and references, so this is one statement
+    however many copies there are. Returns the number added; the caller commits.
+    """
+    existing = db.session.scalar(
+        select(func.count(EncounterMonster.id))
+        .filter_by(encounter_id=encounter_id, monster_id=monster.id)
+    )
+    rows = [
+        {'encounter_id': encounter_id, 'monster_id': monster.id, 'label': label}
+        for label in participant_labels(monster.name, count, existing)
+    ]
+    db.session.execute(insert(EncounterMonster), rows)
+    return len(rows)
+
+def encounter_statblocks(encounter_id):
+    """Return the statblocks of an encounter: its own and those its participants use."""
+    used = select(EncounterMonster.monster_id).filter_by(encounter_id=encounter_id)
+    return Monster.query.filter(or_(Monster.encounter_id == encounter_id, Monster.id.in_(used)))
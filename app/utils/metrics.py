@@ -0,0 +1,105 @@
+import os
+import time
+import logging
+from contextlib import contextmanager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# prometheus_client picks how it stores values when it is imported: with
+# PROMETHEUS_MULTIPROC_DIR set every process writes its samples to files in that
+# folder and /metrics adds up the files of all the gunicorn workers
+try:
+    from prometheus_client import Gauge, Histogram
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+    logger.warning("prometheus_client not available. /metrics will be disabled.")
+
+class _NullMetric:
+    """Stands in for a metric when prometheus_client isn't installed."""
+
+    def labels(self, *args, **kwargs):
+        return self
+
+    def observe(self, value):
+        pass
+
+    def inc(self, amount=1):
+        pass
+
+if PROMETHEUS_AVAILABLE:
+    REQUEST_LATENCY = Histogram(
+        'ddm_request_duration_seconds', 'Time spent handling a request',
+        ['blueprint', 'endpoint', 'method'],
+    )
+    OCR_STAGE_SECONDS = Histogram(
+        'ddm_ocr_stage_duration_seconds', 'Time spent in a stage of the OCR pipeline (one tesseract pass per sample)',
+        ['stage'],
+        buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+    )
+    PDF_RENDER_SECONDS = Histogram(
+        'ddm_pdf_render_duration_seconds', 'Time spent rendering a PDF, not counting the wait for a renderer',
+        ['backend'],
+        buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0),
+    )
+    DB_QUERY_SECONDS = Histogram(
+        'ddm_db_query_duration_seconds', 'Time spent executing a SQL statement',
+        buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+    )
+    # livesum adds up the workers that are still running, so a worker that died
+    # with jobs queued doesn't leave them counted forever
+    QUEUE_DEPTH = Gauge(
+        'ddm_worker_pool_queue_depth', 'Jobs waiting for a free worker',
+        ['pool'], multiprocess_mode='livesum',
+    )
+else:
+    REQUEST_LATENCY = OCR_STAGE_SECONDS = PDF_RENDER_SECONDS = DB_QUERY_SECONDS = QUEUE_DEPTH = _NullMetric()
+
+def observe_request(blueprint, endpoint, method, seconds):
+    REQUEST_LATENCY.labels(blueprint=blueprint or '', endpoint=endpoint, method=method).observe(seconds)
+
+def observe_db_query(seconds):
+    DB_QUERY_SECONDS.observe(seconds)
+
+def observe_pdf_render(backend, seconds):
+    PDF_RENDER_SECONDS.labels(backend=backend).observe(seconds)
+
+def change_queue_depth(pool, amount):
+    """Add ``amount`` (negative to take away) to the number of jobs queued on a worker pool."""
+    QUEUE_DEPTH.labels(pool=pool).inc(amount)
+
+@contextmanager
+def ocr_stage(stage):
+    """Time the block as one sample of an OCR pipeline stage.
+
+    Stages are ``preprocess`` and ``parse`` (one sample per scan), ``tesseract``
+    (one sample per pass) and ``preprocess_fallback`` (the extra variants of the
+    PIL-only pipeline, only for scans whose first pass scored too low).
+    """
+    started_at = time.perf_counter()
+    try:
+        yield
+    finally:
+        OCR_STAGE_SECONDS.labels(stage=stage).observe(time.perf_counter() - started_at)
+
+def multiprocess_dir():
+    """Return the folder the worker processes share their samples through, or None."""
+    return os.environ.get('PROMETHEUS_MULTIPROC_DIR')
+
+def generate_metrics():
+    """Return the ``(body, content_type)`` of a Prometheus scrape.
+
+    In multiprocess mode the samples of every worker are collected from the
+    shared folder, so it doesn't matter which worker answers the scrape.
+    """
+    from prometheus_client import CollectorRegistry, CONTENT_TYPE_LATEST, REGISTRY, generate_latest
+
+    if multiprocess_dir():
+        from prometheus_client import multiprocess
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
@@ -6,6 +6,10 @@ import numpy as np
 import io
 import logging
 import os
+from app.utils.ocr_engine import image_to_string
+from app.utils.metrics import ocr_stage
+from app.utils.statblock_parser import parse_statblock
+from app.utils.ocr_normalize import analysis_size, measure_array
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +37,31 @@ else:
     else:
         logger.warning("Tesseract executable not found in common locations. OCR may not work properly.")
 
+# Bump whenever preprocessing, OCR or parsing changes so cached results are recomputed
+OCR_PIPELINE_VERSION = 'opencv-3'
+
+def normalize_image_array(image):
+    """Crop a decoded BGR image to its statblock and resample it to the OCR resolution.
+
+    Measured on a small thumbnail (see ocr_normalize) so the denoising below only
+    ever sees the statblock at a sensible size.
+    """
+    height, width = image.shape[:2]
+    thumbnail_width, thumbnail_height = analysis_size((width, height))
+    thumbnail = cv2.resize(image, (thumbnail_width, thumbnail_height), interpolation=cv2.INTER_AREA)
+    crop_box, scale = measure_array(np.ascontiguousarray(thumbnail[:, :, ::-1]), (width, height))
+    
+    if crop_box is not None:
+        left, top, right, bottom = crop_box
+        image = image[top:bottom, left:right]
+    if scale != 1.0:
+        new_size = (max(1, round(image.shape[1] * scale)), max(1, round(image.shape[0] * scale)))
+        interpolation = cv2.INTER_AREA if scale < 1 else cv2.INTER_CUBIC
+        image = cv2.resize(image, new_size, interpolation=interpolation)
+    
+    logger.info(f"Normalized image from {(width, height)} to {(image.shape[1], image.shape[0])}")
+    return image
+
 def preprocess_image(image_bytes):
     """Preprocess image for better OCR results."""
     try:
@@ -40,6 +69,9 @@ def preprocess_image(image_bytes):
         nparr = np.frombuffer(image_bytes, np.uint8)
         image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
         
+        # Crop and resample before the (slow on large images) denoising
+        image = normalize_image_array(image)
+        
         # Convert to grayscale
         gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
         
@@ -58,15 +90,16 @@ def extract_text_from_image(image_bytes):
     """Extract text from image using OCR."""
     try:
         # Preprocess image for better OCR results
-        processed_image = preprocess_image(image_bytes)
+        with ocr_stage('preprocess'):
+            processed_image = preprocess_image(image_bytes)
         if processed_image is None:
             return None
         
         # Convert numpy array to PIL Image
         pil_image = Image.fromarray(processed_image)
         
-        # Extract text using pytesseract
-        text = pytesseract.image_to_string(pil_image)
+        # Extract text using the worker's OCR engine
+        text = image_to_string(pil_image)
         
         return text
     except Exception as e:
@@ -78,101 +111,8 @@ def parse_monster_data(text):
     if not text:
         return {}
     
-    monster_data = {}
-    
-    # Extract monster name (usually first line)
-    lines = text.split('\n')
-    if lines:
-        monster_data['name'] = lines[0].strip()
-    
-    # Extract size, type, and alignment
-    size_type_pattern = r"(\w+) (\w+), (\w+(?:\s+\w+)?)"
-    size_type_match = re.search(size_type_pattern, text)
-    if size_type_match:
-        monster_data['size'] = size_type_match.group(1).lower()
-        monster_data['type'] = size_type_match.group(2).lower()
-        monster_data['alignment'] = size_type_match.group(3).lower()
-    
-    # Extract Armor Class
-    ac_pattern = r"Armor Class (\d+)(?: \((.+)\))?"
-    ac_match = re.search(ac_pattern, text)
-    if ac_match:
-        monster_data['armor_class'] = int(ac_match.group(1))
-        if ac_match.group(2):
-            monster_data['armor_type'] = ac_match.group(2)
-    
-    # Extract Hit Points
-    hp_pattern = r"Hit Points (\d+)(?: \((.+)\))?"
-    hp_match = re.search(hp_pattern, text)
-    if hp_match:
-        monster_data['hit_points'] = int(hp_match.group(1))
-        if hp_match.group(2):
-            monster_data['hit_dice'] = hp_match.group(2)
-    
-    # Extract Speed
-    speed_pattern = r"Speed (.+?)(?:\n|$)"
-    speed_match = re.search(speed_pattern, text)
-    if speed_match:
-        monster_data['speed'] = speed_match.group(1).strip()
-    
-    # Extract ability scores
-    ability_pattern = r"(\d+) \(([+-]\d+)\)"
-    abilities = re.findall(ability_pattern, text)
-    
-    if len(abilities) >= 6:
-        ability_names = ['strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma']
-        for i, ability in enumerate(ability_names):
-            if i < len(abilities):
-                monster_data[ability] = int(abilities[i][0])
-    
-    # Extract Skills
-    skills_pattern = r"Skills (.+?)(?:\n|$)"
-    skills_match = re.search(skills_pattern, text)
-    if skills_match:
-        monster_data['skills'] = skills_match.group(1).strip()
-    
-    # Extract Senses
-    senses_pattern = r"Senses (.+?)(?:\n|$)"
-    senses_match = re.search(senses_pattern, text)
-    if senses_match:
-        monster_data['senses'] = senses_match.group(1).strip()
-    
-    # Extract Languages
-    languages_pattern = r"Languages (.+?)(?:\n|$)"
-    languages_match = re.search(languages_pattern, text)
-    if languages_match:
-        monster_data['languages'] = languages_match.group(1).strip()
-    
-    # Extract Challenge Rating
-    cr_pattern = r"Challenge (\d+(?:\/\d+)?)(?: \((.+) XP\))?"
-    cr_match = re.search(cr_pattern, text)
-    if cr_match:
-        monster_data['challenge_rating'] = cr_match.group(1)
-        if cr_match.group(2):
-            monster_data['xp'] = int(cr_match.group(2).replace(',', ''))
-    
-    # Extract Traits/Special Abilities, Actions, and Reactions
-    # These are more complex and often span multiple lines
-    
-    # Extract Traits/Special Abilities
-    traits_start = text.find("TRAITS")
-    actions_start = text.find("ACTIONS")
-    reactions_start = text.find("REACTIONS")
-    
-    if traits_start >= 0 and actions_start >= 0:
-        traits_text = text[traits_start+7:actions_start].strip()
-        monster_data['special_abilities'] = traits_text
-    
-    # Extract Actions
-    if actions_start >= 0:
-        actions_end = reactions_start if reactions_start >= 0 else len(text)
-        actions_text = text[actions_start+8:actions_end].strip()
-        monster_data['actions'] = actions_text
-    
-    # Extract Reactions
-    if reactions_start >= 0:
-        reactions_text = text[reactions_start+10:].strip()
-        monster_data['reactions'] = reactions_text
+    with ocr_stage('parse'):
+        monster_data = parse_statblock(text)
     
     logger.info(f"Extracted monster data: {monster_data}")
-    return monster_data 
\ No newline at end of file
+    return monster_data
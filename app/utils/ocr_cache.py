@@ -0,0 +1,145 @@
+import os
+import json
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from flask import current_app
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class OCRResultCache:
+    """Content-addressed cache of OCR results (raw text and parsed monster data).
+
+    Entries are keyed by a hash of the uploaded image bytes and the OCR pipeline
+    version, kept in a size-bounded in-memory LRU and, optionally, mirrored to JSON
+    files on disk so they survive restarts and are shared between workers.
+    """
+
+    def __init__(self, max_entries=128, disk_dir=None, max_disk_entries=1000):
+        self.max_entries = max_entries
+        self.disk_dir = disk_dir
+        self.max_disk_entries = max_disk_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(image_bytes, pipeline_version):
+        """Return the cache key for an image processed by a given pipeline version."""
+        digest = hashlib.sha256()
+        digest.update(str(pipeline_version).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(image_bytes)
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached ``{'raw_text': ..., 'monster_data': ...}`` entry or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        entry = self._read_disk(key)
+        if entry is not None:
+            self._remember(key, entry)
+        return entry
+
+    def set(self, key, raw_text, monster_data):
+        """Store the OCR text and parsed monster data for a key."""
+        entry = {'raw_text': raw_text, 'monster_data': monster_data}
+        self._remember(key, entry)
+        self._write_disk(key, entry)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _remember(self, key, entry):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.json')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            # Touch the file so disk eviction is least-recently-used as well
+            os.utime(path)
+            return entry
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read OCR cache entry {key}: {str(e)}")
+            return None
+
+    def _write_disk(self, key, entry):
+        if not self.disk_dir:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, path)
+            self._evict_disk()
+        except OSError as e:
+            logger.warning(f"Could not write OCR cache entry {key}: {str(e)}")
+
+    def _evict_disk(self):
+        paths = [
+            os.path.join(self.disk_dir, name)
+            for name in os.listdir(self.disk_dir)
+            if name.endswith('.json')
+        ]
+        if len(paths) <= self.max_disk_entries:
+            return
+
+        paths.sort(key=lambda path: os.path.getmtime(path))
+        for path in paths[:len(paths) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def init_ocr_cache(app):
+    """Create the OCR result cache for an app from its config.
+
+    ``OCR_CACHE_SIZE`` bounds the in-memory LRU (0 disables it) and
+    ``OCR_CACHE_DISK`` enables the on-disk tier under ``OCR_CACHE_DIR``
+    (defaults to ``<instance folder>/ocr_cache``).
+    """
+    disk_dir = None
+    if app.config.get('OCR_CACHE_DISK'):
+        disk_dir = app.config.get('OCR_CACHE_DIR') or os.path.join(app.instance_path, 'ocr_cache')
+
+    app.extensions['ocr_cache'] = OCRResultCache(
+        max_entries=app.config.get('OCR_CACHE_SIZE', 128),
+        disk_dir=disk_dir,
+        max_disk_entries=app.config.get('OCR_CACHE_DISK_SIZE', 1000),
+    )
+
+def get_ocr_cache():
+    """Return the OCR result cache of the current app."""
+    return current_app.extensions['ocr_cache']
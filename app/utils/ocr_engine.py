@@ -0,0 +1,121 @@
+import os
+import re
+import logging
+import threading
+import pytesseract
+from app.utils.metrics import ocr_stage
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Which OCR backend to use: 'auto' prefers a resident libtesseract handle (tesserocr)
+# and falls back to pytesseract, which starts a tesseract subprocess per call.
+OCR_ENGINE = os.environ.get('OCR_ENGINE', 'auto').lower()
+OCR_LANGUAGE = os.environ.get('OCR_LANGUAGE', 'eng')
+
+PSM_PATTERN = re.compile(r"--psm\s+(\d+)")
+VARIABLE_PATTERN = re.compile(r"-c\s+(\w+)=(\S+)")
+
+def parse_tesseract_config(config):
+    """Split a tesseract command line config into its page segmentation mode and variables."""
+    config = config or ''
+    psm_match = PSM_PATTERN.search(config)
+    psm = int(psm_match.group(1)) if psm_match else None
+    variables = dict(VARIABLE_PATTERN.findall(config))
+    return psm, variables
+
+class PytesseractEngine:
+    """Fallback engine: one tesseract subprocess (and temp image file) per call."""
+    name = 'pytesseract'
+
+    def image_to_string(self, image, config=''):
+        return pytesseract.image_to_string(image, lang=OCR_LANGUAGE, config=config)
+
+class TesserocrEngine:
+    """Resident libtesseract engine that OCRs in-memory PIL images.
+
+    The language model is loaded once per thread and config, and the handle is
+    reused for every following call. tesseract handles are not thread safe, so
+    each thread (e.g. each thread of the OCR pool) keeps its own.
+    """
+    name = 'tesserocr'
+
+    def __init__(self, lang=None):
+        import tesserocr
+        self._tesserocr = tesserocr
+        self.lang = lang or OCR_LANGUAGE
+        self._local = threading.local()
+        # Load the model eagerly so a broken install fails here rather than mid-scan
+        self._get_api('')
+
+    def _get_api(self, config):
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+
+        api = apis.get(config)
+        if api is None:
+            psm, variables = parse_tesseract_config(config)
+            api = self._tesserocr.PyTessBaseAPI(lang=self.lang)
+            if psm is not None:
+                api.SetPageSegMode(psm)
+            for name, value in variables.items():
+                api.SetVariable(name, value)
+            apis[config] = api
+        return api
+
+    def image_to_string(self, image, config=''):
+        api = self._get_api(config)
+        api.SetImage(image)
+        try:
+            return api.GetUTF8Text()
+        finally:
+            api.Clear()
+
+ENGINES = {
+    'tesserocr': TesserocrEngine,
+    'pytesseract': PytesseractEngine,
+}
+
+_engine = None
+_engine_pid = None
+_engine_lock = threading.Lock()
+
+def create_ocr_engine(name=None):
+    """Create the configured OCR engine, falling back to pytesseract if it is unavailable."""
+    name = (name or OCR_ENGINE).lower()
+    candidates = ['tesserocr', 'pytesseract'] if name == 'auto' else [name, 'pytesseract']
+
+    for candidate in candidates:
+        engine_class = ENGINES.get(candidate)
+        if engine_class is None:
+            logger.warning(f"Unknown OCR engine '{candidate}'")
+            continue
+        try:
+            engine = engine_class()
+            logger.info(f"Using {engine.name} OCR engine")
+            return engine
+        except Exception as e:
+            logger.info(f"OCR engine '{candidate}' not available: {str(e)}")
+
+    return PytesseractEngine()
+
+def get_ocr_engine():
+    """Return this worker's long-lived OCR engine, creating it on first use.
+
+    The engine is tied to the process that created it so forked workers don't
+    share libtesseract handles with their parent.
+    """
+    global _engine, _engine_pid
+    with _engine_lock:
+        if _engine is None or _engine_pid != os.getpid():
+            _engine = create_ocr_engine()
+            _engine_pid = os.getpid()
+        return _engine
+
+def image_to_string(image, config=''):
+    """OCR a PIL image with the worker's engine."""
+    engine = get_ocr_engine()
+    with ocr_stage('tesseract'):
+        return engine.image_to_string(image, config=config)
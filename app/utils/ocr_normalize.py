@@ -0,0 +1,229 @@
+import io
+import os
+import math
+import logging
+import statistics
+from PIL import Image, ImageOps, ImageChops, ImageStat
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resolution tesseract is tuned for. Images are resampled so that the measured text
+# line height matches body text (TEXT_POINT_SIZE) printed at this resolution.
+OCR_TARGET_DPI = int(os.environ.get('OCR_TARGET_DPI', 300))
+TEXT_POINT_SIZE = 8
+
+# Longest side of the image handed to the preprocessing filters, whatever the estimate says
+OCR_MAX_DIMENSION = int(os.environ.get('OCR_MAX_DIMENSION', 3000))
+
+# Images narrower than this are upscaled when the text height can't be estimated
+OCR_MIN_WIDTH = 800
+
+# Scale factors between these bounds are not worth a resample
+SCALE_TOLERANCE = (0.85, 1.15)
+MIN_SCALE = 0.1
+MAX_SCALE = 3.0
+
+# The crop box and text height are measured on a thumbnail of at most this size
+ANALYSIS_SIZE = 1024
+
+# Parchment (the tan statblock background): hue, saturation and value ranges on
+# PIL's 0-255 HSV scale
+PARCHMENT_HUE = (12, 40)
+PARCHMENT_SATURATION = (18, 110)
+PARCHMENT_VALUE = 170
+
+# Share of parchment pixels, relative to the most parchment-covered column/row, for a
+# column/row to count as part of the box, and the smallest share of the image the
+# box must cover to be cropped to
+PARCHMENT_LINE_FRACTION = 0.5
+PARCHMENT_MIN_AREA = 0.1
+CROP_MARGIN = 0.01
+
+# Text line detection: a row is part of a text line when at least this fraction of
+# its pixels is dark; the profile is taken in vertical strips so two-column
+# statblocks don't merge their lines.
+TEXT_ROW_FRACTION = 0.02
+TEXT_STRIPS = 4
+MIN_TEXT_LINES = 3
+
+def band_mask(band, low, high):
+    """Return a 0/255 mask of the pixels of ``band`` within ``[low, high]``."""
+    table = [255 if low <= value <= high else 0 for value in range(256)]
+    return band.point(table)
+
+def parchment_mask(image):
+    """Return a 0/255 mask of the parchment-colored pixels of an RGB image."""
+    hue, saturation, value = image.convert('HSV').split()
+    mask = ImageChops.multiply(band_mask(hue, *PARCHMENT_HUE), band_mask(saturation, *PARCHMENT_SATURATION))
+    return ImageChops.multiply(mask, band_mask(value, PARCHMENT_VALUE, 255))
+
+def profile(mask, axis):
+    """Return the mean of a 0/255 mask along each column (axis 0) or row (axis 1), as 0.0-1.0."""
+    size = (mask.width, 1) if axis == 0 else (1, mask.height)
+    return [value / 255 for value in mask.resize(size, Image.BOX).tobytes()]
+
+def runs(values, threshold):
+    """Return ``(start, end)`` index pairs of the runs of values at or above threshold."""
+    found = []
+    start = None
+    for index, value in enumerate(values):
+        if value >= threshold and start is None:
+            start = index
+        elif value < threshold and start is not None:
+            found.append((start, index))
+            start = None
+    if start is not None:
+        found.append((start, len(values)))
+    return found
+
+def longest_run(values, fraction):
+    """Return the longest run of values at or above ``fraction`` of the peak value."""
+    peak = max(values, default=0)
+    if not peak:
+        return None
+    return max(runs(values, peak * fraction), key=lambda run: run[1] - run[0])
+
+def find_parchment_box(thumbnail):
+    """Find the parchment statblock box in an RGB thumbnail.
+
+    Returns ``(left, top, right, bottom)`` in thumbnail pixels, or None when there
+    is no box (e.g. a plain screenshot) or the box is (nearly) the whole image.
+    """
+    mask = parchment_mask(thumbnail)
+
+    columns = longest_run(profile(mask, 0), PARCHMENT_LINE_FRACTION)
+    if columns is None:
+        return None
+    left, right = columns
+
+    rows = longest_run(profile(mask.crop((left, 0, right, mask.height)), 1), PARCHMENT_LINE_FRACTION)
+    if rows is None:
+        return None
+    top, bottom = rows
+
+    area = (right - left) * (bottom - top) / (thumbnail.width * thumbnail.height)
+    if area < PARCHMENT_MIN_AREA or area > 0.95:
+        return None
+    return left, top, right, bottom
+
+def estimate_text_height(gray):
+    """Estimate the height in pixels of the text lines of a grayscale image.
+
+    Dark pixels (well below the median brightness) are projected onto rows, per
+    vertical strip, and the median height of the resulting runs is returned.
+    Returns None when fewer than ``MIN_TEXT_LINES`` lines are found.
+    """
+    median = ImageStat.Stat(gray).median[0]
+    text = band_mask(gray, 0, int(median * 0.6))
+
+    heights = []
+    strip_width = max(1, gray.width // TEXT_STRIPS)
+    for left in range(0, gray.width - strip_width + 1, strip_width):
+        strip = text.crop((left, 0, left + strip_width, gray.height))
+        heights.extend(end - start for start, end in runs(profile(strip, 1), TEXT_ROW_FRACTION))
+
+    # Ignore single-pixel specks and tall blocks (images, borders)
+    heights = [height for height in heights if 2 <= height <= gray.height / 4]
+    if len(heights) < MIN_TEXT_LINES:
+        return None
+    return statistics.median(heights)
+
+def target_text_height():
+    """Line height in pixels of TEXT_POINT_SIZE text at OCR_TARGET_DPI."""
+    return OCR_TARGET_DPI * TEXT_POINT_SIZE / 72
+
+def open_image(image_bytes):
+    """Open uploaded image bytes as an upright RGB image.
+
+    Very large JPEGs are decoded at a reduced scale (never below
+    ``OCR_MAX_DIMENSION``), which is much faster than decoding at full size.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    longest = max(image.size)
+    if image.format == 'JPEG' and longest > 2 * OCR_MAX_DIMENSION:
+        ratio = OCR_MAX_DIMENSION / longest
+        image.draft('RGB', (math.ceil(image.width * ratio), math.ceil(image.height * ratio)))
+
+    # Phone photos are often stored sideways with an EXIF rotation
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+def analysis_size(size):
+    """Return the thumbnail size used to measure an image of ``size``."""
+    ratio = min(1.0, ANALYSIS_SIZE / max(size))
+    return max(1, round(size[0] * ratio)), max(1, round(size[1] * ratio))
+
+def measure_image(thumbnail, full_size):
+    """Work out how to normalize an image from its RGB thumbnail.
+
+    Returns ``(crop_box, scale)``: the statblock box in full-size pixels (None to
+    keep the whole image) and the factor to resample the cropped image by (1.0 to
+    leave it alone).
+    """
+    width, height = full_size
+    thumbnail_scale = width / thumbnail.width
+
+    crop_box = None
+    box = find_parchment_box(thumbnail)
+    if box is not None:
+        margin = int(max(thumbnail.size) * CROP_MARGIN)
+        left, top, right, bottom = box
+        box = (max(0, left - margin), max(0, top - margin),
+               min(thumbnail.width, right + margin), min(thumbnail.height, bottom + margin))
+        thumbnail = thumbnail.crop(box)
+        crop_box = tuple(round(value * thumbnail_scale) for value in box)
+        width, height = crop_box[2] - crop_box[0], crop_box[3] - crop_box[1]
+
+    text_height = estimate_text_height(thumbnail.convert('L'))
+    if text_height is not None:
+        text_height *= thumbnail_scale
+        scale = target_text_height() / text_height
+        logger.info(f"Estimated text height: {text_height:.1f}px")
+    elif width < OCR_MIN_WIDTH:
+        scale = OCR_MIN_WIDTH / width
+    else:
+        scale = 1.0
+
+    scale = min(max(scale, MIN_SCALE), MAX_SCALE, OCR_MAX_DIMENSION / max(width, height))
+    if SCALE_TOLERANCE[0] <= scale <= SCALE_TOLERANCE[1]:
+        scale = 1.0
+    return crop_box, scale
+
+def measure_array(thumbnail, full_size):
+    """``measure_image`` for a thumbnail given as an RGB NumPy array (the OpenCV pipeline)."""
+    return measure_image(Image.fromarray(thumbnail), full_size)
+
+def normalize_image(image, mode='RGB'):
+    """Crop an RGB image to its statblock and resample it to the OCR target resolution.
+
+    The parchment box and the text height are measured on a small thumbnail, so
+    this is cheap compared to the filters that run on the result. The result is
+    converted to ``mode`` before it is resampled, so asking for 'L' resamples a
+    third of the data.
+    """
+    original_size = image.size
+    # Image.reduce is a plain box average, several times faster than resize on big photos
+    thumbnail = image.reduce(max(1, math.ceil(max(image.size) / ANALYSIS_SIZE)))
+
+    crop_box, scale = measure_image(thumbnail, image.size)
+    if crop_box is not None:
+        image = image.crop(crop_box)
+    if image.mode != mode:
+        image = image.convert(mode)
+    if scale != 1.0:
+        new_size = (max(1, round(image.width * scale)), max(1, round(image.height * scale)))
+        # Bicubic is plenty when shrinking text and about twice as fast as Lanczos;
+        # reducing_gap shrinks by whole factors first on big downscales
+        resample = Image.LANCZOS if scale > 1 else Image.BICUBIC
+        image = image.resize(new_size, resample, reducing_gap=3.0)
+
+    logger.info(f"Normalized image from {original_size} to {image.size}")
+    return image
+
+def load_normalized_image(image_bytes, mode='RGB'):
+    """Open uploaded image bytes and normalize them for OCR."""
+    return normalize_image(open_image(image_bytes), mode=mode)
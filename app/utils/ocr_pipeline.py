@@ -0,0 +1,62 @@
+import os
+import logging
+import importlib
+import threading
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Which OCR pipeline to use: 'auto' prefers the OpenCV preprocessing (app.utils.ocr)
+# and falls back to the PIL-only one (app.utils.simple_ocr) when cv2 won't import.
+OCR_PIPELINE = os.environ.get('OCR_PIPELINE', 'auto').lower()
+
+# Pipeline name -> module providing extract_text_from_image, parse_monster_data
+# and OCR_PIPELINE_VERSION. Modules are only imported on first use, so workers
+# that never scan a statblock don't load OpenCV, numpy or tesseract bindings.
+PIPELINES = {
+    'opencv': 'app.utils.ocr',
+    'simple': 'app.utils.simple_ocr',
+}
+
+_pipeline = None
+_pipeline_lock = threading.Lock()
+
+def load_ocr_pipeline(name=None):
+    """Import the configured OCR pipeline module, falling back to the simple one if it won't import."""
+    name = (name or OCR_PIPELINE).lower()
+    candidates = ['opencv', 'simple'] if name == 'auto' else [name, 'simple']
+
+    for candidate in candidates:
+        module_name = PIPELINES.get(candidate)
+        if module_name is None:
+            logger.warning(f"Unknown OCR pipeline '{candidate}'")
+            continue
+        try:
+            module = importlib.import_module(module_name)
+            logger.info(f"Using {candidate} OCR pipeline")
+            return module
+        except ImportError as e:
+            logger.info(f"OCR pipeline '{candidate}' not available: {str(e)}")
+
+    return importlib.import_module(PIPELINES['simple'])
+
+def get_ocr_pipeline():
+    """Return this process's OCR pipeline module, importing it on first use."""
+    global _pipeline
+    with _pipeline_lock:
+        if _pipeline is None:
+            _pipeline = load_ocr_pipeline()
+        return _pipeline
+
+def extract_text_from_image(image_bytes):
+    """OCR statblock image bytes with the configured pipeline."""
+    return get_ocr_pipeline().extract_text_from_image(image_bytes)
+
+def parse_monster_data(text):
+    """Parse OCR text into monster fields with the configured pipeline."""
+    return get_ocr_pipeline().parse_monster_data(text)
+
+def ocr_pipeline_version():
+    """Return the version of the configured pipeline, part of the OCR cache keys."""
+    return get_ocr_pipeline().OCR_PIPELINE_VERSION
@@ -0,0 +1,142 @@
+import json
+import base64
+from flask import current_app, request
+from sqlalchemy import tuple_
+from sqlalchemy.orm import load_only
+from werkzeug.exceptions import BadRequest
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.utils.challenge import challenge_rating_value
+
+# Columns the list pages show; the large text columns (actions, descriptions...)
+# are left out of the SELECT and only loaded if something touches them
+MONSTER_LIST_COLUMNS = (
+    Monster.id, Monster.name, Monster.size, Monster.type, Monster.alignment, Monster.challenge_rating,
+    Monster.cr_value, Monster.xp, Monster.campaign_id, Monster.encounter_id,
+)
+NPC_LIST_COLUMNS = (
+    NPC.id, NPC.name, NPC.role, NPC.attitude, NPC.places_to_find, NPC.description, NPC.campaign_id,
+)
+
+# Sort orders of the lists; the id makes every key unique so cursors are stable
+MONSTER_LIST_ORDER = (Monster.name, Monster.id)
+NPC_LIST_ORDER = (NPC.name, NPC.id)
+
+# Orders the monster lists can be sorted in with ``?sort=``
+MONSTER_LIST_SORTS = {
+    'name': MONSTER_LIST_ORDER,
+    'cr': (Monster.cr_sort, Monster.name, Monster.id),
+}
+class Page:
+    """One page of a keyset-paginated list.
+
+    ``next_cursor`` / ``prev_cursor`` are None on the last / first page.
+    """
+
+    def __init__(self, items, per_page, next_cursor=None, prev_cursor=None):
+        self.items = items
+        self.per_page = per_page
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def as_dict(self):
+        """Return the paging part of a JSON response."""
+        return {'per_page': self.per_page, 'next_cursor': self.next_cursor, 'prev_cursor': self.prev_cursor}
+
+def encode_cursor(values):
+    """Return an opaque, URL-safe cursor for a row's sort key."""
+    data = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(data).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor, size):
+    """Return the sort key of a cursor made by ``encode_cursor``, for a key of ``size`` columns."""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except ValueError:
+        raise BadRequest('Invalid page cursor.')
+    if not isinstance(values, list) or len(values) != size:
+        raise BadRequest('Invalid page cursor.')
+    # Only what row_cursor puts in a cursor; anything else would fail in the database
+    if not all(value is None or isinstance(value, (str, int, float)) for value in values):
+        raise BadRequest('Invalid page cursor.')
+    return values
+
+def row_cursor(row, order_by):
+    return encode_cursor([getattr(row, column.key) for column in order_by])
+
+def paginate(query, order_by, per_page, after=None, before=None):
+    """Return the ``per_page`` rows of ``query`` after (or before) a cursor, in ``order_by`` order.
+
+    Pages are found by comparing the sort key with the cursor's, so a page costs
+    the same wherever it is in the list and rows added or deleted elsewhere don't
+    shift it, unlike OFFSET paging. The key's first column is bounded on its own
+    as well, which lets SQLite seek in an index on an expression (cr_sort) too.
+    """
+    key = tuple_(*order_by)
+    if before is not None:
+        cursor = decode_cursor(before, len(order_by))
+        query = query.filter(order_by[0] <= cursor[0], key < tuple_(*cursor))
+        rows = query.order_by(*[column.desc() for column in order_by]).limit(per_page + 1).all()
+        items = rows[:per_page][::-1]
+        return Page(
+            items, per_page,
+            next_cursor=row_cursor(items[-1], order_by) if items else None,
+            prev_cursor=row_cursor(items[0], order_by) if len(rows) > per_page else None,
+        )
+
+    if after is not None:
+        cursor = decode_cursor(after, len(order_by))
+        query = query.filter(order_by[0] >= cursor[0], key > tuple_(*cursor))
+    rows = query.order_by(*order_by).limit(per_page + 1).all()
+    items = rows[:per_page]
+    return Page(
+        items, per_page,
+        next_cursor=row_cursor(items[-1], order_by) if len(rows) > per_page else None,
+        prev_cursor=row_cursor(items[0], order_by) if after is not None and items else None,
+    )
+
+def page_size():
+    """Return the page size asked for with ``?per_page=``, within ``LIST_MAX_PAGE_SIZE``."""
+    default = current_app.config.get('LIST_PAGE_SIZE', 50)
+    per_page = request.args.get('per_page', default, type=int)
+    return max(1, min(per_page, current_app.config.get('LIST_MAX_PAGE_SIZE', 200)))
+
+def request_page(query, order_by):
+    """Paginate a list query with the current request's ``after``, ``before`` and ``per_page`` arguments."""
+    return paginate(query, order_by, page_size(), after=request.args.get('after'), before=request.args.get('before'))
+
+def cr_argument(name):
+    """Return the challenge rating passed as ``?name=`` ('1/4', '0.25', '5'...) as a number, or None."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    cr = challenge_rating_value(value)
+    if cr is None:
+        raise BadRequest(f'Invalid {name}.')
+    return cr
+
+def monster_list_order():
+    """Return the sort order asked for with ``?sort=`` (``name`` by default)."""
+    sort = request.args.get('sort') or 'name'
+    if sort not in MONSTER_LIST_SORTS:
+        raise BadRequest(f"Unknown sort '{sort}', expected one of {', '.join(MONSTER_LIST_SORTS)}.")
+    return MONSTER_LIST_SORTS[sort]
+
+def campaign_monsters_page(campaign_id):
+    """Return the requested page of a campaign's monsters that aren't in an encounter.
+
+    ``cr_min`` and ``cr_max`` keep the monsters within a challenge rating range
+    (leaving out those without one) and ``sort=cr`` lists them by challenge rating.
+    """
+    query = Monster.query.filter_by(campaign_id=campaign_id, encounter_id=None).options(load_only(*MONSTER_LIST_COLUMNS))
+    cr_min, cr_max = cr_argument('cr_min'), cr_argument('cr_max')
+    if cr_min is not None:
+        query = query.filter(Monster.cr_value >= cr_min)
+    if cr_max is not None:
+        query = query.filter(Monster.cr_value <= cr_max)
+    return request_page(query, monster_list_order())
+
+def campaign_npcs_page(campaign_id):
+    """Return the requested page of a campaign's NPCs."""
+    query = NPC.query.filter_by(campaign_id=campaign_id).options(load_only(*NPC_LIST_COLUMNS))
+    return request_page(query, NPC_LIST_ORDER)
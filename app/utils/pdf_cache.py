@@ -0,0 +1,154 @@
+import os
+import hashlib
+import logging
+import threading
+from flask import current_app
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PDF_TEMPLATE = 'monsters/pdf_template.html'
+
+# Templates whose source makes up a statblock PDF (the page and its includes)
+PDF_TEMPLATE_SOURCES = (PDF_TEMPLATE, 'monsters/_pdf_styles.html', 'monsters/_statblock.html')
+
+# Bump when the PDF output changes in a way the template source doesn't show
+# (e.g. new page options), so cached PDFs and ETags are invalidated
+PDF_TEMPLATE_VERSION = 1
+
+class PDFCache:
+    """Cache of rendered statblock PDFs on disk.
+
+    Entries are keyed by the monster id, its ``updated_at`` timestamp and the
+    template version, so editing a monster or changing the template gives a new
+    key and stale PDFs are simply never read again. The key doubles as the ETag
+    of the download. Files are evicted least-recently-used once the directory
+    grows past ``max_bytes``.
+    """
+
+    def __init__(self, disk_dir=None, max_bytes=256 * 1024 * 1024):
+        self.disk_dir = disk_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    @property
+    def enabled(self):
+        return bool(self.disk_dir) and self.max_bytes > 0
+
+    @staticmethod
+    def make_key(monster_id, updated_at, template_version):
+        """Return the cache key (and ETag) for a monster's PDF."""
+        updated = updated_at.isoformat() if updated_at is not None else ''
+        digest = hashlib.sha256(f'{monster_id}\0{updated}\0{template_version}'.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, key):
+        """Return the cached PDF bytes for a key, or None."""
+        if not self.enabled:
+            return None
+
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                pdf = f.read()
+            # Touch the file so eviction is least-recently-used
+            os.utime(path)
+            return pdf
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            logger.warning(f"Could not read PDF cache entry {key}: {str(e)}")
+            return None
+
+    def set(self, key, pdf):
+        """Store rendered PDF bytes for a key."""
+        if not self.enabled or len(pdf) > self.max_bytes:
+            return
+
+        path = self._disk_path(key)
+        tmp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(pdf)
+            os.replace(tmp_path, path)
+            self._evict()
+        except OSError as e:
+            logger.warning(f"Could not write PDF cache entry {key}: {str(e)}")
+
+    def size(self):
+        """Return the total size in bytes of the cached PDFs."""
+        return sum(size for _, _, size in self._entries())
+
+    def _disk_path(self, key):
+        return os.path.join(self.disk_dir, f'{key}.pdf')
+
+    def _entries(self):
+        entries = []
+        for name in os.listdir(self.disk_dir):
+            if not name.endswith('.pdf'):
+                continue
+            path = os.path.join(self.disk_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, path, stat.st_size))
+        return entries
+
+    def _evict(self):
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, _, size in entries)
+            if total <= self.max_bytes:
+                return
+
+            entries.sort()
+            for _, path, size in entries:
+                if total <= self.max_bytes:
+                    break
+                try:
+                    os.remove(path)
+                    total -= size
+                except OSError:
+                    pass
+
+def pdf_template_version(app):
+    """Return a version string for the statblock PDF output of an app.
+
+    Combines PDF_TEMPLATE_VERSION, the renderer backend and a hash of the
+    template sources, so editing the template invalidates cached PDFs without a
+    manual version bump.
+    """
+    digest = hashlib.sha256()
+    for name in PDF_TEMPLATE_SOURCES:
+        source, _, _ = app.jinja_env.loader.get_source(app.jinja_env, name)
+        digest.update(source.encode('utf-8'))
+    template_hash = digest.hexdigest()[:16]
+    return f"{PDF_TEMPLATE_VERSION}-{app.config.get('PDF_BACKEND', 'wkhtmltopdf')}-{template_hash}"
+
+def init_pdf_cache(app):
+    """Create the rendered PDF cache for an app from its config.
+
+    PDFs are cached under ``PDF_CACHE_DIR`` (unset disables the cache, ETags
+    still work) up to ``PDF_CACHE_MAX_BYTES`` in total.
+    """
+    app.extensions['pdf_cache'] = PDFCache(
+        disk_dir=app.config.get('PDF_CACHE_DIR'),
+        max_bytes=app.config.get('PDF_CACHE_MAX_BYTES', 256 * 1024 * 1024),
+    )
+
+def get_pdf_cache():
+    """Return the rendered PDF cache of the current app."""
+    return current_app.extensions['pdf_cache']
+
+def monster_pdf_key(monster):
+    """Return the cache key (and ETag) of a monster's statblock PDF in the current app."""
+    version = current_app.extensions.get('pdf_template_version')
+    if version is None:
+        # The template doesn't change while the app runs, so hash it once
+        version = current_app.extensions['pdf_template_version'] = pdf_template_version(current_app)
+    return PDFCache.make_key(monster.id, monster.updated_at, version)
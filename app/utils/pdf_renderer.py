@@ -0,0 +1,277 @@
+import os
+import time
+import shutil
+import logging
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, render_template
+from app.utils.metrics import change_queue_depth, observe_pdf_render
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Page setup shared by every statblock PDF
+PDF_OPTIONS = {
+    'page-size': 'Letter',
+    'margin-top': '0.5in',
+    'margin-right': '0.5in',
+    'margin-bottom': '0.5in',
+    'margin-left': '0.5in',
+    'encoding': 'UTF-8',
+    'no-outline': None,
+    'enable-local-file-access': None
+}
+
+class PDFRenderError(Exception):
+    """Raised when a PDF can't be rendered."""
+
+class PDFQueueFullError(PDFRenderError):
+    """Raised when every renderer is busy and the wait queue is full."""
+
+class PDFRenderTimeoutError(PDFRenderError):
+    """Raised when a render (or the wait for a free renderer) takes too long."""
+
+def find_wkhtmltopdf(path=None):
+    """Return the wkhtmltopdf executable to use: ``path``, ``$WKHTMLTOPDF_PATH`` or the one on the PATH."""
+    path = path or os.environ.get('WKHTMLTOPDF_PATH') or shutil.which('wkhtmltopdf')
+    if not path:
+        raise PDFRenderError('wkhtmltopdf executable not found. Set WKHTMLTOPDF_PATH to its location '
+                             "or use PDF_BACKEND='native'.")
+    return path
+
+class WkhtmltopdfBackend:
+    """Renders HTML with wkhtmltopdf, piping the page in and the PDF out (no temp files)."""
+    name = 'wkhtmltopdf'
+    document_type = 'html'
+
+    def __init__(self, path=None):
+        import pdfkit
+        self._pdfkit = pdfkit
+        self.configuration = pdfkit.configuration(wkhtmltopdf=find_wkhtmltopdf(path))
+
+    def render(self, html, options=None, timeout=None):
+        kit = self._pdfkit.PDFKit(html, 'string', options=options or PDF_OPTIONS, configuration=self.configuration)
+        try:
+            # With no output path pdfkit's command writes the PDF to stdout
+            result = subprocess.run(kit.command(), input=html.encode('utf-8'), capture_output=True, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # subprocess.run has already killed wkhtmltopdf
+            raise PDFRenderTimeoutError(f'wkhtmltopdf did not finish within {timeout} seconds')
+
+        # wkhtmltopdf exits with 1 on some recoverable warnings but still writes the PDF
+        if result.returncode != 0 and not result.stdout.startswith(b'%PDF'):
+            message = result.stderr.decode('utf-8', errors='replace').strip()
+            raise PDFRenderError(f'wkhtmltopdf failed with exit code {result.returncode}: {message}')
+        return result.stdout
+
+class NativePDFBackend:
+    """Lays statblocks out straight into PDF in Python (fpdf2), without a browser engine.
+
+    Takes a ``statblock_document`` rather than HTML. Renders run in the worker
+    thread, so the timeout only bounds how long the caller waits.
+    """
+    name = 'native'
+    document_type = 'statblocks'
+
+    def __init__(self, **options):
+        try:
+            from app.utils.statblock_pdf import render_statblock_pdf
+        except ImportError:
+            raise PDFRenderError('The native PDF backend requires fpdf2 (pip install fpdf2).')
+        self._render = render_statblock_pdf
+
+    def render(self, document, options=None, timeout=None):
+        try:
+            return self._render(document)
+        except ImportError:
+            raise PDFRenderError('The native PDF backend requires fpdf2 (pip install fpdf2).')
+
+PDF_BACKENDS = {
+    'wkhtmltopdf': WkhtmltopdfBackend,
+    'native': NativePDFBackend,
+}
+
+class RenderMetrics:
+    """Thread-safe counters describing a PDFRenderer's work."""
+
+    def __init__(self, backend=None):
+        self.backend = backend
+        self._lock = threading.Lock()
+        self.rendered = 0
+        self.failed = 0
+        self.timed_out = 0
+        self.rejected = 0
+        self.queued = 0
+        self.in_flight = 0
+        self.render_seconds_total = 0.0
+        self.render_seconds_max = 0.0
+        self.queue_seconds_total = 0.0
+
+    def add(self, **counts):
+        with self._lock:
+            for name, value in counts.items():
+                setattr(self, name, getattr(self, name) + value)
+        if counts.get('queued'):
+            change_queue_depth('pdf_render', counts['queued'])
+
+    def record_render(self, queue_seconds, render_seconds):
+        with self._lock:
+            self.rendered += 1
+            self.queue_seconds_total += queue_seconds
+            self.render_seconds_total += render_seconds
+            self.render_seconds_max = max(self.render_seconds_max, render_seconds)
+        observe_pdf_render(self.backend, render_seconds)
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                'rendered': self.rendered,
+                'failed': self.failed,
+                'timed_out': self.timed_out,
+                'rejected': self.rejected,
+                'queued': self.queued,
+                'in_flight': self.in_flight,
+                'render_seconds_total': round(self.render_seconds_total, 6),
+                'render_seconds_max': round(self.render_seconds_max, 6),
+                'render_seconds_avg': round(self.render_seconds_total / self.rendered, 6) if self.rendered else 0.0,
+                'queue_seconds_total': round(self.queue_seconds_total, 6),
+            }
+
+class PDFRenderer:
+    """Bounded pool of PDF renderers.
+
+    ``max_workers`` renders run at the same time and at most ``max_queue`` more
+    wait for a free renderer; further requests are rejected straight away with
+    PDFQueueFullError instead of piling up. Each worker thread keeps its own
+    backend instance, created on first use and reused for every later render.
+    A render is limited to ``timeout`` seconds and the wait for a free renderer
+    to ``queue_timeout`` seconds.
+    """
+
+    def __init__(self, backend='wkhtmltopdf', max_workers=2, max_queue=8, timeout=30, queue_timeout=30,
+                 backend_options=None):
+        self.backend_name = backend
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.queue_timeout = queue_timeout
+        self.backend_options = backend_options or {}
+        self.metrics = RenderMetrics(backend)
+
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+        self._local = threading.local()
+        self._executor = None
+        self._executor_pid = None
+        self._executor_lock = threading.Lock()
+
+    @property
+    def document_type(self):
+        """What the backend renders from: 'html' or a 'statblocks' document."""
+        return getattr(PDF_BACKENDS.get(self.backend_name), 'document_type', 'html')
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='pdf-render')
+                self._executor_pid = os.getpid()
+            return self._executor
+
+    def _get_backend(self):
+        backend = getattr(self._local, 'backend', None)
+        if backend is None:
+            backend_class = PDF_BACKENDS.get(self.backend_name)
+            if backend_class is None:
+                raise PDFRenderError(f"Unknown PDF backend '{self.backend_name}'")
+            backend = self._local.backend = backend_class(**self.backend_options)
+        return backend
+
+    def _render(self, html, options, timeout, submitted_at):
+        started_at = time.monotonic()
+        self.metrics.add(queued=-1, in_flight=1)
+        try:
+            pdf = self._get_backend().render(html, options=options, timeout=timeout)
+        finally:
+            self.metrics.add(in_flight=-1)
+        self.metrics.record_render(started_at - submitted_at, time.monotonic() - started_at)
+        return pdf
+
+    def render(self, html, options=None, timeout=None):
+        """Render HTML (or the backend's document type) to PDF bytes on the pool.
+
+        ``timeout`` overrides the pool's render timeout, for documents known to be
+        larger than a single statblock.
+        """
+        timeout = timeout or self.timeout
+        if not self._slots.acquire(blocking=False):
+            self.metrics.add(rejected=1)
+            raise PDFQueueFullError('Too many PDF exports in progress, please try again shortly.')
+
+        try:
+            self.metrics.add(queued=1)
+            future = self._get_executor().submit(self._render, html, options, timeout, time.monotonic())
+            future.add_done_callback(lambda _: self._slots.release())
+        except Exception:
+            self.metrics.add(queued=-1)
+            self._slots.release()
+            raise
+
+        try:
+            return future.result(timeout=self.queue_timeout + timeout)
+        except FutureTimeoutError:
+            if future.cancel():
+                # Never started, so _render won't take it off the queue count
+                self.metrics.add(queued=-1)
+            self.metrics.add(timed_out=1)
+            raise PDFRenderTimeoutError('Timed out waiting for the PDF renderer.')
+        except PDFRenderTimeoutError:
+            self.metrics.add(timed_out=1)
+            raise
+        except Exception as e:
+            self.metrics.add(failed=1)
+            logger.error(f"Error rendering PDF: {str(e)}")
+            raise
+
+def init_pdf_renderer(app):
+    """Create the app's PDF renderer pool from its config.
+
+    ``PDF_BACKEND`` picks the renderer, ``PDF_RENDER_WORKERS`` and
+    ``PDF_RENDER_QUEUE`` bound how many renders run and wait, and
+    ``PDF_RENDER_TIMEOUT`` / ``PDF_QUEUE_TIMEOUT`` limit how long they take.
+    """
+    backend_options = {}
+    if app.config.get('WKHTMLTOPDF_PATH'):
+        backend_options['path'] = app.config['WKHTMLTOPDF_PATH']
+
+    app.extensions['pdf_renderer'] = PDFRenderer(
+        backend=app.config.get('PDF_BACKEND', 'wkhtmltopdf'),
+        max_workers=app.config.get('PDF_RENDER_WORKERS', 2),
+        max_queue=app.config.get('PDF_RENDER_QUEUE', 8),
+        timeout=app.config.get('PDF_RENDER_TIMEOUT', 30),
+        queue_timeout=app.config.get('PDF_QUEUE_TIMEOUT', 30),
+        backend_options=backend_options,
+    )
+
+def get_pdf_renderer():
+    """Return the PDF renderer pool of the current app."""
+    return current_app.extensions['pdf_renderer']
+
+def render_pdf(html, options=None, timeout=None):
+    """Render HTML to PDF bytes with the current app's renderer pool."""
+    return get_pdf_renderer().render(html, options=options, timeout=timeout)
+
+def render_statblocks(campaign, monsters, template, title=None, timeout=None):
+    """Render monsters' statblocks to PDF bytes with the current app's backend.
+
+    HTML backends get ``template`` rendered with ``monster`` (the first monster),
+    ``monsters`` and ``title``; the native backend lays the monster fields out
+    itself.
+    """
+    renderer = get_pdf_renderer()
+    if renderer.document_type == 'statblocks':
+        from app.utils.statblock_pdf import statblock_document
+        document = statblock_document(campaign, monsters, title=title)
+    else:
+        document = render_template(template, campaign=campaign, monster=monsters[0], monsters=monsters, title=title)
+    return renderer.render(document, timeout=timeout)
@@ -0,0 +1,202 @@
+import time
+import logging
+import threading
+from flask import current_app, g, has_request_context, request
+from flask import before_render_template, template_rendered
+from sqlalchemy import event
+from app import db
+from app.utils.metrics import observe_db_query, observe_request
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Longest SQL statement text kept for the slowest query of an endpoint
+MAX_STATEMENT_LENGTH = 500
+
+class RequestTimer:
+    """Timings of the request being handled, kept on ``g.perf``."""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.slowest_sql_seconds = 0.0
+        self.slowest_sql = None
+        self.render_seconds = 0.0
+        self._render_started = []
+
+    def record_query(self, statement, seconds):
+        self.queries += 1
+        self.sql_seconds += seconds
+        if seconds >= self.slowest_sql_seconds:
+            self.slowest_sql_seconds = seconds
+            self.slowest_sql = statement[:MAX_STATEMENT_LENGTH]
+
+    def start_render(self):
+        self._render_started.append(time.perf_counter())
+
+    def end_render(self):
+        if self._render_started:
+            started_at = self._render_started.pop()
+            # Only count the outermost template, included ones are part of it
+            if not self._render_started:
+                self.render_seconds += time.perf_counter() - started_at
+
+    @property
+    def elapsed(self):
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self, total_seconds):
+        """Return the ``Server-Timing`` header value (durations in milliseconds)."""
+        return ', '.join([
+            f'db;dur={self.sql_seconds * 1000:.1f};desc="{self.queries} queries"',
+            f'render;dur={self.render_seconds * 1000:.1f}',
+            f'total;dur={total_seconds * 1000:.1f}',
+        ])
+
+class EndpointStats:
+    """Running totals for one endpoint."""
+
+    def __init__(self, endpoint):
+        self.endpoint = endpoint
+        self.requests = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.queries = 0
+        self.max_queries = 0
+        self.sql_seconds = 0.0
+        self.render_seconds = 0.0
+        self.slowest_sql_seconds = 0.0
+        self.slowest_sql = None
+
+    def add(self, timer, total_seconds):
+        self.requests += 1
+        self.total_seconds += total_seconds
+        self.max_seconds = max(self.max_seconds, total_seconds)
+        self.queries += timer.queries
+        self.max_queries = max(self.max_queries, timer.queries)
+        self.sql_seconds += timer.sql_seconds
+        self.render_seconds += timer.render_seconds
+        if timer.slowest_sql is not None and timer.slowest_sql_seconds >= self.slowest_sql_seconds:
+            self.slowest_sql_seconds = timer.slowest_sql_seconds
+            self.slowest_sql = timer.slowest_sql
+
+    def as_dict(self):
+        requests = self.requests or 1
+        return {
+            'endpoint': self.endpoint,
+            'requests': self.requests,
+            'avg_ms': round(self.total_seconds / requests * 1000, 2),
+            'max_ms': round(self.max_seconds * 1000, 2),
+            'avg_queries': round(self.queries / requests, 2),
+            'max_queries': self.max_queries,
+            'avg_sql_ms': round(self.sql_seconds / requests * 1000, 2),
+            'avg_render_ms': round(self.render_seconds / requests * 1000, 2),
+            'slowest_sql_ms': round(self.slowest_sql_seconds * 1000, 2),
+            'slowest_sql': self.slowest_sql,
+        }
+
+class PerfStats:
+    """Per-endpoint request, SQL and render timings of this worker process."""
+
+    def __init__(self):
+        self._endpoints = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, timer, total_seconds):
+        with self._lock:
+            stats = self._endpoints.get(endpoint)
+            if stats is None:
+                stats = self._endpoints[endpoint] = EndpointStats(endpoint)
+            stats.add(timer, total_seconds)
+
+    def snapshot(self):
+        """Return the endpoint totals as dicts, the most time-consuming first."""
+        with self._lock:
+            endpoints = sorted(self._endpoints.values(), key=lambda stats: stats.total_seconds, reverse=True)
+            return [stats.as_dict() for stats in endpoints]
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+def current_timer():
+    """Return the timer of the request being handled, or None outside requests."""
+    if not has_request_context():
+        return None
+    return g.get('perf')
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._perf_started_at = time.perf_counter()
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started_at = getattr(context, '_perf_started_at', None)
+    if started_at is None:
+        return
+    seconds = time.perf_counter() - started_at
+    observe_db_query(seconds)
+    timer = current_timer()
+    if timer is not None:
+        timer.record_query(statement, seconds)
+
+def _before_render_template(sender, template, context, **extra):
+    timer = current_timer()
+    if timer is not None:
+        timer.start_render()
+
+def _template_rendered(sender, template, context, **extra):
+    timer = current_timer()
+    if timer is not None:
+        timer.end_render()
+
+def _start_request():
+    g.perf = RequestTimer()
+
+def _finish_request(response):
+    timer = g.pop('perf', None)
+    if timer is None:
+        return response
+
+    total_seconds = timer.elapsed
+    endpoint = request.endpoint or 'unmatched'
+    current_app.extensions['perf_stats'].record(endpoint, timer, total_seconds)
+    observe_request(request.blueprint, endpoint, request.method, total_seconds)
+
+    if current_app.config.get('PERF_SERVER_TIMING', True):
+        response.headers['Server-Timing'] = timer.server_timing(total_seconds)
+
+    slow_ms = current_app.config.get('PERF_SLOW_REQUEST_MS')
+    if slow_ms is not None and total_seconds * 1000 >= slow_ms:
+        logger.warning(
+            f"Slow request {request.method} {request.path} ({endpoint}): {total_seconds * 1000:.1f}ms, "
+            f"{timer.queries} queries in {timer.sql_seconds * 1000:.1f}ms, "
+            f"render {timer.render_seconds * 1000:.1f}ms, "
+            f"slowest query {timer.slowest_sql_seconds * 1000:.1f}ms: {timer.slowest_sql}"
+        )
+    return response
+
+def init_perf(app):
+    """Instrument an app's requests: query count, SQL time and render time.
+
+    Every response gets a ``Server-Timing`` header (``PERF_SERVER_TIMING``),
+    per-endpoint totals are kept for the ``/debug/perf`` page and requests slower
+    than ``PERF_SLOW_REQUEST_MS`` are logged with their slowest query.
+    """
+    app.extensions['perf_stats'] = PerfStats()
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if not event.contains(engine, 'before_cursor_execute', _before_cursor_execute):
+                event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+
+    before_render_template.connect(_before_render_template, app)
+    template_rendered.connect(_template_rendered, app)
+    app.before_request(_start_request)
+    app.after_request(_finish_request)
+
+def get_perf_stats():
+    """Return the per-endpoint timings of the current app."""
+    return current_app.extensions['perf_stats']
@@ -0,0 +1,164 @@
+import json
+import uuid
+import logging
+import os
+import socket
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from app import db
+from app.models.scan_job import ScanJob
+from app.utils.metrics import change_queue_depth
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Running jobs are given up on after this many seconds (SCAN_JOB_STALE_AFTER)
+SCAN_JOB_STALE_AFTER = 240
+
+HOSTNAME = socket.gethostname()
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def get_scan_executor(max_workers):
+    """Return this worker process's background scan pool, creating it on first use."""
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='scan-job')
+            _executor_pid = os.getpid()
+        return _executor
+
+def expire_scan_jobs():
+    """Delete jobs older than ``SCAN_JOB_TTL`` seconds, finished or not."""
+    cutoff = datetime.utcnow() - timedelta(seconds=current_app.config.get('SCAN_JOB_TTL', 3600))
+    expired = ScanJob.query.filter(ScanJob.created_at < cutoff).delete(synchronize_session=False)
+    # Commit even when nothing was deleted so the write lock isn't held for the rest of the request
+    db.session.commit()
+    if expired:
+        logger.info(f"Expired {expired} scan jobs")
+
+def process_exists(pid):
+    """Return whether a process with this pid is alive on this host."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Alive, but run by another user
+        return True
+    return True
+
+def is_orphaned(job, now=None):
+    """Return whether an active job will never finish.
+
+    That's the case when the worker process holding it is gone (a recycled or
+    timed-out gunicorn worker; only checked for this host's workers) or when it
+    has been running for longer than ``SCAN_JOB_STALE_AFTER`` seconds since it
+    started or, for jobs reporting progress, since its last report.
+    """
+    if job.is_finished:
+        return False
+    if job.worker_host == HOSTNAME and job.worker_pid and not process_exists(job.worker_pid):
+        return True
+    if job.started_at is None:
+        return False
+    stale_after = current_app.config.get('SCAN_JOB_STALE_AFTER', SCAN_JOB_STALE_AFTER)
+    # A running job only has a result once it has reported progress (updated_at)
+    last_seen = max(job.started_at, job.updated_at) if job.result and job.updated_at else job.started_at
+    now = now or datetime.utcnow()
+    return now - last_seen > timedelta(seconds=stale_after)
+
+def fail_orphaned_scan_jobs(jobs):
+    """Mark the orphaned jobs among ``jobs`` as failed; return the ones still active."""
+    active, orphaned = [], []
+    now = datetime.utcnow()
+    for job in jobs:
+        (orphaned if is_orphaned(job, now) else active).append(job)
+    for job in orphaned:
+        job.status = 'failed'
+        job.result = json.dumps({
+            'success': False,
+            'message': 'The job stopped without finishing (its server worker was restarted or it ran too long). Please try again.'
+        })
+    if orphaned:
+        db.session.commit()
+        logger.warning(f"Failed {len(orphaned)} orphaned scan jobs")
+    return active
+
+def count_active_scan_jobs(user_id):
+    """Return how many of a user's jobs are still queued or running, failing orphaned ones."""
+    jobs = ScanJob.query.filter(
+        ScanJob.user_id == user_id,
+        ScanJob.status.in_(ScanJob.ACTIVE_STATUSES)
+    ).all()
+    return len(fail_orphaned_scan_jobs(jobs))
+
+def get_scan_job(job_id):
+    """Return a job by id (None if expired), failing it first if it was orphaned."""
+    job = db.session.get(ScanJob, job_id)
+    if job is not None:
+        fail_orphaned_scan_jobs([job])
+    return job
+
+def submit_scan_job(user_id, campaign_id, data, process, reports_progress=False):
+    """Queue ``process(data)`` on the background pool and return the new job.
+
+    ``data`` is the job input, e.g. the uploaded image bytes of a statblock scan.
+    ``process`` must return a ``(payload, status_code)`` pair; the payload is stored
+    as the job result. With ``reports_progress`` it is called as
+    ``process(data, report)`` and may call ``report(payload)`` to store a partial
+    result while it runs. With ``SCAN_JOB_WORKERS`` set to 0 the job runs inline.
+    """
+    job = ScanJob(id=uuid.uuid4().hex, user_id=user_id, campaign_id=campaign_id, status='queued',
+                  worker_host=HOSTNAME, worker_pid=os.getpid())
+    db.session.add(job)
+    db.session.commit()
+
+    app = current_app._get_current_object()
+    max_workers = app.config.get('SCAN_JOB_WORKERS', 2)
+    if max_workers <= 0:
+        run_scan_job(app, job.id, data, process, reports_progress=reports_progress)
+        db.session.refresh(job)
+    else:
+        change_queue_depth('scan_jobs', 1)
+        get_scan_executor(max_workers).submit(run_scan_job, app, job.id, data, process, True, reports_progress)
+
+    return job
+
+def run_scan_job(app, job_id, data, process, queued=False, reports_progress=False):
+    """Run a queued job and store its result (called on the background pool)."""
+    if queued:
+        change_queue_depth('scan_jobs', -1)
+    with app.app_context():
+        job = db.session.get(ScanJob, job_id)
+        if job is None:
+            # Expired before a worker picked it up
+            return
+
+        job.status = 'running'
+        job.started_at = datetime.utcnow()
+        db.session.commit()
+
+        def report(payload):
+            job.result = json.dumps(payload)
+            db.session.commit()
+
+        try:
+            payload, status_code = process(data, report) if reports_progress else process(data)
+            job.status = 'done' if status_code < 400 else 'failed'
+        except Exception as e:
+            logger.error(f"Error processing scan job {job_id}: {str(e)}")
+            payload = {
+                'success': False,
+                'message': f'Error processing image: {str(e)}'
+            }
+            job.status = 'failed'
+
+        job.result = json.dumps(payload)
+        db.session.commit()
+        db.session.remove()
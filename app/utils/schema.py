@@ -0,0 +1,42 @@
+import os
+import logging
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from app import db
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised when the database isn't at the latest migration."""
+
+def migration_heads(app):
+    """Return the head revisions of the app's migration scripts."""
+    directory = app.extensions['migrate'].directory
+    config = Config()
+    config.set_main_option('script_location', os.path.join(os.path.dirname(app.root_path), directory))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+def database_revisions(app):
+    """Return the revisions the app's database has been migrated to (empty if never)."""
+    with app.app_context():
+        with db.engine.connect() as connection:
+            return set(MigrationContext.configure(connection).get_current_heads())
+
+def check_schema_head(app):
+    """Make sure the database has every migration applied before serving from it.
+
+    Used instead of ``db.create_all()`` when ``AUTO_CREATE_SCHEMA`` is off: the
+    schema then only comes from ``flask db upgrade``, and a worker fleet started
+    on an older schema would fail request by request, so refuse to start.
+    """
+    heads = migration_heads(app)
+    current = database_revisions(app)
+    if current != heads:
+        raise SchemaOutOfDateError(
+            f"Database is at revision {', '.join(sorted(current)) or 'none'} but the migrations head is "
+            f"{', '.join(sorted(heads))}; run 'flask db upgrade' first."
+        )
+    logger.info(f"Database schema is at migration head {', '.join(sorted(heads))}")
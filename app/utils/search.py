@@ -0,0 +1,271 @@
+import re
+import logging
+from markupsafe import Markup, escape
+from flask import current_app, url_for
+from sqlalchemy import event, inspect, text
+from sqlalchemy.orm import load_only
+from app import db
+from app.models.monster import Monster
+from app.models.npc import NPC
+from app.models.event import Event
+from app.models.loot import Loot
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Words of a query that are searched for, the rest is ignored
+MAX_TERMS = 10
+
+# Characters of text shown around the first match of a result
+SNIPPET_LENGTH = 160
+
+# Title matches count this many times more than body matches
+TITLE_WEIGHT = 10.0
+
+# Postgres text search configuration (stemming and stop words)
+TEXT_SEARCH_CONFIG = 'english'
+
+class SearchSource:
+    """A table whose rows are searchable: a title column and the body columns."""
+
+    def __init__(self, kind, model, title, body):
+        self.kind = kind
+        self.model = model
+        self.title = title
+        self.body = body
+
+    @property
+    def table(self):
+        return self.model.__table__.name
+
+    @property
+    def fts_table(self):
+        return f'{self.table}_fts'
+
+    @property
+    def columns(self):
+        return (self.title,) + self.body
+
+SEARCH_SOURCES = [
+    SearchSource('monster', Monster, 'name', ('type', 'special_abilities', 'actions')),
+    SearchSource('npc', NPC, 'name', ('description', 'places_to_find')),
+    SearchSource('event', Event, 'title', ('description',)),
+    SearchSource('loot', Loot, 'name', ('description',)),
+]
+
+SOURCES_BY_KIND = {source.kind: source for source in SEARCH_SOURCES}
+
+# SQLite: an external content FTS5 table per source, kept in sync by triggers so
+# bulk inserts and deletes that bypass the ORM are indexed too. campaign_id is
+# indexed as a column so a query only reads the postings of one campaign.
+
+def sqlite_ddl(source):
+    """Return the statements creating a source's FTS5 table and sync triggers."""
+    columns = source.columns + ('campaign_id',)
+    names = ', '.join(columns)
+    new_values = ', '.join(f'new.{column}' for column in columns)
+    old_values = ', '.join(f'old.{column}' for column in columns)
+    fts = source.fts_table
+    return [
+        f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({names}, content='{source.table}', "
+        f"content_rowid='id', tokenize='porter unicode61')",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {source.table} BEGIN "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {source.table} BEGIN "
+        f"INSERT INTO {fts}({fts}, rowid, {names}) VALUES ('delete', old.id, {old_values}); "
+        f"INSERT INTO {fts}(rowid, {names}) VALUES (new.id, {new_values}); END",
+    ]
+
+def sqlite_rank_query(source, param):
+    # bm25 takes a weight per column, in table order: title, body..., campaign_id
+    weights = ', '.join([str(TITLE_WEIGHT)] + ['1.0'] * len(source.body) + ['0.0'])
+    return (f"SELECT '{source.kind}' AS kind, rowid AS id, bm25({source.fts_table}, {weights}) AS rank "
+            f"FROM {source.fts_table} WHERE {source.fts_table} MATCH :{param}")
+
+def sqlite_match(source, campaign_id, terms):
+    """Return the FTS5 query for all the terms in one campaign's rows."""
+    words = ' AND '.join([f'"{term}"' for term in terms[:-1]] + [f'"{terms[-1]}"*'])
+    return f'campaign_id : "{int(campaign_id)}" AND {{{" ".join(source.columns)}}} : ({words})'
+
+# Postgres: a GIN index on each source's weighted tsvector expression, which the
+# database keeps up to date by itself. Queries must use the identical expression.
+
+def postgres_vector(source):
+    config = f"'{TEXT_SEARCH_CONFIG}'::regconfig"
+    body = " || ' ' || ".join(f"coalesce({column}, '')" for column in source.body)
+    return (f"(setweight(to_tsvector({config}, coalesce({source.title}, '')), 'A') || "
+            f"setweight(to_tsvector({config}, {body}), 'B'))")
+
+def postgres_ddl(source):
+    """Return the statement creating a source's GIN index."""
+    return [f"CREATE INDEX IF NOT EXISTS ix_{source.table}_search ON {source.table} "
+            f"USING GIN ({postgres_vector(source)})"]
+
+def postgres_rank_query(source):
+    return (f"SELECT '{source.kind}' AS kind, id, -ts_rank_cd({postgres_vector(source)}, query) AS rank "
+            f"FROM {source.table}, to_tsquery('{TEXT_SEARCH_CONFIG}', :tsquery) AS query "
+            f"WHERE campaign_id = :campaign_id AND {postgres_vector(source)} @@ query")
+
+def install_search(connection):
+    """Create the full-text indexes a database is missing and index the existing rows.
+
+    Safe to run on every start; does nothing when everything is in place.
+    """
+    dialect = connection.dialect.name
+    if dialect not in ('sqlite', 'postgresql'):
+        logger.warning(f"Full-text search isn't supported on {dialect}")
+        return
+
+    existing = set(inspect(connection).get_table_names())
+    for source in SEARCH_SOURCES:
+        if dialect == 'postgresql':
+            for statement in postgres_ddl(source):
+                connection.execute(text(statement))
+            continue
+
+        created = source.fts_table not in existing
+        for statement in sqlite_ddl(source):
+            connection.execute(text(statement))
+        if created:
+            # Index the rows that were there before the table
+            connection.execute(text(f"INSERT INTO {source.fts_table}({source.fts_table}) VALUES ('rebuild')"))
+
+def uninstall_search(connection):
+    """Drop the full-text indexes (and on SQLite their triggers)."""
+    for source in SEARCH_SOURCES:
+        if connection.dialect.name == 'postgresql':
+            connection.execute(text(f'DROP INDEX IF EXISTS ix_{source.table}_search'))
+        elif connection.dialect.name == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                connection.execute(text(f'DROP TRIGGER IF EXISTS {source.fts_table}_{suffix}'))
+            connection.execute(text(f'DROP TABLE IF EXISTS {source.fts_table}'))
+
+def _drop_fts_table(source):
+    def drop(table, connection, **kwargs):
+        if connection.dialect.name == 'sqlite':
+            connection.execute(text(f'DROP TABLE IF EXISTS {source.fts_table}'))
+    return drop
+
+# An FTS table left behind by drop_all would point at the next, empty, table
+for _source in SEARCH_SOURCES:
+    event.listen(_source.model.__table__, 'before_drop', _drop_fts_table(_source))
+
+def init_search(app):
+    """Make sure the app's database has its full-text indexes (after create_all)."""
+    with db.engine.begin() as connection:
+        install_search(connection)
+
+def search_terms(query):
+    """Return the words of a search box query, lowercased.
+
+    Every word has to match (after stemming); the last one may be the start of
+    a word, so results show up while it is still being typed.
+    """
+    return re.findall(r'\w+', (query or '').lower())[:MAX_TERMS]
+
+class SearchResult:
+    """A matching monster, NPC, event or loot item."""
+
+    def __init__(self, kind, row, rank, terms):
+        self.kind = kind
+        self.row = row
+        self.rank = rank
+        self.terms = terms
+
+    @property
+    def source(self):
+        return SOURCES_BY_KIND[self.kind]
+
+    @property
+    def title(self):
+        return getattr(self.row, self.source.title)
+
+    @property
+    def snippet(self):
+        """About SNIPPET_LENGTH characters of body text around the first match."""
+        texts = [value for value in (getattr(self.row, column) for column in self.source.body) if value]
+        pattern = self.term_pattern()
+        for value in texts:
+            match = pattern.search(value)
+            if match:
+                start = max(0, match.start() - SNIPPET_LENGTH // 3)
+                snippet = ' '.join(value[start:start + SNIPPET_LENGTH].split())
+                return ('…' if start else '') + snippet + ('…' if start + SNIPPET_LENGTH < len(value) else '')
+        if texts:
+            return ' '.join(texts[0][:SNIPPET_LENGTH].split())
+        return ''
+
+    def term_pattern(self):
+        return re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in self.terms) + r')\w*', re.IGNORECASE)
+
+    def highlight(self, value):
+        """Return text as HTML with the searched words marked."""
+        pattern = self.term_pattern()
+        parts = []
+        position = 0
+        for match in pattern.finditer(value):
+            parts.append(escape(value[position:match.start()]))
+            parts.append(Markup('<mark>%s</mark>') % match.group(0))
+            position = match.end()
+        parts.append(escape(value[position:]))
+        return Markup('').join(parts)
+
+    @property
+    def url(self):
+        campaign_id = self.row.campaign_id
+        if self.kind == 'monster':
+            return url_for('monsters.view', campaign_id=campaign_id, id=self.row.id)
+        if self.kind == 'npc':
+            return url_for('npcs.view', campaign_id=campaign_id, id=self.row.id)
+        if self.kind == 'event':
+            return url_for('events.view', campaign_id=campaign_id, id=self.row.id)
+        return url_for('loot.list', campaign_id=campaign_id, encounter_id=self.row.encounter_id)
+
+    def as_dict(self):
+        return {
+            'kind': self.kind,
+            'id': self.row.id,
+            'title': self.title,
+            'snippet': self.snippet,
+            'url': self.url,
+            'rank': self.rank,
+        }
+
+def search_campaign(campaign_id, query, limit=None):
+    """Return a campaign's monsters, NPCs, events and loot matching every word of a query, best first.
+
+    The database ranks the matches (bm25 on SQLite, ts_rank_cd on Postgres) and
+    only the best ``limit`` are loaded, with one query per kind of result.
+    """
+    terms = search_terms(query)
+    if not terms:
+        return []
+    limit = limit or current_app.config.get('SEARCH_RESULT_LIMIT', 50)
+
+    session = db.session
+    if session.get_bind().dialect.name == 'postgresql':
+        sql = ' UNION ALL '.join(postgres_rank_query(source) for source in SEARCH_SOURCES)
+        params = {'tsquery': ' & '.join(terms[:-1] + [f'{terms[-1]}:*']), 'campaign_id': campaign_id}
+        ranked = session.execute(text(f'{sql} ORDER BY rank, id LIMIT :limit'), dict(params, limit=limit)).all()
+    else:
+        # Each source has its own MATCH argument (its column names differ)
+        sql = ' UNION ALL '.join(sqlite_rank_query(source, f'match_{source.kind}') for source in SEARCH_SOURCES)
+        params = {f'match_{source.kind}': sqlite_match(source, campaign_id, terms) for source in SEARCH_SOURCES}
+        ranked = session.execute(text(f'{sql} ORDER BY rank, id LIMIT :limit'), dict(params, limit=limit)).all()
+
+    rows = {}
+    for source in SEARCH_SOURCES:
+        ids = [row.id for row in ranked if row.kind == source.kind]
+        if ids:
+            model = source.model
+            columns = [getattr(model, name) for name in ('id', 'campaign_id') + source.columns]
+            if source.kind == 'loot':
+                columns.append(model.encounter_id)
+            for item in model.query.filter(model.id.in_(ids)).options(load_only(*columns)):
+                rows[(source.kind, item.id)] = item
+
+    return [SearchResult(row.kind, rows[(row.kind, row.id)], row.rank, terms)
+            for row in ranked if (row.kind, row.id) in rows]
@@ -1,10 +1,17 @@
 import re
 import pytesseract
-from PIL import Image, ImageEnhance, ImageFilter
+from PIL import Image, ImageFilter
 import io
 import logging
 import os
 import base64
+from concurrent.futures import ThreadPoolExecutor
+import threading
+from app.utils.ocr_engine import image_to_string
+from app.utils import statblock_parser
+from app.utils.statblock_parser import parse_statblock
+from app.utils.ocr_normalize import load_normalized_image
+from app.utils.metrics import ocr_stage
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,66 +39,151 @@ else:
     else:
         logger.warning("Tesseract executable not found in common locations. OCR may not work properly.")
 
-def extract_text_from_image(image_bytes):
-    """Extract text from image using OCR with enhanced preprocessing for D&D statblocks."""
+# Bump whenever preprocessing, OCR or parsing changes so cached results are recomputed
+OCR_PIPELINE_VERSION = 'simple-5'
+
+# Tesseract options shared by every preprocessing variant (--psm 6 treats the image as a block of text)
+TESSERACT_CONFIG = '--psm 6 -c preserve_interword_spaces=1'
+
+# Maximum number of tesseract passes run at the same time. Each pass is a separate
+# tesseract subprocess, so threads are enough to overlap them. Set to 1 to run serially.
+OCR_MAX_WORKERS = int(os.environ.get('OCR_MAX_WORKERS', 3))
+
+_executors = {}
+_executors_lock = threading.Lock()
+
+def get_ocr_executor(max_workers=None):
+    """Return the shared thread pool used to run OCR passes, creating it on first use."""
+    max_workers = max_workers or OCR_MAX_WORKERS
+    with _executors_lock:
+        executor = _executors.get(max_workers)
+        if executor is None:
+            executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='ocr')
+            _executors[max_workers] = executor
+        return executor
+
+def run_ocr_pass(image):
+    """Run a single tesseract pass over a preprocessed image with the worker's OCR engine."""
+    return image_to_string(image, config=TESSERACT_CONFIG)
+
+def run_ocr_passes(images, max_workers=None):
+    """Run tesseract over each image, concurrently when more than one worker is allowed.
+
+    Results are returned in the same order as the input images.
+    """
+    max_workers = max_workers or OCR_MAX_WORKERS
+    if max_workers <= 1 or len(images) <= 1:
+        return [run_ocr_pass(image) for image in images]
+    
+    return list(get_ocr_executor(max_workers).map(run_ocr_pass, images))
+
+# Minimum statblock score (0.0 - 1.0) for an OCR pass to be accepted without
+# trying the remaining preprocessing variants.
+OCR_SCORE_THRESHOLD = float(os.environ.get('OCR_SCORE_THRESHOLD', 0.8))
+
+# Anchors that parse_monster_data relies on to find the core statblock fields
+SCORE_ANCHORS = [
+    re.compile(r"(?:\bAC\b|Armor\s+Class)"),
+    re.compile(r"(?:\bHP\b|Hit\s+Points)"),
+    re.compile(r"(?:\bCR\b|Challenge)"),
+]
+ABILITY_PAIR_PATTERN = re.compile(r"\d{1,2}\s*\(\s*[+-]\s*\d+\s*\)")
+
+def score_statblock_text(text):
+    """Score how much of a statblock an OCR pass recovered, from 0.0 to 1.0.
+
+    Armor Class, Hit Points and Challenge are worth one point each and the six
+    ``NN (+N)`` ability score pairs are worth three points together.
+    """
+    if not text:
+        return 0.0
+    
+    points = sum(1 for anchor in SCORE_ANCHORS if anchor.search(text))
+    ability_pairs = min(len(ABILITY_PAIR_PATTERN.findall(text)), 6)
+    points += ability_pairs / 2
+    
+    return points / 6
+
+def threshold_table(level):
+    """Lookup table mapping gray levels above ``level`` to white and the rest to black."""
+    return [255 if value > level else 0 for value in range(256)]
+
+# Precomputed once, so Image.point is a plain table lookup instead of calling a
+# Python function for each of the 256 gray levels on every scan
+THRESHOLD_150_TABLE = threshold_table(150)
+THRESHOLD_120_TABLE = threshold_table(120)
+
+def contrast_table(mean, factor):
+    """Lookup table equivalent to ImageEnhance.Contrast(image).enhance(factor).
+
+    ImageEnhance blends the image with a full-size solid image of its mean gray
+    level; doing the same arithmetic on the 256 entries of a table avoids the
+    extra full-size images.
+    """
+    return [min(255, max(0, int(mean + (value - mean) * factor + 0.5))) for value in range(256)]
+
+def mean_gray_level(gray_image):
+    """Mean gray level, rounded like ImageEnhance.Contrast does."""
+    histogram = gray_image.histogram()
+    total = sum(histogram)
+    return int(sum(level * count for level, count in enumerate(histogram)) / total + 0.5) if total else 0
+
+# Every variant works from the same grayscale image, converted once per scan.
+
+def sharpened_variant(gray_image):
+    """Version 1: high contrast, sharpened grayscale."""
+    high_contrast = gray_image.point(contrast_table(mean_gray_level(gray_image), 2.0))
+    # Apply sharpening
+    return high_contrast.filter(ImageFilter.SHARPEN)
+
+def threshold_variant(gray_image):
+    """Version 2: threshold to black and white with high contrast."""
+    return gray_image.point(THRESHOLD_150_TABLE)
+
+def edge_threshold_variant(gray_image):
+    """Version 3: try to better handle colored backgrounds."""
+    # Edge enhancement is a linear filter, so it gives (nearly) the same result on
+    # the grayscale image as on the color one, at a third of the work
+    return gray_image.filter(ImageFilter.EDGE_ENHANCE).point(THRESHOLD_120_TABLE)
+
+# Preprocessing variants in the order they are tried
+PREPROCESSING_VARIANTS = [sharpened_variant, threshold_variant, edge_threshold_variant]
+
+def extract_text_from_image(image_bytes, max_workers=None, score_threshold=None):
+    """Extract text from image using OCR with enhanced preprocessing for D&D statblocks.
+
+    The first preprocessing variant is OCR'd on its own; if its statblock score
+    reaches ``score_threshold`` (defaults to ``OCR_SCORE_THRESHOLD``) it is returned
+    straight away. Otherwise the remaining variants are OCR'd on a bounded thread
+    pool of ``max_workers`` threads (defaults to ``OCR_MAX_WORKERS``) and the
+    highest scoring text wins.
+    """
+    if score_threshold is None:
+        score_threshold = OCR_SCORE_THRESHOLD
+    
     try:
-        # Open image from bytes
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # Log original image size
-        logger.info(f"Original image size: {image.size}")
-        
-        # Resize image for better OCR processing if it's too small
-        if image.width < 800:
-            ratio = 800 / image.width
-            new_size = (800, int(image.height * ratio))
-            image = image.resize(new_size, Image.LANCZOS)
-            logger.info(f"Resized image to: {new_size}")
-        
-        # Create multiple versions with different preprocessing and combine results
-        results = []
-        
-        # Version 1: Convert to grayscale
-        gray_image = image.convert('L')
-        # Enhance contrast
-        enhancer = ImageEnhance.Contrast(gray_image)
-        high_contrast = enhancer.enhance(2.0)
-        # Apply sharpening
-        sharpened = high_contrast.filter(ImageFilter.SHARPEN)
+        # Crop to the statblock and resample to the OCR resolution before any filters run,
+        # then try the first variant on its own, most clean screenshots stop there
+        first_variant, *other_variants = PREPROCESSING_VARIANTS
+        with ocr_stage('preprocess'):
+            gray_image = load_normalized_image(image_bytes, mode='L')
+            debug_image = first_variant(gray_image)
+        results = [run_ocr_pass(debug_image)]
+        scores = [score_statblock_text(results[0])]
+        logger.info(f"Processed version 1 text length: {len(results[0])}, score: {scores[0]:.2f}")
         
-        # Extract text (use --psm 6 for block of text)
-        text1 = pytesseract.image_to_string(
-            sharpened, 
-            config='--psm 6 -c preserve_interword_spaces=1'
-        )
-        results.append(text1)
-        logger.info(f"Processed version 1 text length: {len(text1)}")
+        if scores[0] < score_threshold:
+            # Fall back to the other variants (in parallel when allowed)
+            with ocr_stage('preprocess_fallback'):
+                images = [variant(gray_image) for variant in other_variants]
+            debug_image = images[-1]
+            for version, text in enumerate(run_ocr_passes(images, max_workers), start=2):
+                results.append(text)
+                scores.append(score_statblock_text(text))
+                logger.info(f"Processed version {version} text length: {len(text)}, score: {scores[-1]:.2f}")
         
-        # Version 2: Threshold to black and white with high contrast
-        threshold_image = gray_image.point(lambda p: 255 if p > 150 else 0)
-        text2 = pytesseract.image_to_string(
-            threshold_image,
-            config='--psm 6 -c preserve_interword_spaces=1'
-        )
-        results.append(text2)
-        logger.info(f"Processed version 2 text length: {len(text2)}")
-        
-        # Version 3: Try to better handle colored backgrounds
-        # Apply a filter to reduce background colors
-        filtered = image.filter(ImageFilter.EDGE_ENHANCE)
-        # Convert to grayscale
-        filtered_gray = filtered.convert('L')
-        # Threshold
-        filtered_thresh = filtered_gray.point(lambda p: 255 if p > 120 else 0)
-        text3 = pytesseract.image_to_string(
-            filtered_thresh,
-            config='--psm 6 -c preserve_interword_spaces=1'
-        )
-        results.append(text3)
-        logger.info(f"Processed version 3 text length: {len(text3)}")
-        
-        # Choose the best result (the longest text content usually has the most information)
-        best_text = max(results, key=len)
+        # Choose the best scoring result, the longest text breaks ties
+        best_text = max(zip(scores, results), key=lambda result: (result[0], len(result[1])))[1]
         
         # Debug log
         logger.info(f"Best text extraction length: {len(best_text)}")
@@ -102,7 +194,7 @@ def extract_text_from_image(image_bytes):
             debug_dir = os.path.join('app', 'static', 'debug')
             os.makedirs(debug_dir, exist_ok=True)
             
-            filtered_thresh.save(os.path.join(debug_dir, 'debug_ocr_image.png'))
+            debug_image.save(os.path.join(debug_dir, 'debug_ocr_image.png'))
             logger.info(f"Saved debug image to {os.path.join(debug_dir, 'debug_ocr_image.png')}")
         
         return best_text
@@ -118,159 +210,12 @@ def parse_monster_data(text):
     # Log the entire OCR text for debugging
     logger.info(f"OCR Text to parse:\n{text}")
     
-    monster_data = {}
-    
-    # Extract monster name (usually first line)
-    lines = text.split('\n')
-    if lines:
-        monster_data['name'] = lines[0].strip()
-    
-    # Extract size, type, and alignment
-    # More flexible pattern to match various OCR outputs
-    size_type_pattern = r"(?:^|\n)(?:Size:?\s+)?([A-Za-z]+)\s+([A-Za-z]+),\s+([A-Za-z\s]+)"
-    size_type_match = re.search(size_type_pattern, text)
-    if size_type_match:
-        monster_data['size'] = size_type_match.group(1).lower()
-        monster_data['type'] = size_type_match.group(2).lower()
-        monster_data['alignment'] = size_type_match.group(3).lower()
-    
-    # Extract Armor Class with more flexible pattern
-    ac_pattern = r"(?:AC|Armor\s+Class):?\s*(\d+)"
-    ac_match = re.search(ac_pattern, text)
-    if ac_match:
-        monster_data['armor_class'] = int(ac_match.group(1))
-    
-    # Extract Hit Points with more flexible pattern
-    hp_pattern = r"(?:HP|Hit\s+Points):?\s*(\d+)"
-    hp_match = re.search(hp_pattern, text)
-    if hp_match:
-        monster_data['hit_points'] = int(hp_match.group(1))
-    
-    # Extract Hit Dice
-    hit_dice_pattern = r"\(([0-9d+\s]+)\)"
-    hit_dice_match = re.search(hit_dice_pattern, text)
-    if hit_dice_match and 'd' in hit_dice_match.group(1):
-        monster_data['hit_dice'] = hit_dice_match.group(1)
-    
-    # Extract Speed
-    speed_pattern = r"(?:Speed):?\s+([^.]+?)(?:\n|$)"
-    speed_match = re.search(speed_pattern, text)
-    if speed_match:
-        monster_data['speed'] = speed_match.group(1).strip()
-    
-    # Extract ability scores - more robust patterns
-    str_pattern = r"(?:STR|Str|Strength):?\s+(\d+)"
-    dex_pattern = r"(?:DEX|Dex|Dexterity):?\s+(\d+)"
-    con_pattern = r"(?:CON|Con|Constitution):?\s+(\d+)"
-    int_pattern = r"(?:INT|Int|Intelligence):?\s+(\d+)"
-    wis_pattern = r"(?:WIS|Wis|Wisdom):?\s+(\d+)"
-    cha_pattern = r"(?:CHA|Cha|Charisma):?\s+(\d+)"
-    
-    str_match = re.search(str_pattern, text)
-    if str_match:
-        monster_data['strength'] = int(str_match.group(1))
-    
-    dex_match = re.search(dex_pattern, text)
-    if dex_match:
-        monster_data['dexterity'] = int(dex_match.group(1))
-    
-    con_match = re.search(con_pattern, text)
-    if con_match:
-        monster_data['constitution'] = int(con_match.group(1))
-    
-    int_match = re.search(int_pattern, text)
-    if int_match:
-        monster_data['intelligence'] = int(int_match.group(1))
-    
-    wis_match = re.search(wis_pattern, text)
-    if wis_match:
-        monster_data['wisdom'] = int(wis_match.group(1))
-    
-    cha_match = re.search(cha_pattern, text)
-    if cha_match:
-        monster_data['charisma'] = int(cha_match.group(1))
-    
-    # Extract Skills
-    skills_pattern = r"(?:Skills):?\s+([^.]+?)(?:\n|$)"
-    skills_match = re.search(skills_pattern, text)
-    if skills_match:
-        monster_data['skills'] = skills_match.group(1).strip()
-    
-    # Extract Senses
-    senses_pattern = r"(?:Senses):?\s+([^.]+?)(?:\n|$)"
-    senses_match = re.search(senses_pattern, text)
-    if senses_match:
-        monster_data['senses'] = senses_match.group(1).strip()
-    
-    # Extract Languages
-    languages_pattern = r"(?:Languages):?\s+([^.]+?)(?:\n|$)"
-    languages_match = re.search(languages_pattern, text)
-    if languages_match:
-        monster_data['languages'] = languages_match.group(1).strip()
-    
-    # Extract Challenge Rating - more flexible pattern
-    cr_pattern = r"(?:CR|Challenge):?\s*(\d+(?:\/\d+)?)"
-    cr_match = re.search(cr_pattern, text)
-    if cr_match:
-        monster_data['challenge_rating'] = cr_match.group(1)
-    
-    # Extract XP
-    xp_pattern = r"(?:XP):?\s*(\d+,?\d*)"
-    xp_match = re.search(xp_pattern, text)
-    if xp_match:
-        monster_data['xp'] = int(xp_match.group(1).replace(',', ''))
-    
-    # Extract Traits/Special Abilities, Actions, and Reactions
-    # More flexible section detection
-    traits_section = extract_section(text, ["TRAITS", "TRAIT", "Special Abilities", "Special"])
-    if traits_section:
-        monster_data['special_abilities'] = traits_section
-    
-    actions_section = extract_section(text, ["ACTIONS", "ACTION"])
-    if actions_section:
-        monster_data['actions'] = actions_section
-    
-    reactions_section = extract_section(text, ["REACTIONS", "REACTION"])
-    if reactions_section:
-        monster_data['reactions'] = reactions_section
+    with ocr_stage('parse'):
+        monster_data = parse_statblock(text)
     
     logger.info(f"Extracted monster data: {monster_data}")
     return monster_data
 
 def extract_section(text, section_names):
     """Extract a section from the OCR text based on multiple possible section names."""
-    text = text.replace('\r', '\n')
-    
-    # Try to find the section start
-    start_index = -1
-    for name in section_names:
-        idx = text.find(name)
-        if idx != -1:
-            start_index = idx + len(name)
-            break
-    
-    if start_index == -1:
-        return None
-    
-    # Find the next section marker
-    section_markers = ["TRAITS", "ACTIONS", "REACTIONS", "LEGENDARY", "LAIR", "MYTHIC"]
-    end_index = len(text)
-    
-    for marker in section_markers:
-        if marker in section_names:  # Skip the current section name
-            continue
-        idx = text.find(marker, start_index)
-        if idx != -1 and idx < end_index:
-            end_index = idx
-    
-    # Extract the section content
-    section_text = text[start_index:end_index].strip()
-    
-    # Clean up the section
-    lines = section_text.split('\n')
-    clean_lines = []
-    for line in lines:
-        if line.strip():  # Skip empty lines
-            clean_lines.append(line.strip())
-    
-    return '\n'.join(clean_lines) 
\ No newline at end of file
+    return statblock_parser.extract_section(text, section_names)
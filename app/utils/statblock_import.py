@@ -0,0 +1,244 @@
+import io
+import os
+import logging
+import multiprocessing
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from flask import current_app
+from app.models.monster import Monster
+from app.utils.ocr_cache import get_ocr_cache
+from app.utils.ocr_pipeline import extract_text_from_image, parse_monster_data, ocr_pipeline_version, get_ocr_pipeline
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tif', '.tiff', '.webp')
+
+# Resolution used to rasterize PDF pages before OCR
+PDF_RENDER_DPI = 200
+
+# Monster columns that parse_monster_data can fill in
+MONSTER_IMPORT_FIELDS = [
+    'name', 'size', 'type', 'alignment',
+    'armor_class', 'armor_type', 'hit_points', 'hit_dice', 'speed',
+    'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma',
+    'skills', 'senses', 'languages', 'challenge_rating', 'xp',
+    'special_abilities', 'actions', 'reactions', 'legendary_actions', 'lair_actions',
+]
+
+INTEGER_FIELDS = {
+    'armor_class', 'hit_points', 'xp',
+    'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma',
+}
+
+class ImportFileError(ValueError):
+    """Raised when an uploaded bestiary file can't be split into pages."""
+
+class MonsterDataError(ValueError):
+    """Raised when an accepted monster has a field value that can't be saved."""
+
+    def __init__(self, index, field, message):
+        super().__init__(f'Monster {index}: {field} {message}.')
+        self.index = index
+        self.field = field
+
+def split_zip(file_bytes, max_pages, max_total_size):
+    """Return ``(filename, image_bytes)`` pairs for the images in a zip archive."""
+    try:
+        archive = zipfile.ZipFile(io.BytesIO(file_bytes))
+    except zipfile.BadZipFile:
+        raise ImportFileError('The uploaded file is not a valid zip archive.')
+
+    with archive:
+        entries = sorted(
+            (info for info in archive.infolist()
+             if not info.is_dir() and info.filename.lower().endswith(IMAGE_EXTENSIONS)),
+            key=lambda info: info.filename
+        )
+        if len(entries) > max_pages:
+            raise ImportFileError(f'Too many images in archive (maximum is {max_pages}).')
+        if sum(info.file_size for info in entries) > max_total_size:
+            raise ImportFileError('The images in the archive are too large.')
+
+        return [(os.path.basename(info.filename), archive.read(info)) for info in entries]
+
+def split_pdf(file_bytes, max_pages):
+    """Return ``(filename, png_bytes)`` pairs, one per rasterized PDF page."""
+    try:
+        import fitz  # PyMuPDF
+    except ImportError:
+        raise ImportFileError('PDF import requires PyMuPDF. Upload a zip of images instead.')
+
+    try:
+        document = fitz.open(stream=file_bytes, filetype='pdf')
+    except Exception as e:
+        raise ImportFileError(f'The uploaded file is not a valid PDF: {str(e)}')
+
+    with document:
+        if document.page_count > max_pages:
+            raise ImportFileError(f'Too many pages in PDF (maximum is {max_pages}).')
+
+        return [
+            (f'page-{number}.png', page.get_pixmap(dpi=PDF_RENDER_DPI).tobytes('png'))
+            for number, page in enumerate(document, start=1)
+        ]
+
+def split_pages(filename, file_bytes, max_pages=100, max_total_size=200 * 1024 * 1024):
+    """Split an uploaded zip of images or multi-page PDF into page images."""
+    if filename.lower().endswith('.pdf') or file_bytes.startswith(b'%PDF'):
+        pages = split_pdf(file_bytes, max_pages)
+    else:
+        pages = split_zip(file_bytes, max_pages, max_total_size)
+
+    if not pages:
+        raise ImportFileError('No statblock images found in the uploaded file.')
+    return pages
+
+def ocr_page(image_bytes):
+    """OCR and parse one page. Runs in the import worker processes."""
+    extracted_text = extract_text_from_image(image_bytes)
+    if not extracted_text:
+        return None, {}
+    return extracted_text, parse_monster_data(extracted_text)
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+
+def get_import_executor(max_workers):
+    """Return this worker's pool of OCR processes, creating it on first use.
+
+    Processes are spawned rather than forked because the web worker may be running
+    other threads (gunicorn threads, scan jobs) when the pool starts. Each one
+    imports the OCR pipeline (OpenCV, numpy...) as it starts rather than while
+    timing its first page.
+    """
+    global _executor, _executor_pid
+    with _executor_lock:
+        if _executor is None or _executor_pid != os.getpid():
+            _executor = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'),
+                                            initializer=get_ocr_pipeline)
+            _executor_pid = os.getpid()
+        return _executor
+
+def ocr_pages(pages, max_workers, ocr_cache=None):
+    """OCR pages in parallel, yielding one result dict per page as it finishes.
+
+    Pages already in ``ocr_cache`` are yielded straight away. With ``max_workers``
+    set to 0 the pages are processed one by one in the calling thread.
+    """
+    pending = []
+    for index, (filename, image_bytes) in enumerate(pages):
+        cache_key = ocr_cache.make_key(image_bytes, ocr_pipeline_version()) if ocr_cache else None
+        cached = ocr_cache.get(cache_key) if ocr_cache else None
+        if cached is not None:
+            yield page_result(index, filename, cached['raw_text'], cached['monster_data'], cached=True)
+        else:
+            pending.append((index, filename, image_bytes, cache_key))
+
+    def finish(index, filename, cache_key, text, monster_data):
+        if ocr_cache and text and monster_data:
+            ocr_cache.set(cache_key, text, monster_data)
+        return page_result(index, filename, text, monster_data)
+
+    if max_workers <= 0:
+        for index, filename, image_bytes, cache_key in pending:
+            try:
+                text, monster_data = ocr_page(image_bytes)
+            except Exception as e:
+                logger.error(f"Error processing import page {filename}: {str(e)}")
+                yield page_error(index, filename, f'Error processing image: {str(e)}')
+                continue
+            yield finish(index, filename, cache_key, text, monster_data)
+        return
+
+    executor = get_import_executor(max_workers)
+    futures = {
+        executor.submit(ocr_page, image_bytes): (index, filename, cache_key)
+        for index, filename, image_bytes, cache_key in pending
+    }
+    for future in as_completed(futures):
+        index, filename, cache_key = futures[future]
+        try:
+            text, monster_data = future.result()
+        except Exception as e:
+            logger.error(f"Error processing import page {filename}: {str(e)}")
+            yield page_error(index, filename, f'Error processing image: {str(e)}')
+            continue
+        yield finish(index, filename, cache_key, text, monster_data)
+
+def process_import(pages, report):
+    """OCR an import's pages as a scan job, reporting the results so far after each page.
+
+    The payload lists the finished pages in the order they finished; the job
+    status route returns it while the job runs so the import page fills in as
+    it goes.
+    """
+    max_workers = current_app.config.get('IMPORT_OCR_PROCESSES', os.cpu_count() or 1)
+    payload = {'success': True, 'total': len(pages), 'pages': []}
+    report(payload)
+    for result in ocr_pages(pages, max_workers, get_ocr_cache()):
+        payload['pages'].append(result)
+        report(payload)
+    return payload, 200
+
+def page_result(index, filename, text, monster_data, cached=False):
+    if not text:
+        return page_error(index, filename, 'Could not extract text from image. Please try a clearer image.')
+    if not monster_data:
+        return page_error(index, filename, 'Could not parse monster data from extracted text.', raw_text=text)
+
+    return {
+        'index': index,
+        'filename': filename,
+        'success': True,
+        'monster_data': monster_data,
+        'raw_text': text,
+        'cached': cached
+    }
+
+def page_error(index, filename, message, **extra):
+    return dict({
+        'index': index,
+        'filename': filename,
+        'success': False,
+        'message': message
+    }, **extra)
+
+def monster_rows(monsters_data, campaign_id, encounter_id=None):
+    """Turn accepted monster_data dicts into rows for a bulk Monster insert.
+
+    Raises ``MonsterDataError`` for a value that isn't a string or number, or a
+    string longer than its column.
+    """
+    if not isinstance(monsters_data, list):
+        return []
+    rows = []
+    for index, monster_data in enumerate(monsters_data):
+        if not isinstance(monster_data, dict) or not monster_data.get('name'):
+            continue
+        row = {}
+        for field in MONSTER_IMPORT_FIELDS:
+            value = monster_data.get(field)
+            if value is None or value == '':
+                # Leave it out so the column default applies
+                continue
+            if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+                raise MonsterDataError(index, field, 'must be a string or a number')
+            if field in INTEGER_FIELDS:
+                try:
+                    value = int(value)
+                except (TypeError, ValueError, OverflowError):
+                    continue
+            else:
+                value = str(value)
+                length = Monster.__table__.c[field].type.length
+                if length is not None and len(value) > length:
+                    raise MonsterDataError(index, field, f'is longer than {length} characters')
+            row[field] = value
+        row['campaign_id'] = campaign_id
+        row['encounter_id'] = encounter_id
+        rows.append(row)
+    return rows
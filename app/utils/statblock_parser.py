@@ -0,0 +1,219 @@
+"""
+Single-pass parser for OCR'd monster statblocks.
+
+The text is walked once, line by line. A line is either a section header
+(TRAITS, ACTIONS, ...), a line of the current section, or a stat line. Stat
+lines are dispatched on their first word with a dict lookup, so each line is
+matched against at most one small precompiled pattern instead of every field
+pattern being searched through the whole text.
+"""
+import re
+
+ABILITIES = [
+    ('STR', 'strength'),
+    ('DEX', 'dexterity'),
+    ('CON', 'constitution'),
+    ('INT', 'intelligence'),
+    ('WIS', 'wisdom'),
+    ('CHA', 'charisma'),
+]
+
+# "STR", "Str" and "Strength" all map to the strength field
+ABILITY_LABELS = {}
+for abbreviation, field in ABILITIES:
+    for label in (field.capitalize(), abbreviation, abbreviation.capitalize()):
+        ABILITY_LABELS[label] = field
+
+ABILITY_PATTERN = re.compile(
+    r"\b(" + '|'.join(sorted(ABILITY_LABELS, key=len, reverse=True)) + r")\b:?\s*(\d+)"
+)
+
+# Unlabelled "10 (+0)" scores under a STR DEX CON INT WIS CHA header row
+ABILITY_PAIR_PATTERN = re.compile(r"(\d{1,2})\s*\(\s*[+-]?\s*\d+\s*\)")
+
+# Stat line patterns, keyed by the first word of the line
+NUMBER_WITH_NOTE = r":?\s*(\d+)(?:\s*\(([^)]*)\))?"
+ARMOR_CLASS_PATTERN = re.compile(r"(?:Armor\s+Class|AC)" + NUMBER_WITH_NOTE)
+HIT_POINTS_PATTERN = re.compile(r"(?:Hit\s+Points|HP)" + NUMBER_WITH_NOTE)
+# Matches both "Challenge 24 (62,000 XP)" and "CR 1 (XP 200; PB +2)"
+CHALLENGE_PATTERN = re.compile(
+    r"(?:Challenge|CR):?\s*(\d+(?:/\d+)?)(?:\s*\(\s*(?:XP:?\s*)?(\d[\d,]*)(?:\s*XP)?)?"
+)
+XP_PATTERN = re.compile(r"XP:?\s*(\d[\d,]*)")
+REST_OF_LINE_PATTERN = re.compile(r"\w+:?\s*(.*)")
+
+LINE_FIELDS = {
+    'AC': 'armor_class',
+    'Armor': 'armor_class',
+    'HP': 'hit_points',
+    'Hit': 'hit_points',
+    'Speed': 'speed',
+    'Skills': 'skills',
+    'Senses': 'senses',
+    'Languages': 'languages',
+    'CR': 'challenge_rating',
+    'Challenge': 'challenge_rating',
+    'XP': 'xp',
+}
+
+# Size, type and alignment ("Large Dragon, Chaotic Evil") have no label
+SIZE_TYPE_PATTERN = re.compile(
+    r"(?:Size:?\s+)?([A-Za-z]+)\s+([A-Za-z]+)(?:\s*\([^)]*\))?,\s*([A-Za-z][A-Za-z ]*?)\s*$"
+)
+
+# Section headers, mapped to the monster field they fill in
+SECTION_FIELDS = {
+    'TRAITS': 'special_abilities',
+    'TRAIT': 'special_abilities',
+    'Special Abilities': 'special_abilities',
+    'Special': 'special_abilities',
+    'ACTIONS': 'actions',
+    'ACTION': 'actions',
+    'BONUS ACTIONS': 'bonus_actions',
+    'REACTIONS': 'reactions',
+    'REACTION': 'reactions',
+    'LEGENDARY ACTIONS': 'legendary_actions',
+    'LEGENDARY': 'legendary_actions',
+    'LAIR ACTIONS': 'lair_actions',
+    'LAIR': 'lair_actions',
+    'MYTHIC ACTIONS': 'mythic_actions',
+    'MYTHIC': 'mythic_actions',
+}
+
+# A header starting a line, alone or followed by the section's first entry
+# ("ACTIONS Multiattack. ..." from OCR that joins the lines); longest names first
+SECTION_HEADER_PATTERN = re.compile(
+    r"(" + '|'.join(re.escape(header) for header in sorted(SECTION_FIELDS, key=len, reverse=True)) + r")\b\s*:?\s*(.*)"
+)
+
+# Sections included in the parsed monster data
+PARSED_SECTIONS = ['special_abilities', 'actions', 'reactions']
+
+def split_sections(text):
+    """Split statblock text into its stat lines and its named sections.
+
+    Returns ``(header_lines, sections)`` where ``header_lines`` are the stripped,
+    non-empty lines before the first section and ``sections`` maps a monster field
+    (e.g. ``'actions'``) to the lines of its section. A header may share its line
+    with the section's first entry. Only the first section with a given name is
+    kept.
+    """
+    header_lines = []
+    sections = {}
+    current = header_lines
+
+    for line in text.replace('\r', '\n').split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+
+        match = SECTION_HEADER_PATTERN.match(line)
+        if match is None:
+            current.append(line)
+            continue
+
+        header, rest = match.groups()
+        field = SECTION_FIELDS[header]
+        if field in sections:
+            # A repeated header, stop collecting rather than merging the two
+            current = []
+        else:
+            current = sections[field] = []
+        if rest:
+            current.append(rest)
+
+    return header_lines, sections
+
+def parse_stat_line(line, monster_data):
+    """Parse a labelled stat line into ``monster_data``; the first occurrence of a field wins.
+
+    Returns False if the line doesn't start with a field label.
+    """
+    first_word = line.split(None, 1)[0].rstrip(':')
+
+    if first_word in ABILITY_LABELS:
+        for label, score in ABILITY_PATTERN.findall(line):
+            monster_data.setdefault(ABILITY_LABELS[label], int(score))
+        return True
+
+    field = LINE_FIELDS.get(first_word)
+    if field is None:
+        return False
+    if field in monster_data:
+        return True
+
+    if field in ('armor_class', 'hit_points'):
+        pattern = ARMOR_CLASS_PATTERN if field == 'armor_class' else HIT_POINTS_PATTERN
+        match = pattern.match(line)
+        if match:
+            monster_data[field] = int(match.group(1))
+            note = (match.group(2) or '').strip()
+            if note and field == 'armor_class':
+                monster_data['armor_type'] = note
+            elif note and 'd' in note:
+                monster_data['hit_dice'] = note
+    elif field == 'challenge_rating':
+        match = CHALLENGE_PATTERN.match(line)
+        if match:
+            monster_data[field] = match.group(1)
+            if match.group(2):
+                monster_data.setdefault('xp', int(match.group(2).replace(',', '')))
+    elif field == 'xp':
+        match = XP_PATTERN.match(line)
+        if match:
+            monster_data[field] = int(match.group(1).replace(',', ''))
+    else:
+        # speed, skills, senses and languages take the rest of the line
+        value = REST_OF_LINE_PATTERN.match(line).group(1).strip()
+        if value:
+            monster_data[field] = value
+
+    return True
+
+def parse_statblock(text):
+    """Parse OCR'd statblock text into a dict of monster attributes."""
+    if not text:
+        return {}
+
+    monster_data = {}
+    header_lines, sections = split_sections(text)
+    if not header_lines:
+        return monster_data
+
+    # Monster name is the first line of the statblock (which is still parsed, so
+    # a lone stat line like "AC 15" works too)
+    monster_data['name'] = header_lines[0]
+
+    ability_pairs = []
+    for line in header_lines:
+        if parse_stat_line(line, monster_data):
+            continue
+
+        if 'size' not in monster_data:
+            size_type = SIZE_TYPE_PATTERN.match(line)
+            if size_type:
+                monster_data['size'] = size_type.group(1).lower()
+                monster_data['type'] = size_type.group(2).lower()
+                monster_data['alignment'] = size_type.group(3).lower()
+                continue
+
+        ability_pairs.extend(ABILITY_PAIR_PATTERN.findall(line))
+
+    if len(ability_pairs) >= 6:
+        for (abbreviation, field), score in zip(ABILITIES, ability_pairs):
+            monster_data.setdefault(field, int(score))
+
+    for field in PARSED_SECTIONS:
+        if sections.get(field):
+            monster_data[field] = '\n'.join(sections[field])
+
+    return monster_data
+
+def extract_section(text, section_names):
+    """Return the lines of the first of ``section_names`` present in the text, or None."""
+    _, sections = split_sections(text)
+    for name in section_names:
+        field = SECTION_FIELDS.get(name)
+        if field in sections:
+            return '\n'.join(sections[field])
+    return None
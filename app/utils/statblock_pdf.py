@@ -0,0 +1,193 @@
+import logging
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Monster columns the native layout reads, copied out of the ORM objects in the
+# request thread so rendering never touches the database session
+STATBLOCK_FIELDS = [
+    'name', 'size', 'type', 'alignment',
+    'armor_class', 'armor_type', 'hit_points', 'hit_dice', 'speed',
+    'strength', 'dexterity', 'constitution', 'intelligence', 'wisdom', 'charisma',
+    'strength_save', 'dexterity_save', 'constitution_save', 'intelligence_save', 'wisdom_save', 'charisma_save',
+    'skills', 'damage_vulnerabilities', 'damage_resistances', 'damage_immunities', 'condition_immunities',
+    'senses', 'languages', 'challenge_rating', 'xp',
+    'special_abilities', 'actions', 'bonus_actions', 'reactions', 'legendary_actions', 'lair_actions',
+    'description',
+]
+
+ABILITIES = [
+    ('STR', 'strength'), ('DEX', 'dexterity'), ('CON', 'constitution'),
+    ('INT', 'intelligence'), ('WIS', 'wisdom'), ('CHA', 'charisma'),
+]
+
+SAVES = [
+    ('Str', 'strength_save'), ('Dex', 'dexterity_save'), ('Con', 'constitution_save'),
+    ('Int', 'intelligence_save'), ('Wis', 'wisdom_save'), ('Cha', 'charisma_save'),
+]
+
+PROPERTIES = [
+    ('Skills', 'skills'),
+    ('Damage Vulnerabilities', 'damage_vulnerabilities'),
+    ('Damage Resistances', 'damage_resistances'),
+    ('Damage Immunities', 'damage_immunities'),
+    ('Condition Immunities', 'condition_immunities'),
+    ('Senses', 'senses'),
+    ('Languages', 'languages'),
+]
+
+SECTIONS = [
+    ('Special Abilities', 'special_abilities'),
+    ('Actions', 'actions'),
+    ('Bonus Actions', 'bonus_actions'),
+    ('Reactions', 'reactions'),
+    ('Legendary Actions', 'legendary_actions'),
+    ('Lair Actions', 'lair_actions'),
+]
+
+# Same page and colors as the HTML template (Letter, 0.5in margins, in points)
+PAGE_FORMAT = 'Letter'
+MARGIN = 36
+TEXT_COLOR = (88, 24, 13)
+RULE_COLOR = (221, 210, 179)
+FOOTER_COLOR = (102, 102, 102)
+FONT = 'Times'
+BODY_SIZE = 10
+LINE_HEIGHT = 13
+
+# The PDF core fonts only cover Latin-1; map the punctuation OCR and copy-paste
+# usually bring in and replace anything else
+TEXT_REPLACEMENTS = str.maketrans({
+    '‘': "'", '’': "'", '“': '"', '”': '"',
+    '–': '-', '—': '-', '−': '-', '•': '*', '…': '...',
+})
+
+def statblock_document(campaign, monsters, title=None):
+    """Return the plain-data document the native backend lays out."""
+    return {
+        'title': title,
+        'author': campaign.owner.username if campaign.owner else '',
+        'monsters': [{field: getattr(monster, field) for field in STATBLOCK_FIELDS} for monster in monsters],
+    }
+
+def pdf_text(value):
+    """Return a value as text the PDF core fonts can show."""
+    text = str(value).translate(TEXT_REPLACEMENTS)
+    return text.encode('latin-1', errors='replace').decode('latin-1')
+
+def ability_modifier(score):
+    return ((score if score is not None else 10) - 10) // 2
+
+class StatblockLayout:
+    """Lays statblocks out straight into a PDF with fpdf2, one monster per page."""
+
+    def __init__(self):
+        from fpdf import FPDF
+
+        self.pdf = FPDF(orientation='portrait', unit='pt', format=PAGE_FORMAT)
+        self.pdf.set_margins(MARGIN, MARGIN, MARGIN)
+        self.pdf.set_auto_page_break(True, margin=MARGIN)
+        self.pdf.set_text_color(*TEXT_COLOR)
+
+    @property
+    def width(self):
+        return self.pdf.w - 2 * MARGIN
+
+    def render(self, document):
+        """Return the PDF bytes of a ``statblock_document``."""
+        for index, monster in enumerate(document['monsters']):
+            self.pdf.add_page()
+            if index == 0 and document.get('title'):
+                self.heading(document['title'], 28)
+            self.statblock(monster, document.get('author', ''))
+        return bytes(self.pdf.output())
+
+    def heading(self, text, size):
+        self.pdf.set_font(FONT, 'B', size)
+        self.pdf.multi_cell(self.width, size * 1.3, pdf_text(text), align='C', new_x='LMARGIN', new_y='NEXT')
+
+    def rule(self, color=TEXT_COLOR, width=1.0):
+        y = self.pdf.get_y() + 3
+        self.pdf.set_draw_color(*color)
+        self.pdf.set_line_width(width)
+        self.pdf.line(MARGIN, y, MARGIN + self.width, y)
+        self.pdf.set_y(y + 5)
+
+    def property_line(self, label, value):
+        self.pdf.set_font(FONT, 'B', BODY_SIZE)
+        self.pdf.write(LINE_HEIGHT, pdf_text(f'{label}: '))
+        self.pdf.set_font(FONT, '', BODY_SIZE)
+        self.pdf.write(LINE_HEIGHT, pdf_text(value))
+        self.pdf.ln(LINE_HEIGHT)
+
+    def text_block(self, text, style=''):
+        self.pdf.set_font(FONT, style, BODY_SIZE)
+        self.pdf.multi_cell(self.width, LINE_HEIGHT, pdf_text(text), new_x='LMARGIN', new_y='NEXT')
+
+    def abilities(self, monster):
+        cell = self.width / len(ABILITIES)
+        for label, _ in ABILITIES:
+            self.pdf.set_font(FONT, 'B', BODY_SIZE)
+            self.pdf.cell(cell, LINE_HEIGHT, label, align='C')
+        self.pdf.ln(LINE_HEIGHT)
+        self.pdf.set_font(FONT, '', BODY_SIZE)
+        for _, field in ABILITIES:
+            score = monster[field]
+            self.pdf.cell(cell, LINE_HEIGHT, f'{score} ({ability_modifier(score)})', align='C')
+        self.pdf.ln(LINE_HEIGHT)
+
+    def statblock(self, monster, author):
+        self.heading(monster['name'], 20)
+        self.pdf.set_font(FONT, 'I', BODY_SIZE + 1)
+        subtitle = f"{monster['size'] or ''} {monster['type'] or ''}, {monster['alignment'] or ''}"
+        self.pdf.multi_cell(self.width, LINE_HEIGHT, pdf_text(subtitle), align='C', new_x='LMARGIN', new_y='NEXT')
+        self.rule(width=1.5)
+
+        armor_class = f"{monster['armor_class']}"
+        if monster['armor_type']:
+            armor_class += f" ({monster['armor_type']})"
+        hit_points = f"{monster['hit_points']}"
+        if monster['hit_dice']:
+            hit_points += f" ({monster['hit_dice']})"
+        self.property_line('Armor Class', armor_class)
+        self.property_line('Hit Points', hit_points)
+        self.property_line('Speed', monster['speed'] or '')
+        self.rule(RULE_COLOR)
+
+        self.abilities(monster)
+        self.rule(RULE_COLOR)
+
+        saves = [f'{label} +{monster[field]}' for label, field in SAVES if monster[field]]
+        if saves:
+            self.property_line('Saving Throws', ', '.join(saves))
+        for label, field in PROPERTIES:
+            if monster[field]:
+                self.property_line(label, monster[field])
+        challenge = f"{monster['challenge_rating'] or ''}"
+        if monster['xp']:
+            challenge += f" ({monster['xp']} XP)"
+        self.property_line('Challenge', challenge)
+
+        for label, field in SECTIONS:
+            if monster[field]:
+                self.pdf.ln(4)
+                self.pdf.set_font(FONT, 'B', BODY_SIZE + 3)
+                self.pdf.cell(self.width, LINE_HEIGHT + 2, label, new_x='LMARGIN', new_y='NEXT')
+                self.rule(width=0.75)
+                self.text_block(monster[field])
+
+        if monster['description']:
+            self.pdf.ln(6)
+            self.text_block(monster['description'], style='I')
+
+        self.pdf.ln(12)
+        self.pdf.set_font(FONT, '', 7)
+        self.pdf.set_text_color(*FOOTER_COLOR)
+        self.pdf.cell(self.width, 10, pdf_text(f'DD Monsters Campaign Manager - Generated by {author}'), align='C',
+                      new_x='LMARGIN', new_y='NEXT')
+        self.pdf.set_text_color(*TEXT_COLOR)
+
+def render_statblock_pdf(document):
+    """Lay a ``statblock_document`` out into PDF bytes (needs fpdf2)."""
+    return StatblockLayout().render(document)
@@ -0,0 +1,132 @@
+#!/usr/bin/env python
+"""
+Time how long a whole gunicorn worker fleet takes to come up.
+
+Starts gunicorn with the project's gunicorn_config.py on a throwaway database and
+measures the time from launch until the first and until every worker has loaded
+the app, then the fleet's total memory (PSS, so pages shared after a preloaded
+fork are only counted once). Two boots are compared:
+
+    create_all   every worker imports the app and runs db.create_all()
+    production   the master loads the app once (preload_app), checks the
+                 migrations head, and the workers are forked from it
+
+    python benchmarks/bench_cold_start.py --workers 9 --runs 3
+
+Pass ``--database-url`` to boot against another database (e.g. an empty
+PostgreSQL database); by default a temporary SQLite file is used.
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+MODES = {
+    'create_all': {'preload_app': False, 'auto_create_schema': True},
+    'production': {'preload_app': True, 'auto_create_schema': False},
+}
+
+# The project's config plus a hook recording each worker once it has loaded the app
+CONFIG_TEMPLATE = '''
+exec(open({project_config!r}).read())
+bind = {bind!r}
+workers = {workers}
+preload_app = {preload_app}
+accesslog = None
+
+def post_worker_init(worker):
+    with open({ready_file!r}, 'a') as f:
+        f.write(f"{{time.time()}} {{worker.pid}}\\n")
+
+import time
+'''
+
+def prepare_database(database_url):
+    """Create the schema once and stamp it with the migrations head, as a deploy would."""
+    from flask_migrate import stamp
+    from app import create_app
+
+    app = create_app({'SQLALCHEMY_DATABASE_URI': database_url, 'AUTO_CREATE_SCHEMA': True})
+    with app.app_context():
+        stamp()
+
+def fleet_pss_mb(pid):
+    """Total proportional set size of a process and its children in MB, or None if unknown."""
+    pids = [pid]
+    try:
+        with open(f'/proc/{pid}/task/{pid}/children') as f:
+            pids += [int(child) for child in f.read().split()]
+        total = 0
+        for process in pids:
+            with open(f'/proc/{process}/smaps_rollup') as f:
+                total += sum(int(line.split()[1]) for line in f if line.startswith('Pss:'))
+        return total / 1024
+    except OSError:
+        return None
+
+def boot_fleet(mode, args, database_url, folder, port):
+    """Start gunicorn, wait for every worker, and return (first ready s, all ready s, PSS MB)."""
+    ready_file = os.path.join(folder, f'ready-{mode}')
+    if os.path.exists(ready_file):
+        os.remove(ready_file)
+    config_file = os.path.join(folder, f'gunicorn-{mode}.py')
+    with open(config_file, 'w') as f:
+        f.write(CONFIG_TEMPLATE.format(
+            project_config=os.path.join(PROJECT_ROOT, 'gunicorn_config.py'), bind=f'127.0.0.1:{port}',
+            workers=args.workers, preload_app=MODES[mode]['preload_app'], ready_file=ready_file,
+        ))
+    app_spec = (f"app:create_app({{'SQLALCHEMY_DATABASE_URI': {database_url!r}, 'SECRET_KEY': 'bench', "
+                f"'AUTO_CREATE_SCHEMA': {MODES[mode]['auto_create_schema']}}})")
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=os.path.join(folder, 'metrics'))
+
+    start = time.time()
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', config_file, app_spec],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        ready = []
+        while len(ready) < args.workers:
+            if server.poll() is not None:
+                raise RuntimeError(f'gunicorn exited:\n{server.stderr.read().decode()}')
+            if time.time() - start > args.timeout:
+                raise RuntimeError(f'only {len(ready)} of {args.workers} workers ready after {args.timeout}s')
+            time.sleep(0.01)
+            if os.path.exists(ready_file):
+                with open(ready_file) as f:
+                    ready = [float(line.split()[0]) for line in f if line.strip()]
+        return min(ready) - start, max(ready) - start, fleet_pss_mb(server.pid)
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=(os.cpu_count() or 1) * 2 + 1, help='workers in the fleet')
+    parser.add_argument('--runs', type=int, default=3, help='fleets started per mode')
+    parser.add_argument('--port', type=int, default=8765, help='port the fleets listen on')
+    parser.add_argument('--timeout', type=float, default=120, help='seconds to wait for a fleet')
+    parser.add_argument('--database-url', help='empty database to set up instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(folder, 'bench.sqlite')
+        prepare_database(database_url)
+
+        print(f"{args.workers} workers\n")
+        print(f"{'mode':<11} {'first worker s':>15} {'all workers s':>14} {'fleet PSS MB':>13}")
+        for mode in MODES:
+            results = [boot_fleet(mode, args, database_url, folder, args.port) for _ in range(args.runs)]
+            pss = [result[2] for result in results if result[2] is not None]
+            print(f"{mode:<11} {statistics.median(r[0] for r in results):>15.2f} "
+                  f"{statistics.median(r[1] for r in results):>14.2f} "
+                  f"{(f'{statistics.median(pss):.0f}' if pss else 'n/a'):>13}")
+
+if __name__ == '__main__':
+    main()
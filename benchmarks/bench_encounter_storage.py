@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Compare storing encounter monsters as statblock copies and as participants.
+
+Fills two throwaway SQLite databases with ``--encounters`` encounters of
+``--copies`` monsters each, built from a handful of statblocks with full-size
+actions and descriptions:
+
+    copies         one Monster row per monster, as encounters were stored before
+    participants   one statblock per encounter and one encounter_monster row per
+                   monster, added with add_participants
+
+and prints the time to add the monsters, the rows written and the database
+size after a VACUUM:
+
+    python benchmarks/bench_encounter_storage.py --encounters 2000 --copies 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import text
+
+STATBLOCK = {
+    'size': 'Small', 'type': 'humanoid (goblinoid)', 'alignment': 'neutral evil', 'armor_class': 15,
+    'armor_type': 'leather armor, shield', 'hit_points': 7, 'hit_dice': '2d6', 'speed': '30 ft.',
+    'skills': 'Stealth +6', 'senses': 'darkvision 60 ft., passive Perception 9', 'languages': 'Common, Goblin',
+    'challenge_rating': '1/4', 'xp': 50,
+    'special_abilities': 'Nimble Escape. The goblin can take the Disengage or Hide action as a bonus action '
+                         'on each of its turns. ' * 4,
+    'actions': 'Scimitar. Melee Weapon Attack: +4 to hit, reach 5 ft., one target. Hit: 5 (1d6 + 2) slashing '
+               'damage.\nShortbow. Ranged Weapon Attack: +4 to hit, range 80/320 ft., one target. Hit: 5 '
+               '(1d6 + 2) piercing damage. ' * 3,
+    'description': 'Goblins are small, black-hearted humanoids that lair in despoiled dungeons and other '
+                   'dismal settings. ' * 8,
+}
+
+def seed_copies(db, Monster, encounter_ids, copies):
+    for encounter_id in encounter_ids:
+        db.session.add_all([Monster(name='Goblin', campaign_id=1, encounter_id=encounter_id, **STATBLOCK)
+                            for _ in range(copies)])
+    db.session.commit()
+
+def seed_participants(db, Monster, encounter_ids, copies):
+    from app.utils.encounter_monsters import add_participants
+    for encounter_id in encounter_ids:
+        goblin = Monster(name='Goblin', campaign_id=1, encounter_id=encounter_id, **STATBLOCK)
+        db.session.add(goblin)
+        db.session.flush()
+        add_participants(encounter_id, goblin, copies)
+    db.session.commit()
+
+MODES = {
+    'copies': seed_copies,
+    'participants': seed_participants,
+}
+
+def run(mode, args, folder):
+    from app import create_app, db
+    from app.models.campaign import Campaign
+    from app.models.encounter import Encounter
+    from app.models.monster import Monster
+    from app.models.user import User
+
+    path = os.path.join(folder, f'{mode}.sqlite')
+    app = create_app({'SQLALCHEMY_DATABASE_URI': f'sqlite:///{path}', 'SECRET_KEY': 'bench'})
+    with app.app_context():
+        db.session.add(User(id=1, username='bench', email='bench@example.com'))
+        db.session.add(Campaign(id=1, title='Benchmark', user_id=1))
+        db.session.add_all([Encounter(id=i, name=f'Encounter {i}', campaign_id=1)
+                            for i in range(1, args.encounters + 1)])
+        db.session.commit()
+
+        start = time.perf_counter()
+        MODES[mode](db, Monster, range(1, args.encounters + 1), args.copies)
+        elapsed = time.perf_counter() - start
+
+        rows = db.session.execute(text('SELECT COUNT(*) FROM monster')).scalar()
+        if mode == 'participants':
+            rows += db.session.execute(text('SELECT COUNT(*) FROM encounter_monster')).scalar()
+        db.session.execute(text('PRAGMA wal_checkpoint(TRUNCATE)'))
+        db.session.commit()
+        with db.engine.connect() as connection:
+            connection.execution_options(isolation_level='AUTOCOMMIT').execute(text('VACUUM'))
+        db.engine.dispose()
+
+    size = os.path.getsize(path) / 1024 / 1024
+    print(f"{mode:<13} {elapsed:>9.2f} {rows:>9} {size:>9.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--encounters', type=int, default=2000, help='encounters to fill')
+    parser.add_argument('--copies', type=int, default=8, help='monsters per encounter')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{args.encounters} encounters x {args.copies} goblins\n")
+        print(f"{'mode':<13} {'seconds':>9} {'rows':>9} {'MB':>9}")
+        for mode in MODES:
+            run(mode, args, folder)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Show what the foreign key indexes do to the list queries on a large database.
+
+Seeds a throwaway database with many campaigns and encounters and 100k monsters,
+then runs the queries the list pages make, first with the foreign key indexes
+dropped and then with them in place, printing each query's plan and timing:
+
+    python benchmarks/bench_indexes.py --monsters 100000
+
+Pass ``--database-url`` to run against another database (e.g. an empty
+PostgreSQL database); by default a temporary SQLite file is used.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert, text
+
+# Indexes added by the add_foreign_key_indexes, add_monster_cr_value and
+# add_monster_cr_sort_index migrations
+INDEXES = [
+    'ix_campaign_user_id',
+    'ix_encounter_campaign_id',
+    'ix_npc_campaign_id',
+    'ix_player_campaign_id',
+    'ix_scan_job_campaign_id',
+    'ix_monster_encounter_id',
+    'ix_monster_campaign_id_encounter_id',
+    'ix_event_campaign_id_event_date',
+    'ix_event_npcs_npc_id',
+    'ix_monster_campaign_id_cr_value',
+    'ix_monster_campaign_id_encounter_id_cr_sort',
+]
+
+CHUNK_SIZE = 5000
+
+def insert_rows(table, rows):
+    from app import db
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(table), rows[start:start + CHUNK_SIZE])
+
+def seed(args):
+    """Fill the database: ``--campaigns`` campaigns spread over ten users, ``--monsters`` monsters."""
+    from app import db
+    from app.models.user import User
+    from app.models.campaign import Campaign
+    from app.models.encounter import Encounter
+    from app.models.monster import Monster
+    from app.models.npc import NPC
+    from app.models.event import Event
+    from app.models.player import Player
+
+    rng = random.Random(0)
+    users = 10
+    encounters = args.campaigns * args.encounters
+    insert_rows(User.__table__, [{'id': i, 'username': f'user{i}', 'email': f'user{i}@example.com'}
+                                 for i in range(1, users + 1)])
+    insert_rows(Campaign.__table__, [{'id': i, 'title': f'Campaign {i}', 'user_id': i % users + 1}
+                                     for i in range(1, args.campaigns + 1)])
+    insert_rows(Encounter.__table__, [{'id': i, 'name': f'Encounter {i}', 'campaign_id': (i - 1) // args.encounters + 1}
+                                      for i in range(1, encounters + 1)])
+
+    monsters = []
+    for i in range(1, args.monsters + 1):
+        campaign_id = rng.randint(1, args.campaigns)
+        # Two monsters in three are placed in one of their campaign's encounters
+        encounter_id = None
+        if rng.random() < 2 / 3:
+            encounter_id = (campaign_id - 1) * args.encounters + rng.randint(1, args.encounters)
+        monsters.append({'name': f'Monster {i}', 'campaign_id': campaign_id, 'encounter_id': encounter_id,
+                         'challenge_rating': str(rng.randint(0, 30))})
+    insert_rows(Monster.__table__, monsters)
+
+    per_campaign = max(1, args.monsters // args.campaigns // 10)
+    insert_rows(NPC.__table__, [{'name': f'NPC {i}', 'role': 'Villager', 'attitude': 'neutral',
+                                 'campaign_id': rng.randint(1, args.campaigns)}
+                                for i in range(args.campaigns * per_campaign)])
+    insert_rows(Event.__table__, [{'title': f'Event {i}', 'event_date': f'Day {rng.randint(1, 365):03d}',
+                                   'campaign_id': rng.randint(1, args.campaigns)}
+                                  for i in range(args.campaigns * per_campaign)])
+    insert_rows(Player.__table__, [{'name': f'Player {i}', 'campaign_id': rng.randint(1, args.campaigns)}
+                                   for i in range(args.campaigns * 5)])
+    db.session.commit()
+
+def list_queries(args):
+    """The queries the list pages run, as (label, statement) pairs."""
+    from app.models.campaign import Campaign
+    from app.models.encounter import Encounter
+    from app.models.monster import Monster
+    from app.models.npc import NPC
+    from app.models.event import Event
+    from app.models.player import Player
+
+    campaign_id = args.campaigns // 2
+    encounter_id = (campaign_id - 1) * args.encounters + 1
+    return [
+        ('campaigns of a user', Campaign.query.filter_by(user_id=3)),
+        ('campaign bestiary', Monster.query.filter_by(campaign_id=campaign_id, encounter_id=None)),
+        ('bestiary size', Monster.query.filter_by(campaign_id=campaign_id).with_entities(Monster.id)),
+        ('encounter monsters', Monster.query.filter_by(encounter_id=encounter_id)),
+        ('bestiary CR 5-10', Monster.query.filter(Monster.campaign_id == campaign_id, Monster.cr_value.between(5, 10))
+                             .order_by(Monster.cr_sort, Monster.name, Monster.id)),
+        ('bestiary by CR', Monster.query.filter_by(campaign_id=campaign_id, encounter_id=None)
+                           .order_by(Monster.cr_sort, Monster.name, Monster.id).limit(50)),
+        ('encounters', Encounter.query.filter_by(campaign_id=campaign_id)),
+        ('events by date', Event.query.filter_by(campaign_id=campaign_id).order_by(Event.event_date.desc())),
+        ('npcs', NPC.query.filter_by(campaign_id=campaign_id).order_by(NPC.name)),
+        ('players', Player.query.filter_by(campaign_id=campaign_id)),
+    ]
+
+def explain(connection, statement):
+    sql = str(statement.compile(dialect=connection.dialect, compile_kwargs={'literal_binds': True}))
+    if connection.dialect.name == 'sqlite':
+        rows = connection.execute(text(f'EXPLAIN QUERY PLAN {sql}')).fetchall()
+        return '; '.join(row[-1] for row in rows)
+    rows = connection.execute(text(f'EXPLAIN {sql}')).fetchall()
+    return '; '.join(row[0].strip() for row in rows)
+
+def measure(connection, statement, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        connection.execute(statement).fetchall()
+    return (time.perf_counter() - start) / number * 1000
+
+def run_queries(queries, number):
+    from app import db
+    with db.engine.connect() as connection:
+        return {label: (explain(connection, query.statement), measure(connection, query.statement, number))
+                for label, query in queries}
+
+def set_indexes(present):
+    """Create or drop the foreign key indexes, then refresh the planner statistics."""
+    from app import db
+    indexes = [index for table in db.metadata.tables.values() for index in table.indexes if index.name in INDEXES]
+    with db.engine.begin() as connection:
+        for index in indexes:
+            # Not checkfirst: the SQLite inspector doesn't list expression indexes
+            connection.execute(text(f'DROP INDEX IF EXISTS {index.name}'))
+            if present:
+                index.create(connection)
+        connection.execute(text('ANALYZE'))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--monsters', type=int, default=100000, help='monsters to seed')
+    parser.add_argument('--campaigns', type=int, default=500, help='campaigns to seed')
+    parser.add_argument('--encounters', type=int, default=20, help='encounters per campaign')
+    parser.add_argument('--number', type=int, default=50, help='timed runs of each query')
+    parser.add_argument('--database-url', help='empty database to seed instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    from app import create_app, db
+
+    with tempfile.TemporaryDirectory() as folder:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(folder, 'bench.sqlite')
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': database_url})
+        with app.app_context():
+            start = time.perf_counter()
+            seed(args)
+            print(f"Seeded {args.monsters} monsters in {args.campaigns} campaigns in {time.perf_counter() - start:.1f}s\n")
+
+            queries = list_queries(args)
+            set_indexes(False)
+            before = run_queries(queries, args.number)
+            set_indexes(True)
+            after = run_queries(queries, args.number)
+
+            print(f"{'query':<20} {'no index ms':>12} {'indexed ms':>11} {'speedup':>8}")
+            for label, _ in queries:
+                print(f"{label:<20} {before[label][1]:>12.3f} {after[label][1]:>11.3f} "
+                      f"{before[label][1] / after[label][1]:>7.1f}x")
+            print()
+            for label, _ in queries:
+                print(f"{label}\n  before: {before[label][0]}\n  after:  {after[label][0]}")
+
+            if args.database_url:
+                db.drop_all()
+
+if __name__ == '__main__':
+    main()
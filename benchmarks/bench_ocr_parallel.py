@@ -0,0 +1,51 @@
+#!/usr/bin/env python
+"""
+Compare serial and parallel latency of simple_ocr.extract_text_from_image.
+
+Run from the project root (Tesseract must be installed):
+
+    python benchmarks/bench_ocr_parallel.py --repeat 5 --workers 3
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.statblock_images import statblock_images
+from app.utils import simple_ocr
+
+def time_extraction(image_bytes, max_workers, repeat, score_threshold=None):
+    """Return the per-call wall-clock timings (in seconds) of extract_text_from_image."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        simple_ocr.extract_text_from_image(image_bytes, max_workers=max_workers, score_threshold=score_threshold)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs per fixture and mode')
+    parser.add_argument('--workers', type=int, default=simple_ocr.OCR_MAX_WORKERS,
+                        help='concurrency limit for the parallel mode')
+    parser.add_argument('--score-threshold', type=float, default=simple_ocr.OCR_SCORE_THRESHOLD,
+                        help='early-exit statblock score, use a value above 1 to always run every pass')
+    args = parser.parse_args()
+    
+    images = statblock_images()
+    
+    # Warm up the thread pool and the OS file cache for the tesseract binary
+    simple_ocr.extract_text_from_image(next(iter(images.values())), max_workers=args.workers)
+    
+    print(f"{'fixture':<22} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    for name, image_bytes in images.items():
+        serial = statistics.median(time_extraction(image_bytes, 1, args.repeat, args.score_threshold))
+        parallel = statistics.median(time_extraction(image_bytes, args.workers, args.repeat, args.score_threshold))
+        print(f"{name:<22} {serial * 1000:>10.1f} {parallel * 1000:>12.1f} {serial / parallel:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Compare the statblock PDF backends: wkhtmltopdf through pdfkit and the native
+fpdf2 layout.
+
+Each backend renders the benchmark statblocks (parsed into monsters, no database
+involved) one PDF at a time, on a single renderer worker:
+
+    python benchmarks/bench_pdf_render.py --renders 50
+
+Peak memory is the largest resident set size of the benchmark process or of any
+wkhtmltopdf process it started, each backend being measured in its own fresh
+process. Backends that aren't installed are skipped.
+"""
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.statblock_images import STATBLOCK_TEXTS
+
+BACKENDS = ['wkhtmltopdf', 'native']
+
+def max_rss_bytes(who):
+    rss = resource.getrusage(who).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def make_monsters():
+    """Transient monsters built from the benchmark statblock texts."""
+    from app.models.monster import Monster
+    from app.utils.statblock_parser import parse_statblock
+
+    columns = set(Monster.__table__.columns.keys())
+    monsters = []
+    for text in STATBLOCK_TEXTS.values():
+        data = {key: value for key, value in parse_statblock(text).items() if key in columns}
+        monsters.append(Monster(**data))
+    return monsters
+
+def measure(backend, renders, results):
+    """Render ``renders`` single-statblock PDFs with one backend in this (fresh) process."""
+    from app import create_app
+    from app.models.user import User
+    from app.models.campaign import Campaign
+    from app.utils.pdf_cache import PDF_TEMPLATE
+    from app.utils.pdf_renderer import render_statblocks, PDFRenderError
+
+    app = create_app({
+        'TESTING': True,
+        'SQLALCHEMY_DATABASE_URI': 'sqlite://',
+        'PDF_BACKEND': backend,
+        'PDF_RENDER_WORKERS': 1,
+    })
+    with app.app_context():
+        campaign = Campaign(title='Benchmark', owner=User(username='benchmark'))
+        monsters = make_monsters()
+        try:
+            # The first render warms the backend (and checks it is installed)
+            render_statblocks(campaign, monsters[:1], PDF_TEMPLATE)
+        except PDFRenderError as e:
+            results.put((None, str(e)))
+            return
+
+        start = time.perf_counter()
+        for index in range(renders):
+            monster = monsters[index % len(monsters)]
+            render_statblocks(campaign, [monster], PDF_TEMPLATE)
+        elapsed = time.perf_counter() - start
+
+    peak = max(max_rss_bytes(resource.RUSAGE_SELF), max_rss_bytes(resource.RUSAGE_CHILDREN))
+    results.put((renders / elapsed, peak))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--renders', type=int, default=50, help='timed renders per backend')
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context('spawn')
+
+    print(f"{'backend':<12} {'renders/s':>10} {'peak MB':>9}")
+    for backend in BACKENDS:
+        results = context.Queue()
+        process = context.Process(target=measure, args=(backend, args.renders, results))
+        process.start()
+        rate, peak = results.get()
+        process.join()
+        if rate is None:
+            print(f"{backend:<12} skipped: {peak}")
+        else:
+            print(f"{backend:<12} {rate:>10.1f} {peak / 1024 / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    main()
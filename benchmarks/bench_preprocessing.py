@@ -0,0 +1,108 @@
+#!/usr/bin/env python
+"""
+Compare latency and peak memory of the simple_ocr preprocessing variants with
+the per-variant PIL pipeline they replaced, on a 12MP (4000x3000) photo.
+
+No OCR is run, only the three preprocessing variants:
+
+    python benchmarks/bench_preprocessing.py --repeat 3
+
+Peak memory is the growth of the resident set size while a pipeline runs, each
+pipeline being measured in its own fresh process.
+"""
+import argparse
+import io
+import multiprocessing
+import os
+import resource
+import statistics
+import sys
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from PIL import Image, ImageEnhance, ImageFilter
+from benchmarks.statblock_images import ANCIENT_RED_DRAGON, render_statblock
+
+PARCHMENT = (253, 241, 220)
+
+def photo_bytes(width=4000, height=3000):
+    """A parchment statblock filling a 12MP photo, as JPEG bytes."""
+    block = Image.open(io.BytesIO(render_statblock(ANCIENT_RED_DRAGON, background=PARCHMENT)))
+    photo = Image.new('RGB', (width, height), color=(70, 50, 35))
+    scale = min(width / block.width, height / block.height) * 0.9
+    block = block.resize((int(block.width * scale), int(block.height * scale)), Image.BICUBIC)
+    photo.paste(block, ((width - block.width) // 2, (height - block.height) // 2))
+    img_io = io.BytesIO()
+    photo.save(img_io, 'JPEG', quality=90)
+    return img_io.getvalue()
+
+def legacy_preprocess(image_bytes):
+    """The preprocessing the vectorized variants replaced (full-size, one conversion per variant)."""
+    image = Image.open(io.BytesIO(image_bytes))
+    if image.width < 800:
+        ratio = 800 / image.width
+        image = image.resize((800, int(image.height * ratio)), Image.LANCZOS)
+
+    gray_image = image.convert('L')
+    high_contrast = ImageEnhance.Contrast(gray_image).enhance(2.0)
+    sharpened = high_contrast.filter(ImageFilter.SHARPEN)
+    thresholded = image.convert('L').point(lambda p: 255 if p > 150 else 0)
+    filtered = image.filter(ImageFilter.EDGE_ENHANCE)
+    edge_thresholded = filtered.convert('L').point(lambda p: 255 if p > 120 else 0)
+    return [sharpened, thresholded, edge_thresholded]
+
+def current_preprocess(image_bytes):
+    """The current pipeline: normalize once, share the grayscale image, LUT thresholds."""
+    from app.utils.ocr_normalize import load_normalized_image
+    from app.utils.simple_ocr import PREPROCESSING_VARIANTS
+
+    gray_image = load_normalized_image(image_bytes, mode='L')
+    return [variant(gray_image) for variant in PREPROCESSING_VARIANTS]
+
+PIPELINES = {
+    'legacy': legacy_preprocess,
+    'current': current_preprocess,
+}
+
+def max_rss_bytes():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return rss if sys.platform == 'darwin' else rss * 1024
+
+def measure(name, image_bytes, repeat, results):
+    """Run one pipeline in this (fresh) process and report its timings and peak memory."""
+    pipeline = PIPELINES[name]
+    # Import everything the pipeline needs before taking the memory baseline
+    if name == 'current':
+        import app.utils.simple_ocr  # noqa: F401
+
+    baseline = max_rss_bytes()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        images = pipeline(image_bytes)
+        timings.append(time.perf_counter() - start)
+        del images
+    results.put((timings, max_rss_bytes() - baseline))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3, help='timed runs per pipeline')
+    args = parser.parse_args()
+
+    image_bytes = photo_bytes()
+    context = multiprocessing.get_context('spawn')
+
+    print(f"{'pipeline':<10} {'median ms':>10} {'peak MB':>9}")
+    for name in PIPELINES:
+        results = context.Queue()
+        process = context.Process(target=measure, args=(name, image_bytes, args.repeat, results))
+        process.start()
+        timings, peak = results.get()
+        process.join()
+        print(f"{name:<10} {statistics.median(timings) * 1000:>10.1f} {peak / 1024 / 1024:>9.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Time campaign full-text searches on a large database.
+
+Seeds a throwaway database with one large campaign among many smaller ones
+(statblock text from the benchmark statblocks, so common words like "attack"
+match most monsters) and times ``search_campaign`` for rare, common and prefix
+queries in the large campaign:
+
+    python benchmarks/bench_search.py --monsters 100000 --campaign-size 20000
+
+Pass ``--database-url`` to run against another database (e.g. an empty
+PostgreSQL database); by default a temporary SQLite file is used.
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from sqlalchemy import insert
+from benchmarks.statblock_images import STATBLOCK_TEXTS
+
+QUERIES = ['pack tactics', 'attack', 'fire breath', 'drag', 'yawning portal', 'nothing matches this']
+
+CHUNK_SIZE = 5000
+
+FLAVOUR = [
+    'Pack Tactics. The creature has advantage on an attack roll against a creature if at least one of its allies is within 5 feet.',
+    'Keen Smell. The creature has advantage on Wisdom (Perception) checks that rely on smell.',
+    'Sunlight Sensitivity. While in sunlight, the creature has disadvantage on attack rolls.',
+    'Magic Resistance. The creature has advantage on saving throws against spells and other magical effects.',
+]
+
+PLACES = ['the Yawning Portal', 'the docks of Waterdeep', 'a roadside shrine', 'the old mill', 'the city watch barracks']
+
+def insert_rows(table, rows):
+    from app import db
+    for start in range(0, len(rows), CHUNK_SIZE):
+        db.session.execute(insert(table), rows[start:start + CHUNK_SIZE])
+
+def seed(args):
+    """Seed ``--monsters`` monsters, ``--campaign-size`` of them in campaign 1."""
+    from app import db
+    from app.models.user import User
+    from app.models.campaign import Campaign
+    from app.models.encounter import Encounter
+    from app.models.monster import Monster
+    from app.models.npc import NPC
+    from app.models.event import Event
+    from app.models.loot import Loot
+    from app.utils.statblock_parser import parse_statblock
+
+    rng = random.Random(0)
+    statblocks = [parse_statblock(text) for text in STATBLOCK_TEXTS.values()]
+    insert_rows(User.__table__, [{'id': 1, 'username': 'benchmark', 'email': 'benchmark@example.com'}])
+    insert_rows(Campaign.__table__, [{'id': i, 'title': f'Campaign {i}', 'user_id': 1}
+                                     for i in range(1, args.campaigns + 1)])
+    insert_rows(Encounter.__table__, [{'id': i, 'name': f'Encounter {i}', 'campaign_id': i}
+                                      for i in range(1, args.campaigns + 1)])
+
+    def campaign_id(index):
+        return 1 if index < args.campaign_size else rng.randint(2, args.campaigns)
+
+    monsters = []
+    for i in range(args.monsters):
+        statblock = statblocks[i % len(statblocks)]
+        monsters.append({
+            'name': f"{statblock.get('name') or 'Monster'} {i}",
+            'type': statblock.get('type'),
+            'special_abilities': ' '.join(rng.sample(FLAVOUR, 2)) + ' ' + (statblock.get('special_abilities') or ''),
+            'actions': statblock.get('actions'),
+            'campaign_id': campaign_id(i),
+        })
+    insert_rows(Monster.__table__, monsters)
+
+    others = args.monsters // 5
+    insert_rows(NPC.__table__, [{'name': f'NPC {i}', 'role': 'Villager', 'attitude': 'neutral',
+                                 'description': rng.choice(FLAVOUR),
+                                 'places_to_find': f'Usually found at {rng.choice(PLACES)}.',
+                                 'campaign_id': campaign_id(i * 5)} for i in range(others)])
+    insert_rows(Event.__table__, [{'title': f'Event {i}', 'description': f'Something happened at {rng.choice(PLACES)}.',
+                                   'campaign_id': campaign_id(i * 5)} for i in range(others)])
+    insert_rows(Loot.__table__, [{'name': f'Loot {i}', 'description': 'A fire-blackened dragon scale.',
+                                  'quantity': 1, 'attunement': False, 'encounter_id': campaign_id(i * 5),
+                                  'campaign_id': campaign_id(i * 5)} for i in range(others)])
+    db.session.commit()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--monsters', type=int, default=100000, help='monsters to seed')
+    parser.add_argument('--campaigns', type=int, default=100, help='campaigns to seed')
+    parser.add_argument('--campaign-size', type=int, default=20000, help='monsters in the searched campaign')
+    parser.add_argument('--number', type=int, default=20, help='timed runs of each query')
+    parser.add_argument('--database-url', help='empty database to seed instead of a temporary SQLite file')
+    args = parser.parse_args()
+
+    from app import create_app, db
+    from app.utils.search import search_campaign
+
+    with tempfile.TemporaryDirectory() as folder:
+        database_url = args.database_url or 'sqlite:///' + os.path.join(folder, 'bench.sqlite')
+        app = create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': database_url})
+        with app.test_request_context():
+            start = time.perf_counter()
+            seed(args)
+            print(f"Seeded {args.monsters} monsters, {args.campaign_size} in the searched campaign, "
+                  f"in {time.perf_counter() - start:.1f}s\n")
+
+            print(f"{'query':<22} {'results':>7} {'p50 ms':>8} {'p95 ms':>8}")
+            for query in QUERIES:
+                timings = []
+                for _ in range(args.number):
+                    start = time.perf_counter()
+                    results = search_campaign(1, query)
+                    timings.append((time.perf_counter() - start) * 1000)
+                    db.session.expunge_all()
+                timings.sort()
+                p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+                print(f"{query:<22} {len(results):>7} {statistics.median(timings):>8.2f} {p95:>8.2f}")
+
+            if args.database_url:
+                db.drop_all()
+
+if __name__ == '__main__':
+    main()
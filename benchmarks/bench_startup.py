@@ -0,0 +1,93 @@
+#!/usr/bin/env python
+"""
+Measure how long a web worker takes to boot the app and how much memory it holds.
+
+Each run starts a fresh interpreter that imports the app and calls create_app,
+like a gunicorn worker does, and reports the import and create_app times, the
+resident memory afterwards and which heavy modules got loaded. The ``eager`` mode
+also imports the OCR pipeline and PDF backend up front, as the monsters blueprint
+used to at import time; ``lazy`` is the current behaviour:
+
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+HEAVY_MODULES = ['cv2', 'numpy', 'PIL', 'pytesseract', 'tesserocr', 'pdfkit', 'fpdf']
+
+MODES = ['eager', 'lazy']
+
+def rss_mb():
+    """Resident memory of this process in MB (from /proc, else the peak from getrusage)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmRSS:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+def boot(mode):
+    """Boot the app once in this process and print the measurements as JSON."""
+    start = time.perf_counter()
+    if mode == 'eager':
+        from app.utils.ocr_pipeline import get_ocr_pipeline
+        get_ocr_pipeline()
+        try:
+            import pdfkit
+        except ImportError:
+            pass
+    from app import create_app
+    imported = time.perf_counter()
+
+    with tempfile.TemporaryDirectory() as folder:
+        create_app({'TESTING': True, 'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(folder, 'bench.sqlite')})
+        created = time.perf_counter()
+
+    print(json.dumps({
+        'import_ms': (imported - start) * 1000,
+        'create_ms': (created - imported) * 1000,
+        'rss_mb': rss_mb(),
+        'modules': [name for name in HEAVY_MODULES if name in sys.modules],
+    }))
+
+def run(mode):
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='fresh interpreters started per mode')
+    parser.add_argument('--mode', choices=MODES, action='append', help='only run these modes')
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        boot(args.child)
+        return
+
+    print(f"{'mode':<6} {'import ms':>10} {'create_app ms':>14} {'RSS MB':>8}  heavy modules loaded")
+    for mode in args.mode or MODES:
+        results = [run(mode) for _ in range(args.runs)]
+        print(f"{mode:<6} {statistics.median(r['import_ms'] for r in results):>10.0f} "
+              f"{statistics.median(r['create_ms'] for r in results):>14.0f} "
+              f"{statistics.median(r['rss_mb'] for r in results):>8.1f}  {', '.join(results[0]['modules']) or '-'}")
+
+if __name__ == '__main__':
+    main()
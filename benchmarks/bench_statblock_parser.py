@@ -0,0 +1,213 @@
+#!/usr/bin/env python
+"""
+Compare the single-pass statblock parser with the per-field regex parser it replaced.
+
+Both parsers run over the benchmark statblock texts and a full bestiary page with
+lore text after the statblock (no OCR involved):
+
+    python benchmarks/bench_statblock_parser.py --number 2000
+"""
+import argparse
+import os
+import re
+import sys
+import timeit
+
+# Add the project root to the Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from benchmarks.statblock_images import STATBLOCK_TEXTS, ANCIENT_RED_DRAGON
+from app.utils.statblock_parser import parse_statblock
+
+LAIR_LORE = "The dragon's lair is a place of smoke and fire, where the heat of the mountain mixes with the stench of sulfur and old bones."
+
+FULL_PAGE = ANCIENT_RED_DRAGON + """
+
+LEGENDARY ACTIONS
+The dragon can take 3 legendary actions, choosing from the options below.
+Detect. The dragon makes a Wisdom (Perception) check.
+Tail Attack. The dragon makes a tail attack.
+
+LAIR ACTIONS
+""" + '\n'.join([LAIR_LORE] * 40)
+
+FIXTURES = dict(STATBLOCK_TEXTS, full_page=FULL_PAGE)
+
+def legacy_parse_monster_data(text):
+    """The per-field regex parser the single-pass parser replaced."""
+    if not text:
+        return {}
+    
+    monster_data = {}
+    
+    # Extract monster name (usually first line)
+    lines = text.split('\n')
+    if lines:
+        monster_data['name'] = lines[0].strip()
+    
+    # Extract size, type, and alignment
+    # More flexible pattern to match various OCR outputs
+    size_type_pattern = r"(?:^|\n)(?:Size:?\s+)?([A-Za-z]+)\s+([A-Za-z]+),\s+([A-Za-z\s]+)"
+    size_type_match = re.search(size_type_pattern, text)
+    if size_type_match:
+        monster_data['size'] = size_type_match.group(1).lower()
+        monster_data['type'] = size_type_match.group(2).lower()
+        monster_data['alignment'] = size_type_match.group(3).lower()
+    
+    # Extract Armor Class with more flexible pattern
+    ac_pattern = r"(?:AC|Armor\s+Class):?\s*(\d+)"
+    ac_match = re.search(ac_pattern, text)
+    if ac_match:
+        monster_data['armor_class'] = int(ac_match.group(1))
+    
+    # Extract Hit Points with more flexible pattern
+    hp_pattern = r"(?:HP|Hit\s+Points):?\s*(\d+)"
+    hp_match = re.search(hp_pattern, text)
+    if hp_match:
+        monster_data['hit_points'] = int(hp_match.group(1))
+    
+    # Extract Hit Dice
+    hit_dice_pattern = r"\(([0-9d+\s]+)\)"
+    hit_dice_match = re.search(hit_dice_pattern, text)
+    if hit_dice_match and 'd' in hit_dice_match.group(1):
+        monster_data['hit_dice'] = hit_dice_match.group(1)
+    
+    # Extract Speed
+    speed_pattern = r"(?:Speed):?\s+([^.]+?)(?:\n|$)"
+    speed_match = re.search(speed_pattern, text)
+    if speed_match:
+        monster_data['speed'] = speed_match.group(1).strip()
+    
+    # Extract ability scores - more robust patterns
+    str_pattern = r"(?:STR|Str|Strength):?\s+(\d+)"
+    dex_pattern = r"(?:DEX|Dex|Dexterity):?\s+(\d+)"
+    con_pattern = r"(?:CON|Con|Constitution):?\s+(\d+)"
+    int_pattern = r"(?:INT|Int|Intelligence):?\s+(\d+)"
+    wis_pattern = r"(?:WIS|Wis|Wisdom):?\s+(\d+)"
+    cha_pattern = r"(?:CHA|Cha|Charisma):?\s+(\d+)"
+    
+    str_match = re.search(str_pattern, text)
+    if str_match:
+        monster_data['strength'] = int(str_match.group(1))
+    
+    dex_match = re.search(dex_pattern, text)
+    if dex_match:
+        monster_data['dexterity'] = int(dex_match.group(1))
+    
+    con_match = re.search(con_pattern, text)
+    if con_match:
+        monster_data['constitution'] = int(con_match.group(1))
+    
+    int_match = re.search(int_pattern, text)
+    if int_match:
+        monster_data['intelligence'] = int(int_match.group(1))
+    
+    wis_match = re.search(wis_pattern, text)
+    if wis_match:
+        monster_data['wisdom'] = int(wis_match.group(1))
+    
+    cha_match = re.search(cha_pattern, text)
+    if cha_match:
+        monster_data['charisma'] = int(cha_match.group(1))
+    
+    # Extract Skills
+    skills_pattern = r"(?:Skills):?\s+([^.]+?)(?:\n|$)"
+    skills_match = re.search(skills_pattern, text)
+    if skills_match:
+        monster_data['skills'] = skills_match.group(1).strip()
+    
+    # Extract Senses
+    senses_pattern = r"(?:Senses):?\s+([^.]+?)(?:\n|$)"
+    senses_match = re.search(senses_pattern, text)
+    if senses_match:
+        monster_data['senses'] = senses_match.group(1).strip()
+    
+    # Extract Languages
+    languages_pattern = r"(?:Languages):?\s+([^.]+?)(?:\n|$)"
+    languages_match = re.search(languages_pattern, text)
+    if languages_match:
+        monster_data['languages'] = languages_match.group(1).strip()
+    
+    # Extract Challenge Rating - more flexible pattern
+    cr_pattern = r"(?:CR|Challenge):?\s*(\d+(?:\/\d+)?)"
+    cr_match = re.search(cr_pattern, text)
+    if cr_match:
+        monster_data['challenge_rating'] = cr_match.group(1)
+    
+    # Extract XP
+    xp_pattern = r"(?:XP):?\s*(\d+,?\d*)"
+    xp_match = re.search(xp_pattern, text)
+    if xp_match:
+        monster_data['xp'] = int(xp_match.group(1).replace(',', ''))
+    
+    # Extract Traits/Special Abilities, Actions, and Reactions
+    # More flexible section detection
+    traits_section = legacy_extract_section(text, ["TRAITS", "TRAIT", "Special Abilities", "Special"])
+    if traits_section:
+        monster_data['special_abilities'] = traits_section
+    
+    actions_section = legacy_extract_section(text, ["ACTIONS", "ACTION"])
+    if actions_section:
+        monster_data['actions'] = actions_section
+    
+    reactions_section = legacy_extract_section(text, ["REACTIONS", "REACTION"])
+    if reactions_section:
+        monster_data['reactions'] = reactions_section
+    
+    return monster_data
+
+def legacy_extract_section(text, section_names):
+    """Extract a section from the OCR text based on multiple possible section names."""
+    text = text.replace('\r', '\n')
+    
+    # Try to find the section start
+    start_index = -1
+    for name in section_names:
+        idx = text.find(name)
+        if idx != -1:
+            start_index = idx + len(name)
+            break
+    
+    if start_index == -1:
+        return None
+    
+    # Find the next section marker
+    section_markers = ["TRAITS", "ACTIONS", "REACTIONS", "LEGENDARY", "LAIR", "MYTHIC"]
+    end_index = len(text)
+    
+    for marker in section_markers:
+        if marker in section_names:  # Skip the current section name
+            continue
+        idx = text.find(marker, start_index)
+        if idx != -1 and idx < end_index:
+            end_index = idx
+    
+    # Extract the section content
+    section_text = text[start_index:end_index].strip()
+    
+    # Clean up the section
+    lines = section_text.split('\n')
+    clean_lines = []
+    for line in lines:
+        if line.strip():  # Skip empty lines
+            clean_lines.append(line.strip())
+    
+    return '\n'.join(clean_lines)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--number', type=int, default=1000, help='parses per timed run')
+    parser.add_argument('--repeat', type=int, default=5, help='timed runs, the best one is reported')
+    args = parser.parse_args()
+    
+    print(f"{'fixture':<22} {'regex us':>10} {'single-pass us':>15} {'speedup':>8} {'fields':>8}")
+    for name, text in FIXTURES.items():
+        legacy = min(timeit.repeat(lambda: legacy_parse_monster_data(text), number=args.number, repeat=args.repeat))
+        single = min(timeit.repeat(lambda: parse_statblock(text), number=args.number, repeat=args.repeat))
+        legacy_us = legacy / args.number * 1e6
+        single_us = single / args.number * 1e6
+        fields = f"{len(legacy_parse_monster_data(text))}/{len(parse_statblock(text))}"
+        print(f"{name:<22} {legacy_us:>10.1f} {single_us:>15.1f} {legacy / single:>7.2f}x {fields:>8}")
+
+if __name__ == '__main__':
+    main()
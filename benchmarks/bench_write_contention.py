@@ -0,0 +1,157 @@
+#!/usr/bin/env python
+"""
+Hammer a gunicorn fleet on SQLite with concurrent monster creates and edits.
+
+Starts gunicorn (the project's gunicorn_config.py, ``--workers`` processes) on a
+throwaway SQLite database and has ``--clients`` logged-in clients post the
+monsters.create and monsters.edit forms as fast as they can, reporting the
+throughput, latencies and failed writes (``database is locked`` shows up as a
+500). Two SQLite setups are compared:
+
+    rollback   the old defaults: rollback journal, synchronous=FULL, no mmap
+    wal        the app's defaults: WAL, synchronous=NORMAL, mmap
+
+    python benchmarks/bench_write_contention.py --workers 4 --clients 16 --requests 50
+"""
+import argparse
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from http.cookiejar import CookieJar
+
+# Add the project root to the Python path
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+MODES = {
+    'rollback': {'SQLITE_JOURNAL_MODE': 'DELETE', 'SQLITE_SYNCHRONOUS': 'FULL', 'SQLITE_MMAP_SIZE': 0},
+    'wal': {'SQLITE_JOURNAL_MODE': 'WAL', 'SQLITE_SYNCHRONOUS': 'NORMAL', 'SQLITE_MMAP_SIZE': 256 * 1024 * 1024},
+}
+
+CONFIG_TEMPLATE = '''
+exec(open({project_config!r}).read())
+bind = {bind!r}
+workers = {workers}
+accesslog = None
+'''
+
+MONSTER_FORM = {
+    'size': 'Medium', 'type': 'humanoid', 'alignment': 'neutral evil', 'armor_class': '15',
+    'armor_type': 'leather armor, shield', 'hit_points': '11', 'hit_dice': '2d8 + 2', 'speed': '30 ft.',
+    'strength': '13', 'dexterity': '12', 'constitution': '12', 'intelligence': '10', 'wisdom': '11',
+    'charisma': '10', 'challenge_rating': '1/8', 'xp': '25', 'actions': 'Scimitar. Melee Weapon Attack: +3 to hit.',
+}
+
+class NoRedirect(urllib.request.HTTPRedirectHandler):
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+def prepare_database(path, monsters, config):
+    """Create the schema, a user with a campaign and ``monsters`` monsters to edit."""
+    from app import create_app, db
+    from app.models.user import User
+    from app.models.campaign import Campaign
+    from app.models.monster import Monster
+
+    app = create_app(dict(config, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}'))
+    with app.app_context():
+        user = User(username='bench', email='bench@example.com')
+        user.set_password('bench')
+        db.session.add(user)
+        db.session.commit()
+        campaign = Campaign(title='Benchmark', user_id=user.id)
+        db.session.add(campaign)
+        db.session.commit()
+        db.session.add_all([Monster(name=f'Bandit {i}', campaign_id=campaign.id) for i in range(monsters)])
+        db.session.commit()
+        db.engine.dispose()
+
+def client(base_url, args, index, results):
+    """Log in, then alternate creating a monster and editing an existing one."""
+    opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(CookieJar()), NoRedirect)
+
+    def post(path, data):
+        start = time.perf_counter()
+        try:
+            status = opener.open(base_url + path, urllib.parse.urlencode(data).encode()).status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        return status, time.perf_counter() - start
+
+    post('/auth/login', {'username': 'bench', 'password': 'bench'})
+    for i in range(args.requests):
+        if i % 2:
+            monster_id = (index * args.requests + i) % args.monsters + 1
+            status, seconds = post(f'/campaigns/1/monsters/{monster_id}/edit', dict(MONSTER_FORM, name=f'Bandit {i}'))
+        else:
+            status, seconds = post('/campaigns/1/monsters/create', dict(MONSTER_FORM, name=f'Thug {index}-{i}'))
+        # Both forms redirect to the monster list when the write went through
+        results.append((status == 302, seconds))
+
+def run(mode, args, folder):
+    path = os.path.join(folder, f'{mode}.sqlite')
+    config = dict(MODES[mode], SECRET_KEY='bench', SQLITE_BUSY_TIMEOUT=args.busy_timeout)
+    prepare_database(path, args.monsters, config)
+
+    config_file = os.path.join(folder, 'gunicorn.py')
+    with open(config_file, 'w') as f:
+        f.write(CONFIG_TEMPLATE.format(project_config=os.path.join(PROJECT_ROOT, 'gunicorn_config.py'),
+                                       bind=f'127.0.0.1:{args.port}', workers=args.workers))
+    app_spec = f"app:create_app({dict(config, SQLALCHEMY_DATABASE_URI=f'sqlite:///{path}')!r})"
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=os.path.join(folder, 'metrics'))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', '-c', config_file, app_spec],
+                              cwd=PROJECT_ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f'http://127.0.0.1:{args.port}'
+    try:
+        for _ in range(300):
+            try:
+                urllib.request.urlopen(base_url + '/auth/login')
+                break
+            except OSError:
+                time.sleep(0.1)
+
+        results = []
+        threads = [threading.Thread(target=client, args=(base_url, args, index, results))
+                   for index in range(args.clients)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait()
+
+    latencies = sorted(seconds * 1000 for _, seconds in results)
+    failed = sum(1 for ok, _ in results if not ok)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{mode:<9} {len(results) / elapsed:>8.1f} {statistics.median(latencies):>8.1f} {p95:>8.1f} "
+          f"{latencies[-1]:>8.1f} {failed:>7}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn worker processes')
+    parser.add_argument('--clients', type=int, default=16, help='concurrent clients')
+    parser.add_argument('--requests', type=int, default=50, help='writes per client')
+    parser.add_argument('--monsters', type=int, default=200, help='monsters seeded for the edits')
+    parser.add_argument('--busy-timeout', type=int, default=5000, help='SQLITE_BUSY_TIMEOUT in ms for both modes')
+    parser.add_argument('--port', type=int, default=8766, help='port the fleet listens on')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        print(f"{args.workers} workers, {args.clients} clients x {args.requests} writes\n")
+        print(f"{'mode':<9} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8} {'failed':>7}")
+        for mode in MODES:
+            run(mode, args, folder)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Statblock fixtures shared by the benchmark scripts.
+
+The texts mirror the statblocks used in app/tests (test_ocr.py, test_ocr_utils.py
+and test_ocr_api.py) and are rendered to images so the OCR pipeline can be timed
+end to end.
+"""
+import io
+from PIL import Image, ImageDraw
+
+SPHINX_OF_WONDER = """SPHINX OF WONDER
+Tiny Celestial, Lawful Good
+AC 13
+HP 24 (7d4 + 7)
+Speed 20ft., Fly 40ft.
+
+STR   DEX   CON   INT   WIS   CHA
+6(-2) 17(+3) 13(+1) 15(+2) 11(+0) 11(+0)
+
+Skills: Arcana +4, Religion +4, Stealth +5
+Condition Immunities: Charmed, Paralyzed, Radiant
+Senses: Darkvision 60 ft., Passive Perception 11
+Languages: Common
+CR 1 (XP 200; PB +2)
+
+TRAITS
+Magic Resistance: The sphinx has Advantage on saving throws against spells and other magical effects.
+
+ACTIONS
+Bend, Make, Confuse Roll: +5, reach 5ft. Hit: (1d4 + 3) Slashing damage plus 7 (2d6) Radiant damage.
+
+REACTIONS
+Burst of Ingenuity (2/Day). Trigger: The sphinx or another creature within 10 feet makes an ability check or a saving throw. Response: The sphinx adds 2 to the roll."""
+
+ANCIENT_RED_DRAGON = """Ancient Red Dragon
+Gargantuan Dragon, Chaotic Evil
+
+AC 22 (natural armor)
+HP 546 (28d20 + 252)
+Speed 40 ft., climb 40 ft., fly 80 ft.
+
+STR 30 (+10)  DEX 10 (+0)  CON 29 (+9)
+INT 18 (+4)   WIS 15 (+2)  CHA 23 (+6)
+
+Saving Throws Dex +7, Con +16, Wis +9, Cha +13
+Skills Perception +16, Stealth +7
+Damage Immunities fire
+Senses blindsight 60 ft., darkvision 120 ft., passive Perception 26
+Languages Common, Draconic
+Challenge 24 (62,000 XP)
+
+TRAITS
+Legendary Resistance (3/Day). If the dragon fails a saving throw, it can choose to succeed instead.
+
+ACTIONS
+Multiattack. The dragon can use its Frightful Presence. It then makes three attacks: one with its bite and two with its claws.
+Bite. Melee Weapon Attack: +17 to hit, reach 15 ft., one target. Hit: 21 (2d10 + 10) piercing damage plus 14 (4d6) fire damage.
+
+REACTIONS
+Tail Attack. When a creature the dragon can see within 10 feet of it attacks it, the dragon makes a tail attack against that creature."""
+
+SIMPLE_DRAGON = """Dragon
+Medium Dragon, Neutral
+AC 15
+HP 50"""
+
+STATBLOCK_TEXTS = {
+    'sphinx_of_wonder': SPHINX_OF_WONDER,
+    'ancient_red_dragon': ANCIENT_RED_DRAGON,
+    'simple_dragon': SIMPLE_DRAGON,
+}
+
+def render_statblock(text, width=900, line_height=18, background=(255, 255, 255)):
+    """Render a statblock text onto an image and return it as PNG bytes."""
+    lines = text.split('\n')
+    height = line_height * (len(lines) + 2)
+    image = Image.new('RGB', (width, height), color=background)
+    draw = ImageDraw.Draw(image)
+    for i, line in enumerate(lines):
+        draw.text((10, 10 + i * line_height), line, fill='black')
+    
+    img_io = io.BytesIO()
+    image.save(img_io, 'PNG')
+    return img_io.getvalue()
+
+def statblock_images(**kwargs):
+    """Return a dict of fixture name -> PNG bytes for every statblock text."""
+    return {name: render_statblock(text, **kwargs) for name, text in STATBLOCK_TEXTS.items()}
@@ -1,5 +1,21 @@
+import os
+import glob
+import tempfile
 import multiprocessing
 
+# Prometheus metrics: every worker writes its samples to files in this folder and
+# /metrics adds them up. It has to be in the environment before the app is
+# imported, which is why it is set here rather than in the app config.
+prometheus_multiproc_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'ddmonsters-metrics'))
+# The app (and its metrics) is loaded before on_starting runs, see preload_app
+os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+
+# Production boot: the schema comes from `flask db upgrade` only instead of every
+# worker running db.create_all() (and racing the migrations); the master checks
+# once, in when_ready, that the database is at the migrations head.
+os.environ.setdefault('AUTO_CREATE_SCHEMA', '0')
+
 # Gunicorn configuration
 bind = "0.0.0.0:8000"
 workers = multiprocessing.cpu_count() * 2 + 1
@@ -9,6 +25,9 @@ worker_connections = 1000
 timeout = 30
 keepalive = 2
 
+# Import and create the app once in the master; workers are forked from it warm
+preload_app = True
+
 # Logging
 accesslog = "-"
 errorlog = "-"
@@ -24,4 +43,36 @@ proc_name = "ddmonsters"
 # Security
 limit_request_line = 4094
 limit_request_fields = 100
-limit_request_field_size = 8190 
\ No newline at end of file
+limit_request_field_size = 8190 
+
+# Server hooks
+def on_starting(server):
+    # Samples left over from a previous run would be added to this one's
+    for path in glob.glob(os.path.join(prometheus_multiproc_dir, '*.db')):
+        os.remove(path)
+
+def child_exit(server, worker):
+    # Stop counting the live gauges (queue depths) of a worker that exited
+    try:
+        from prometheus_client import multiprocess
+    except ImportError:
+        return
+    multiprocess.mark_process_dead(worker.pid, prometheus_multiproc_dir)
+
+def when_ready(server):
+    # Refuse to fork any worker onto a database that is behind the migrations.
+    # Only with preload_app: otherwise asking for the app would load it here too.
+    if not server.cfg.preload_app:
+        return
+    application = server.app.wsgi()
+    if not application.config.get('AUTO_CREATE_SCHEMA', True):
+        from app.utils.schema import check_schema_head
+        check_schema_head(application)
+
+def post_fork(server, worker):
+    # Database connections the master opened belong to it; the worker opens its own
+    if not server.cfg.preload_app:
+        return
+    from app import db
+    with server.app.wsgi().app_context():
+        db.engine.dispose(close=False)
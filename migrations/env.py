@@ -51,6 +51,16 @@ def get_metadata():
     return target_db.metadata
 
 
+def include_name(name, type_, parent_names):
+    # The full-text search tables and indexes aren't in the models' metadata
+    # (app.utils.search manages them), keep autogenerate from dropping them
+    if type_ == 'table' and name.endswith(('_fts', '_fts_config', '_fts_data', '_fts_docsize', '_fts_idx')):
+        return False
+    if type_ == 'index' and name.endswith('_search'):
+        return False
+    return True
+
+
 def run_migrations_offline():
     """Run migrations in 'offline' mode.
 
@@ -93,6 +103,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_name", include_name)
 
     connectable = get_engine()
 
@@ -0,0 +1,98 @@
+"""add encounter_monster table
+
+Revision ID: add_encounter_monster_table
+Revises: add_search_index
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from collections import defaultdict
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_encounter_monster_table'
+down_revision = 'add_search_index'
+branch_labels = None
+depends_on = None
+
+# Columns that don't make two statblocks different
+BOOKKEEPING_COLUMNS = {'id', 'created_at', 'updated_at'}
+
+
+def _participant_labels(name, count):
+    # A copy of app.utils.encounter_monsters.participant_labels as it was at this
+    # revision: a lone monster keeps its name, copies are numbered Goblin 1, 2...
+    if count == 1:
+        return [name]
+    return [f'{name} {number}' for number in range(1, count + 1)]
+
+
+def upgrade():
+    op.create_table('encounter_monster',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('label', sa.String(length=100), nullable=False),
+        sa.Column('current_hit_points', sa.Integer(), nullable=True),
+        sa.Column('conditions', sa.String(length=200), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('encounter_id', sa.Integer(), nullable=False),
+        sa.Column('monster_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['encounter_id'], ['encounter.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['monster_id'], ['monster.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_encounter_monster_encounter_id'), 'encounter_monster', ['encounter_id'], unique=False)
+    op.create_index(op.f('ix_encounter_monster_monster_id'), 'encounter_monster', ['monster_id'], unique=False)
+
+    # Every statblock of an encounter becomes a participant; identical copies
+    # in the same encounter collapse into one statblock with several participants
+    bind = op.get_bind()
+    monster = sa.Table('monster', sa.MetaData(), autoload_with=bind)
+    participant = sa.Table('encounter_monster', sa.MetaData(), autoload_with=bind)
+    key_columns = [column for column in monster.c if column.name not in BOOKKEEPING_COLUMNS]
+
+    groups = defaultdict(list)
+    rows = bind.execute(sa.select(monster).where(monster.c.encounter_id.isnot(None)).order_by(monster.c.id))
+    for row in rows.mappings():
+        groups[tuple(row[column.name] for column in key_columns)].append(row)
+
+    participants, duplicates = [], []
+    for copies in groups.values():
+        keeper = copies[0]
+        for label in _participant_labels(keeper['name'], len(copies)):
+            participants.append({'encounter_id': keeper['encounter_id'], 'monster_id': keeper['id'],
+                                 'label': label, 'created_at': keeper['created_at']})
+        duplicates.extend(row['id'] for row in copies[1:])
+
+    if participants:
+        bind.execute(participant.insert(), participants)
+    for start in range(0, len(duplicates), 500):
+        bind.execute(monster.delete().where(monster.c.id.in_(duplicates[start:start + 500])))
+
+
+def downgrade():
+    # Give every participant a statblock of its own again: the first one of an
+    # encounter's own statblock keeps it, the others get copies
+    bind = op.get_bind()
+    monster = sa.Table('monster', sa.MetaData(), autoload_with=bind)
+    participant = sa.Table('encounter_monster', sa.MetaData(), autoload_with=bind)
+    copy_columns = [column for column in monster.c if column.name not in {'id', 'encounter_id'}]
+
+    statblocks = {}
+    kept = set()
+    rows = bind.execute(sa.select(participant).order_by(participant.c.id))
+    for row in rows.mappings():
+        statblock = statblocks.get(row['monster_id'])
+        if statblock is None:
+            statblock = bind.execute(sa.select(monster).where(monster.c.id == row['monster_id'])).mappings().one()
+            statblocks[row['monster_id']] = statblock
+        if statblock['encounter_id'] == row['encounter_id'] and statblock['id'] not in kept:
+            kept.add(statblock['id'])
+            continue
+        values = {column.name: statblock[column.name] for column in copy_columns}
+        values.update(name=row['label'], encounter_id=row['encounter_id'])
+        bind.execute(monster.insert().values(**values))
+
+    op.drop_index(op.f('ix_encounter_monster_monster_id'), table_name='encounter_monster')
+    op.drop_index(op.f('ix_encounter_monster_encounter_id'), table_name='encounter_monster')
+    op.drop_table('encounter_monster')
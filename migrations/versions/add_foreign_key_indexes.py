@@ -0,0 +1,40 @@
+"""add foreign key indexes
+
+Revision ID: add_foreign_key_indexes
+Revises: add_scan_job_table
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_foreign_key_indexes'
+down_revision = 'add_scan_job_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_index(op.f('ix_campaign_user_id'), 'campaign', ['user_id'], unique=False)
+    op.create_index(op.f('ix_encounter_campaign_id'), 'encounter', ['campaign_id'], unique=False)
+    op.create_index(op.f('ix_npc_campaign_id'), 'npc', ['campaign_id'], unique=False)
+    op.create_index(op.f('ix_player_campaign_id'), 'player', ['campaign_id'], unique=False)
+    op.create_index(op.f('ix_scan_job_campaign_id'), 'scan_job', ['campaign_id'], unique=False)
+    op.create_index(op.f('ix_monster_encounter_id'), 'monster', ['encounter_id'], unique=False)
+    op.create_index('ix_monster_campaign_id_encounter_id', 'monster', ['campaign_id', 'encounter_id'], unique=False)
+    op.create_index('ix_event_campaign_id_event_date', 'event', ['campaign_id', 'event_date'], unique=False)
+    op.create_index('ix_event_npcs_npc_id', 'event_npcs', ['npc_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_event_npcs_npc_id', table_name='event_npcs')
+    op.drop_index('ix_event_campaign_id_event_date', table_name='event')
+    op.drop_index('ix_monster_campaign_id_encounter_id', table_name='monster')
+    op.drop_index(op.f('ix_monster_encounter_id'), table_name='monster')
+    op.drop_index(op.f('ix_scan_job_campaign_id'), table_name='scan_job')
+    op.drop_index(op.f('ix_player_campaign_id'), table_name='player')
+    op.drop_index(op.f('ix_npc_campaign_id'), table_name='npc')
+    op.drop_index(op.f('ix_encounter_campaign_id'), table_name='encounter')
+    op.drop_index(op.f('ix_campaign_user_id'), table_name='campaign')
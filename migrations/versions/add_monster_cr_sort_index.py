@@ -0,0 +1,26 @@
+"""add monster cr_sort index
+
+Revision ID: add_monster_cr_sort_index
+Revises: add_scan_job_owner
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_monster_cr_sort_index'
+down_revision = 'add_scan_job_owner'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The expression must be the one Monster.cr_sort sorts on for the index to be used
+    op.create_index('ix_monster_campaign_id_encounter_id_cr_sort', 'monster',
+                    ['campaign_id', 'encounter_id', sa.text('coalesce(cr_value, 99)'), 'name', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_monster_campaign_id_encounter_id_cr_sort', table_name='monster')
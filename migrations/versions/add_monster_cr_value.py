@@ -0,0 +1,61 @@
+"""add monster cr_value
+
+Revision ID: add_monster_cr_value
+Revises: add_encounter_monster_table
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+import re
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_monster_cr_value'
+down_revision = 'add_encounter_monster_table'
+branch_labels = None
+depends_on = None
+
+# A copy of app.utils.challenge's parser as it was at this revision, so the
+# backfill doesn't change with the app
+UNICODE_FRACTIONS = {'⅛': '1/8', '¼': '1/4', '½': '1/2'}
+
+CR_PATTERN = re.compile(r'^\s*(?:(\d+)\s*/\s*(\d+)|(\d+(?:\.\d+)?))')
+
+
+def _challenge_rating_value(challenge_rating):
+    # '1/4', '½', '5' or '5 (1,800 XP)' -> 0.25, 0.5, 5.0, 5.0; None when it isn't a number
+    if challenge_rating is None:
+        return None
+    text = str(challenge_rating)
+    for fraction, spelled in UNICODE_FRACTIONS.items():
+        text = text.replace(fraction, spelled)
+    match = CR_PATTERN.match(text)
+    if not match:
+        return None
+    numerator, denominator, number = match.groups()
+    if number is not None:
+        return float(number)
+    if int(denominator) == 0:
+        return None
+    return int(numerator) / int(denominator)
+
+
+def upgrade():
+    op.add_column('monster', sa.Column('cr_value', sa.Float(), nullable=True))
+
+    # Backfill with one UPDATE per distinct challenge rating (there are a few dozen)
+    bind = op.get_bind()
+    monster = sa.table('monster', sa.column('challenge_rating', sa.String), sa.column('cr_value', sa.Float))
+    ratings = bind.execute(sa.select(monster.c.challenge_rating).distinct()).scalars().all()
+    for rating in ratings:
+        value = _challenge_rating_value(rating)
+        if value is not None:
+            bind.execute(monster.update().where(monster.c.challenge_rating == rating).values(cr_value=value))
+
+    op.create_index('ix_monster_campaign_id_cr_value', 'monster', ['campaign_id', 'cr_value'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_monster_campaign_id_cr_value', table_name='monster')
+    op.drop_column('monster', 'cr_value')
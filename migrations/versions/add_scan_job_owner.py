@@ -0,0 +1,28 @@
+"""add scan job owner
+
+Revision ID: add_scan_job_owner
+Revises: add_monster_cr_value
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_scan_job_owner'
+down_revision = 'add_monster_cr_value'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('scan_job', sa.Column('started_at', sa.DateTime(), nullable=True))
+    op.add_column('scan_job', sa.Column('worker_host', sa.String(length=255), nullable=True))
+    op.add_column('scan_job', sa.Column('worker_pid', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('scan_job', 'worker_pid')
+    op.drop_column('scan_job', 'worker_host')
+    op.drop_column('scan_job', 'started_at')
@@ -0,0 +1,39 @@
+"""add scan job table
+
+Revision ID: add_scan_job_table
+Revises: add_event_npcs
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_scan_job_table'
+down_revision = 'add_event_npcs'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('scan_job',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=False, server_default='queued'),
+        sa.Column('result', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.text('CURRENT_TIMESTAMP')),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('campaign_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['campaign_id'], ['campaign.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['user.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_scan_job_created_at'), 'scan_job', ['created_at'], unique=False)
+    op.create_index(op.f('ix_scan_job_user_id'), 'scan_job', ['user_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_scan_job_user_id'), table_name='scan_job')
+    op.drop_index(op.f('ix_scan_job_created_at'), table_name='scan_job')
+    op.drop_table('scan_job')
@@ -0,0 +1,125 @@
+"""add full-text search index
+
+Revision ID: add_search_index
+Revises: add_foreign_key_indexes
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_search_index'
+down_revision = 'add_foreign_key_indexes'
+branch_labels = None
+depends_on = None
+
+# The DDL is spelled out as it was at this revision rather than taken from
+# app.utils.search, so later changes there don't change what this creates;
+# changes to the search schema go in new revisions.
+
+# SQLite: an external content FTS5 table per searchable table, kept in sync by triggers
+SQLITE_UPGRADE = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS monster_fts USING fts5(name, type, special_abilities, actions, campaign_id, "
+    "content='monster', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS monster_fts_ai AFTER INSERT ON monster BEGIN "
+    "INSERT INTO monster_fts(rowid, name, type, special_abilities, actions, campaign_id) "
+    "VALUES (new.id, new.name, new.type, new.special_abilities, new.actions, new.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS monster_fts_ad AFTER DELETE ON monster BEGIN "
+    "INSERT INTO monster_fts(monster_fts, rowid, name, type, special_abilities, actions, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.type, old.special_abilities, old.actions, old.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS monster_fts_au AFTER UPDATE ON monster BEGIN "
+    "INSERT INTO monster_fts(monster_fts, rowid, name, type, special_abilities, actions, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.type, old.special_abilities, old.actions, old.campaign_id); "
+    "INSERT INTO monster_fts(rowid, name, type, special_abilities, actions, campaign_id) "
+    "VALUES (new.id, new.name, new.type, new.special_abilities, new.actions, new.campaign_id); END",
+    "INSERT INTO monster_fts(monster_fts) VALUES ('rebuild')",
+
+    "CREATE VIRTUAL TABLE IF NOT EXISTS npc_fts USING fts5(name, description, places_to_find, campaign_id, "
+    "content='npc', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS npc_fts_ai AFTER INSERT ON npc BEGIN "
+    "INSERT INTO npc_fts(rowid, name, description, places_to_find, campaign_id) "
+    "VALUES (new.id, new.name, new.description, new.places_to_find, new.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS npc_fts_ad AFTER DELETE ON npc BEGIN "
+    "INSERT INTO npc_fts(npc_fts, rowid, name, description, places_to_find, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.description, old.places_to_find, old.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS npc_fts_au AFTER UPDATE ON npc BEGIN "
+    "INSERT INTO npc_fts(npc_fts, rowid, name, description, places_to_find, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.description, old.places_to_find, old.campaign_id); "
+    "INSERT INTO npc_fts(rowid, name, description, places_to_find, campaign_id) "
+    "VALUES (new.id, new.name, new.description, new.places_to_find, new.campaign_id); END",
+    "INSERT INTO npc_fts(npc_fts) VALUES ('rebuild')",
+
+    "CREATE VIRTUAL TABLE IF NOT EXISTS event_fts USING fts5(title, description, campaign_id, "
+    "content='event', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_ai AFTER INSERT ON event BEGIN "
+    "INSERT INTO event_fts(rowid, title, description, campaign_id) "
+    "VALUES (new.id, new.title, new.description, new.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_ad AFTER DELETE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, title, description, campaign_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS event_fts_au AFTER UPDATE ON event BEGIN "
+    "INSERT INTO event_fts(event_fts, rowid, title, description, campaign_id) "
+    "VALUES ('delete', old.id, old.title, old.description, old.campaign_id); "
+    "INSERT INTO event_fts(rowid, title, description, campaign_id) "
+    "VALUES (new.id, new.title, new.description, new.campaign_id); END",
+    "INSERT INTO event_fts(event_fts) VALUES ('rebuild')",
+
+    "CREATE VIRTUAL TABLE IF NOT EXISTS loot_fts USING fts5(name, description, campaign_id, "
+    "content='loot', content_rowid='id', tokenize='porter unicode61')",
+    "CREATE TRIGGER IF NOT EXISTS loot_fts_ai AFTER INSERT ON loot BEGIN "
+    "INSERT INTO loot_fts(rowid, name, description, campaign_id) "
+    "VALUES (new.id, new.name, new.description, new.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS loot_fts_ad AFTER DELETE ON loot BEGIN "
+    "INSERT INTO loot_fts(loot_fts, rowid, name, description, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.description, old.campaign_id); END",
+    "CREATE TRIGGER IF NOT EXISTS loot_fts_au AFTER UPDATE ON loot BEGIN "
+    "INSERT INTO loot_fts(loot_fts, rowid, name, description, campaign_id) "
+    "VALUES ('delete', old.id, old.name, old.description, old.campaign_id); "
+    "INSERT INTO loot_fts(rowid, name, description, campaign_id) "
+    "VALUES (new.id, new.name, new.description, new.campaign_id); END",
+    "INSERT INTO loot_fts(loot_fts) VALUES ('rebuild')",
+]
+
+SQLITE_DOWNGRADE = [
+    f"DROP TRIGGER IF EXISTS {table}_fts_{suffix}"
+    for table in ('monster', 'npc', 'event', 'loot') for suffix in ('ai', 'ad', 'au')
+] + [f"DROP TABLE IF EXISTS {table}_fts" for table in ('monster', 'npc', 'event', 'loot')]
+
+# Postgres: a GIN index on each table's weighted tsvector expression
+POSTGRES_UPGRADE = [
+    "CREATE INDEX IF NOT EXISTS ix_monster_search ON monster USING GIN ("
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(type, '') || ' ' || coalesce(special_abilities, '') "
+    "|| ' ' || coalesce(actions, '')), 'B')))",
+    "CREATE INDEX IF NOT EXISTS ix_npc_search ON npc USING GIN ("
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '') || ' ' || coalesce(places_to_find, '')), "
+    "'B')))",
+    "CREATE INDEX IF NOT EXISTS ix_event_search ON event USING GIN ("
+    "(setweight(to_tsvector('english'::regconfig, coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')))",
+    "CREATE INDEX IF NOT EXISTS ix_loot_search ON loot USING GIN ("
+    "(setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B')))",
+]
+
+POSTGRES_DOWNGRADE = [f"DROP INDEX IF EXISTS ix_{table}_search" for table in ('monster', 'npc', 'event', 'loot')]
+
+STATEMENTS = {
+    'sqlite': (SQLITE_UPGRADE, SQLITE_DOWNGRADE),
+    'postgresql': (POSTGRES_UPGRADE, POSTGRES_DOWNGRADE),
+}
+
+
+def upgrade():
+    # Full-text search is only set up on SQLite and Postgres; the existing rows
+    # are indexed as part of the upgrade
+    for statement in STATEMENTS.get(op.get_bind().dialect.name, ([], []))[0]:
+        op.execute(statement)
+
+
+def downgrade():
+    for statement in STATEMENTS.get(op.get_bind().dialect.name, ([], []))[1]:
+        op.execute(statement)